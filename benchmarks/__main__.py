@@ -0,0 +1,114 @@
+import json
+import argparse
+from .suite import run_suite, compare_results
+from .scaling import run_scaling
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the hot paths of capsidgraph and save the results as JSON.",
+    )
+    parser.add_argument(
+        "--scaling",
+        action="store_true",
+        help="measure how the simulations scale with the number of processes instead of running the suite",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark_results.json",
+        help="file in which the results are written (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-T",
+        type=int,
+        default=13,
+        help="largest triangulation number of the generated capsids (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="number of measures of each benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="random seed (default: %(default)s)"
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default=None,
+        help="only run the benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=None,
+        help="numbers of processes measured by --scaling, a single N measures 1 to N (default: 1 to the number of CPUs)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=20000,
+        help="number of simulations of each --scaling run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="result file of a previous run to compare the results with",
+    )
+    args = parser.parse_args(args)
+
+    if args.scaling:
+        processes = args.processes
+        if processes is not None and len(processes) == 1:
+            processes = list(range(1, processes[0] + 1))
+        results = run_scaling(processes, args.iterations, seed=args.seed)
+        print()
+        print(
+            "%-30s %-20s %9s %8s %10s %8s"
+            % ("benchmark", "graph", "processes", "speedup", "efficiency", "start-up")
+        )
+        for r in results["results"]:
+            print(
+                "%-30s %-20s %9d %7.2fx %9.1f%% %7.1f%%"
+                % (
+                    r["benchmark"],
+                    r["graph"],
+                    r["process_number"],
+                    r["speedup"],
+                    100 * r["efficiency"],
+                    100 * r["startup_fraction"],
+                )
+            )
+    else:
+        results = run_suite(args.max_T, args.repeat, args.seed, args.filter)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print("Results written to", args.output)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print()
+        print(
+            "%-32s %-24s %10s %10s %8s"
+            % ("benchmark", "graph", "old ms", "new ms", "speedup")
+        )
+        for r in compare_results(old, results):
+            print(
+                "%-32s %-24s %10.3f %10.3f %7.2fx"
+                % (
+                    r["benchmark"],
+                    r["graph"],
+                    1000 * r["old"],
+                    1000 * r["new"],
+                    r["speedup"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+from typing import Dict, List, Tuple
+import networkx as nx
+from capsidgraph.generator import (
+    icosahedral_patterns,
+    cubic_patterns,
+    create_icosahedral_face_edges,
+    create_icosahedral_capsid_graph,
+    create_cubic_face_edges,
+    create_cubic_capsid_graph,
+    get_caspar_klug_numbers,
+)
+from capsidgraph.analyser.util import _init_nodes_strength
+
+# Directory of the graphs bundled with the tests
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
+
+# AaLS graphs bundled with the tests and the patterns generating them
+AALS_GRAPHS = [
+    ("AaLS_24", cubic_patterns.AALS_24_PATTERN),
+    ("AaLS_48", cubic_patterns.AALS_48_PATTERN),
+    ("AaLS_60", cubic_patterns.AALS_60_PATTERN),
+]
+
+# Pattern of the generated icosahedral capsids
+ICOSAHEDRAL_PATTERN = ("PATTERN_666", icosahedral_patterns.PATTERN_666)
+
+
+def prepare_graph(G: nx.Graph) -> nx.Graph:
+    """
+    Give every edge the same strength, with a total strength of 1, and initialize the strength of the nodes.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to prepare, it is modified in place
+
+    Returns
+    -------
+    nx.Graph
+        The graph
+    """
+    nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+    _init_nodes_strength(G)
+    return G
+
+
+def generate_icosahedral_capsid(pattern: List, h: int, k: int) -> nx.Graph:
+    """
+    Generate an icosahedral capsid without using the capsid cache.
+    """
+    edges, Tx, Ty = pattern[:3]
+    face_edges, triangle = create_icosahedral_face_edges(edges, Tx, Ty, h, k)
+    return create_icosahedral_capsid_graph(face_edges, triangle)
+
+
+def generate_cubic_capsid(pattern: List) -> nx.Graph:
+    """
+    Generate a cubic capsid without using the capsid cache.
+    """
+    edges, Tx, Ty, face_edge = pattern[:4]
+    face_edges, square = create_cubic_face_edges(edges, Tx, Ty, face_edge)
+    return create_cubic_capsid_graph(face_edges, square)
+
+
+def get_icosahedral_hk(max_T: int) -> List[Tuple[int, int]]:
+    """
+    List one (h,k) for every triangulation number up to max_T, chiral duplicates are skipped.
+    """
+    res = []
+    seen = set()
+    for h, k in get_caspar_klug_numbers(max_T):
+        T = h * h + h * k + k * k
+        if T not in seen:
+            seen.add(T)
+            res.append((h, k))
+    return res
+
+
+def load_benchmark_graphs(max_T: int) -> List[Tuple[str, Dict, nx.Graph]]:
+    """
+    Load the AaLS graphs bundled with the tests and generate icosahedral capsids of increasing triangulation number.
+
+    Parameters
+    ----------
+    max_T : int
+        The largest triangulation number of the generated capsids
+
+    Returns
+    -------
+    List[Tuple[str, Dict, nx.Graph]]
+        The name of each graph, a description of how it was obtained and the graph, prepared with `prepare_graph`
+    """
+    graphs = []
+    for name, _ in AALS_GRAPHS:
+        G = nx.read_adjlist(os.path.join(TESTS_DIR, name + ".adjlist"))
+        graphs.append((name, {"source": "file"}, prepare_graph(G)))
+    pattern_name, pattern = ICOSAHEDRAL_PATTERN
+    for h, k in get_icosahedral_hk(max_T):
+        G = generate_icosahedral_capsid(pattern, h, k)
+        info = {"source": pattern_name, "h": h, "k": k, "T": h * h + h * k + k * k}
+        graphs.append(("%s_h%d_k%d" % (pattern_name, h, k), info, prepare_graph(G)))
+    return graphs
@@ -0,0 +1,239 @@
+import os
+import time
+import random
+from multiprocessing import Pool, Value
+from typing import Dict, List
+import networkx as nx
+from capsidgraph.analyser import (
+    get_fragmentation_probability,
+    bisection,
+    probability_fragment,
+)
+from capsidgraph.analyser.analyse import _init_fragmentation_probability_worker
+from .graphs import (
+    TESTS_DIR,
+    ICOSAHEDRAL_PATTERN,
+    prepare_graph,
+    generate_icosahedral_capsid,
+)
+from .suite import get_metadata
+
+
+def _noop():
+    """
+    Empty task, used to measure the start-up cost of a pool.
+    """
+    return None
+
+
+def measure_pool_startup(process_number: int, repeat: int = 3) -> float:
+    """
+    Measure the time needed to start a pool like the one of `get_fragmentation_probability`, run one empty task per process and shut it down.
+
+    Parameters
+    ----------
+    process_number : int
+        The number of processes of the pool
+    repeat : int, optional
+        The number of measures
+
+    Returns
+    -------
+    float
+        The best measured time in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        shared = (Value("i", 0), Value("f", 0), Value("i", 0))
+        with Pool(
+            process_number,
+            initializer=_init_fragmentation_probability_worker,
+            initargs=shared,
+        ) as pool:
+            for _ in range(process_number):
+                pool.apply_async(_noop)
+            pool.close()
+            pool.join()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def get_scaling_graphs() -> List[tuple]:
+    """
+    The fixed graphs on which the scaling is measured: the largest AaLS graph and a T=7 icosahedral capsid.
+    """
+    G = nx.read_adjlist(os.path.join(TESTS_DIR, "AaLS_60.adjlist"))
+    pattern_name, pattern = ICOSAHEDRAL_PATTERN
+    return [
+        ("AaLS_60", prepare_graph(G)),
+        (
+            "%s_h2_k1" % pattern_name,
+            prepare_graph(generate_icosahedral_capsid(pattern, 2, 1)),
+        ),
+    ]
+
+
+def _warm_up(G: nx.Graph) -> None:
+    """
+    Run a few untimed simulations on a graph, so that the one-time costs (imports, preparation of the fragmentation method, compilation of the optional kernels) are not charged to the first measured run.
+    """
+    get_fragmentation_probability(
+        G,
+        1000,
+        probability_fragment,
+        fragment_settings={"fragmentation": 0.3, "fragmentation_type": "edges"},
+    )
+
+
+def _add_efficiency(results: List[Dict], key: str) -> None:
+    """
+    Add the speedup and parallel efficiency of every result relative to the single process run, from the `key` throughput.
+    """
+    reference = {
+        (r["benchmark"], r["graph"]): r[key]
+        for r in results
+        if r["process_number"] == 1
+    }
+    for r in results:
+        base = reference.get((r["benchmark"], r["graph"]))
+        if base is None:
+            continue
+        r["speedup"] = r[key] / base
+        r["efficiency"] = r["speedup"] / r["process_number"]
+
+
+def run_scaling(
+    process_numbers: List[int] | None = None,
+    iterations: int = 20000,
+    bisection_steps: int = 3,
+    seed: int = 0,
+    verbose: bool = True,
+) -> Dict:
+    """
+    Measure how `get_fragmentation_probability` and `bisection` scale with the number of processes.
+
+    Parameters
+    ----------
+    process_numbers : List[int] | None, optional
+        The numbers of processes to measure, by default every number from 1 to the number of CPUs.
+        The single process run is always measured since the efficiency is relative to it.
+    iterations : int, optional
+        The number of simulations of each `get_fragmentation_probability` run
+    bisection_steps : int, optional
+        The number of steps of each `bisection` run
+    seed : int, optional
+        The seed of `random`, set before each run
+    verbose : bool, optional
+        Whether to print the results as they are measured
+
+    Returns
+    -------
+    Dict
+        The `metadata` describing the environment and the list of `results`.
+        Each result contains the name of the `benchmark` and of the `graph`, the `process_number`, the wall clock `time`, the number of `simulations` actually run, the throughput `sims_per_second`, the `pool_startup` time and its `startup_fraction` of the run, the `speedup` and the parallel `efficiency` relative to one process.
+
+    Notes
+    -----
+    The pool start-up time is measured separately, by starting a pool with the same initializer and running empty tasks, and the simulation time is the rest of the run.
+    Workers run simulations by batches of 1000, so a run with several processes may perform more simulations than requested, and the steps of a bisection stop at different counts. The speedup is therefore the ratio of the throughputs in simulations per second, not of the times.
+    Before the runs of each graph, an untimed warm-up run pays the one-time costs that would otherwise be charged to the single process run.
+    """
+    if process_numbers is None:
+        process_numbers = list(range(1, os.cpu_count() + 1))
+    process_numbers = sorted(set([1] + list(process_numbers)))
+    startup = {p: measure_pool_startup(p) if p > 1 else 0.0 for p in process_numbers}
+    results = []
+    for name, G in get_scaling_graphs():
+        _warm_up(G)
+        for p in process_numbers:
+            random.seed(seed)
+            start = time.perf_counter()
+            pfrag, n = get_fragmentation_probability(
+                G,
+                iterations,
+                probability_fragment,
+                fragment_settings={"fragmentation": 0.3, "fragmentation_type": "edges"},
+                process_number=p,
+            )
+            duration = time.perf_counter() - start
+            results.append(
+                {
+                    "benchmark": "get_fragmentation_probability",
+                    "graph": name,
+                    "process_number": p,
+                    "time": duration,
+                    "simulations": n,
+                    "sims_per_second": n / duration,
+                    "simulation_time": max(duration - startup[p], 0),
+                    "pool_startup": startup[p],
+                    "startup_fraction": startup[p] / duration,
+                    "estimate": pfrag,
+                }
+            )
+            if verbose:
+                print(
+                    "%-30s %-20s %3d processes %10.0f sims/s %6.1f%% start-up"
+                    % (
+                        "get_fragmentation_probability",
+                        name,
+                        p,
+                        n / duration,
+                        100 * startup[p] / duration,
+                    )
+                )
+
+            random.seed(seed)
+            # The number of simulations of every step
+            ends = []
+
+            def count_simulations(event: Dict) -> None:
+                if event["event"] == "end":
+                    ends.append(event["iterations"])
+
+            start = time.perf_counter()
+            threshold, steps = bisection(
+                G,
+                bisection_steps,
+                0.1,
+                probability_fragment,
+                fragment_settings={"fragmentation_type": "edges"},
+                process_number=p,
+                progress=count_simulations,
+            )
+            duration = time.perf_counter() - start
+            n = sum(ends)
+            results.append(
+                {
+                    "benchmark": "bisection",
+                    "graph": name,
+                    "process_number": p,
+                    "time": duration,
+                    "simulations": n,
+                    "sims_per_second": n / duration,
+                    "simulation_time": max(duration - steps * startup[p], 0),
+                    # One pool is started for every step of the bisection
+                    "pool_startup": steps * startup[p],
+                    "startup_fraction": steps * startup[p] / duration,
+                    "estimate": threshold,
+                }
+            )
+            if verbose:
+                print(
+                    "%-30s %-20s %3d processes %10.0f sims/s %6.1f%% start-up"
+                    % (
+                        "bisection",
+                        name,
+                        p,
+                        n / duration,
+                        100 * steps * startup[p] / duration,
+                    )
+                )
+    _add_efficiency(
+        [r for r in results if r["benchmark"] == "get_fragmentation_probability"],
+        "sims_per_second",
+    )
+    _add_efficiency(
+        [r for r in results if r["benchmark"] == "bisection"], "sims_per_second"
+    )
+    return {"metadata": get_metadata(), "results": results}
@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import random
+import timeit
+import platform
+import subprocess
+from typing import Callable, Dict, List
+import networkx as nx
+import numpy as np
+from capsidgraph.analyser import (
+    probability_fragment,
+    strength_edges_fragment,
+    strength_nodes_fragment,
+    get_hole_size,
+    bisection,
+)
+from .graphs import (
+    AALS_GRAPHS,
+    ICOSAHEDRAL_PATTERN,
+    load_benchmark_graphs,
+    generate_icosahedral_capsid,
+    generate_cubic_capsid,
+)
+
+# Version of the layout of the result files
+RESULTS_VERSION = 1
+
+
+def time_function(
+    func: Callable[[], object], repeat: int = 5, seed: int = 0
+) -> Dict[str, float]:
+    """
+    Time a function, calling it enough times for every measure to last at least 0.2 seconds.
+
+    Parameters
+    ----------
+    func : Callable[[], object]
+        The function to time
+    repeat : int, optional
+        The number of measures
+    seed : int, optional
+        The seed of `random`, set before each measure so that every run performs the same simulations
+
+    Returns
+    -------
+    Dict[str, float]
+        The number of calls per measure `number`, and the `best`, `mean` and `worst` duration of one call in seconds
+    """
+    timer = timeit.Timer(func)
+    random.seed(seed)
+    number, _ = timer.autorange()
+    times = []
+    for _ in range(repeat):
+        random.seed(seed)
+        times.append(timer.timeit(number) / number)
+    return {
+        "number": number,
+        "best": min(times),
+        "mean": sum(times) / len(times),
+        "worst": max(times),
+    }
+
+
+def get_metadata() -> Dict:
+    """
+    Describe the environment in which the benchmarks are run.
+    """
+    root = os.path.dirname(os.path.dirname(__file__))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": RESULTS_VERSION,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "networkx": nx.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def _get_graph_benchmarks(G: nx.Graph, seed: int) -> Dict[str, Callable[[], object]]:
+    """
+    List the analyser functions to time on a graph.
+    """
+    # Hole size of a graph fragmented once with a fixed seed
+    random.seed(seed)
+    G_ = probability_fragment(
+        G, {"fragmentation": 0.5, "fragmentation_type": "nodes"}
+    )
+    return {
+        "probability_fragment[nodes]": lambda: probability_fragment(
+            G, {"fragmentation": 0.3, "fragmentation_type": "nodes"}
+        ),
+        "probability_fragment[edges]": lambda: probability_fragment(
+            G, {"fragmentation": 0.3, "fragmentation_type": "edges"}
+        ),
+        "strength_edges_fragment": lambda: strength_edges_fragment(
+            G, {"fragmentation": 0.3}
+        ),
+        "strength_nodes_fragment": lambda: strength_nodes_fragment(
+            G, {"fragmentation": 0.3}
+        ),
+        "get_hole_size": lambda: get_hole_size(G_, G),
+        "bisection[edges]": lambda: bisection(
+            G,
+            3,
+            0.1,
+            probability_fragment,
+            fragment_settings={"fragmentation_type": "edges"},
+            min_iterations=100,
+            max_iterations=1000,
+        ),
+    }
+
+
+def run_suite(
+    max_T: int = 13,
+    repeat: int = 5,
+    seed: int = 0,
+    filter: str | None = None,
+    verbose: bool = True,
+) -> Dict:
+    """
+    Time the fragmentation functions, `get_hole_size`, `bisection` and the capsid generation.
+
+    Parameters
+    ----------
+    max_T : int, optional
+        The largest triangulation number of the generated icosahedral capsids
+    repeat : int, optional
+        The number of measures of each benchmark
+    seed : int, optional
+        The seed of `random` used for every benchmark
+    filter : str | None, optional
+        If given, only the benchmarks whose name contains this string are run
+    verbose : bool, optional
+        Whether to print the results as they are measured
+
+    Returns
+    -------
+    Dict
+        The `metadata` describing the environment and the list of `results`.
+        Each result contains the name of the `benchmark`, the name of the `graph` it is run on and its size, and the timing returned by `time_function`.
+    """
+    results = []
+
+    def run(name: str, graph: str, info: Dict, func: Callable[[], object]):
+        if filter is not None and filter not in name:
+            return
+        res = {"benchmark": name, "graph": graph}
+        res.update(info)
+        res.update(time_function(func, repeat, seed))
+        results.append(res)
+        if verbose:
+            print("%-32s %-24s %12.3f ms" % (name, graph, 1000 * res["best"]))
+
+    # Generation of the graphs, without the capsid cache
+    for name, pattern in AALS_GRAPHS:
+        run(
+            "generate_cubic_capsid",
+            name,
+            {"source": "cubic_patterns"},
+            lambda: generate_cubic_capsid(pattern),
+        )
+    graphs = load_benchmark_graphs(max_T)
+    _, pattern = ICOSAHEDRAL_PATTERN
+    for name, info, G in graphs:
+        if "T" in info:
+            run(
+                "generate_icosahedral_capsid",
+                name,
+                dict(info, nodes=len(G.nodes), edges=len(G.edges)),
+                lambda: generate_icosahedral_capsid(pattern, info["h"], info["k"]),
+            )
+    # Analysis of the graphs
+    for name, info, G in graphs:
+        info = dict(info, nodes=len(G.nodes), edges=len(G.edges))
+        for benchmark, func in _get_graph_benchmarks(G, seed).items():
+            run(benchmark, name, info, func)
+    return {"metadata": get_metadata(), "results": results}
+
+
+def compare_results(old: Dict, new: Dict) -> List[Dict]:
+    """
+    Compare two result files of `run_suite`.
+
+    Parameters
+    ----------
+    old : Dict
+        The reference results
+    new : Dict
+        The new results
+
+    Returns
+    -------
+    List[Dict]
+        For every benchmark present in both results, its name, the graph, the best times and the `speedup`, greater than 1 when the new version is faster
+    """
+    reference = {(r["benchmark"], r["graph"]): r for r in old["results"]}
+    res = []
+    for r in new["results"]:
+        key = (r["benchmark"], r["graph"])
+        if key in reference:
+            res.append(
+                {
+                    "benchmark": r["benchmark"],
+                    "graph": r["graph"],
+                    "old": reference[key]["best"],
+                    "new": r["best"],
+                    "speedup": reference[key]["best"] / r["best"],
+                }
+            )
+    return res
@@ -12,6 +12,41 @@ from .fragment import (
     strength_nodes_fragment,
 )
 from .util import _init_nodes_strength as init_nodes_strength
+from .progress import (
+    create_log_sink,
+    create_jsonl_sink,
+    create_tqdm_sink,
+    format_progress_event,
+    get_confidence_interval,
+)
+from .profiling import format_profile_report
+from .reliability import FragmentationPolynomial, get_fragmentation_polynomial
+from .importance import get_fragmentation_probability_importance_sampling
+from .splitting import get_fragmentation_probability_splitting
+from .curve import get_fragmentation_probability_curve
+from .fragmenter import (
+    Fragmenter,
+    ProbabilityFragmenter,
+    StrengthEdgesFragmenter,
+    StrengthNodesFragmenter,
+    LegacyFragmenter,
+    get_fragmenter,
+)
+from .view import MaskedGraph, requires_copy
+from .hole import (
+    HoleCriterion,
+    get_hole_fragmentation_threshold,
+    get_hole_fragmentation_curve,
+)
+from .backend import get_backend, set_backend, is_numba_available
+from .asynchronous import (
+    get_fragmentation_probability_async,
+    iter_fragmentation_probability,
+    bisection_async,
+    iter_bisection,
+)
+from .distributed import Coordinator, run_worker, get_graph_fingerprint
+from .result import ProbabilityResult, CurveResult, DistributionResult
 from typing import Tuple
 
 
@@ -1,9 +1,15 @@
 import time
+from math import ceil
 import networkx as nx
 from typing import List, Tuple, Dict, Callable
 from inspect import signature
 import random
 from multiprocessing import Value, Pool
+from .progress import ProgressHook, _create_progress_event, _get_progress_hook
+from . import profiling
+from .compact import _get_compact_methods, _get_mask_test
+from .fragmenter import Fragmenter
+from .result import DistributionResult, ProbabilityResult
 
 def _is_fragmented(G: nx.Graph) -> bool:
     """
@@ -21,6 +27,18 @@ def _is_fragmented(G: nx.Graph) -> bool:
     """
     return len(G.nodes) > 0 and not nx.is_connected(G)
 
+def _get_default_methods(G: nx.Graph, fragment, is_fragmented):
+    """
+    Replace a built-in fragmentation method or a `Fragmenter` and the fragmentation test by their compact versions, which sample removal masks of a compact copy of the graph without building the fragmented graphs.
+    A `HoleCriterion` is checked on the compact graph, other custom tests receive a read-only view of the fragmented graph, see `capsidgraph.analyser.view`.
+    Other methods are returned unchanged.
+    """
+    compact_methods = _get_compact_methods(G, fragment)
+    if compact_methods is None:
+        return fragment, is_fragmented
+    compact_fragment = compact_methods[0]
+    return compact_fragment, _get_mask_test(G, compact_fragment.cg, is_fragmented)
+
 def _init_fragmentation_probability_worker(shared_n, shared_pfrag, shared_fragmentation_count):
     """
     This function is called by a multiprocessing.Pool to initialize shared values
@@ -43,7 +61,16 @@ def _init_fragmentation_probability_worker(shared_n, shared_pfrag, shared_fragme
     pfrag = shared_pfrag
     fragmentation_count = shared_fragmentation_count
 
-def _get_fragmentation_probability_worker(G,fragment,fragment_settings,stop_condition,stop_condition_settings,is_fragmented,debug,debug_interval, batch_size=1000):
+def _seed_random() -> int:
+    """
+    Draw a seed from the state of the `random` module and seed it with it, like the workers do, so the simulations run in the calling process are identified by their seed in the results.
+    """
+    seed = random.getrandbits(64)
+    random.seed(seed)
+    return seed
+
+
+def _get_fragmentation_probability_worker(G,fragment,fragment_settings,stop_condition,stop_condition_settings,is_fragmented,debug,debug_interval, batch_size=1000, seed=None, profile=False):
     """
     This function is called by a multiprocessing.Pool to compute the fragmentation probability of a graph G
 
@@ -67,23 +94,42 @@ def _get_fragmentation_probability_worker(G,fragment,fragment_settings,stop_cond
         The interval at which to print debug information
     batch_size : int
         The number of iterations to perform before updating shared values
+    seed : int | None
+        The seed of the `random` module in this worker, drawn by the parent process
+    profile : bool
+        Whether to measure the time spent in each phase of the simulations
 
 
     Returns
     -------
-    None
+    Dict | None
+        The profile of the worker if `profile` is True, see `capsidgraph.analyser.profiling`
     """
     global n,fragmentation_count,pfrag
+    if seed is not None:
+        random.seed(seed)
+    if profile:
+        previous_profiler = profiling._start_profiling()
+    profiler = profiling._profiler
+    with_settings = len(signature(fragment).parameters) == 2
     is_incomplete = True
     while is_incomplete:
         inc_fragment = 0
         for i in range(batch_size):
-            if len(signature(fragment).parameters) == 2:
+            if profiler is not None:
+                start = time.perf_counter()
+            if with_settings:
                 G_ = fragment(G, fragment_settings)
             else:
                 G_ = fragment(G)
+            if profiler is not None:
+                start = profiler.add("fragment", start)
             if is_fragmented(G_):
                 inc_fragment += 1
+            if profiler is not None:
+                profiler.add("is_fragmented", start)
+        if profiler is not None:
+            start = time.perf_counter()
         #We acquire the semaphore to update values and compute stop_condition
         with n.get_lock():
             n.value += batch_size
@@ -93,9 +139,13 @@ def _get_fragmentation_probability_worker(G,fragment,fragment_settings,stop_cond
                 and n.value < stop_condition
                 or (
                     callable(stop_condition)
-                    and not stop_condition(n.value, pfrag.value, stop_condition_settings, debug=(debug and n.value%debug_interval == 0))
+                    and not stop_condition(n.value, pfrag.value, stop_condition_settings, debug=(debug and n.value//debug_interval != (n.value - batch_size)//debug_interval))
                 )
                 )
+        if profiler is not None:
+            profiler.add("reduce", start)
+    if profile:
+        return profiling._stop_profiling(previous_profiler)
 
 
 def _get_fragmentation_probability_multithreaded (
@@ -108,7 +158,11 @@ def _get_fragmentation_probability_multithreaded (
     process_number: int, 
     debug: bool,
     debug_interval: int,
-) -> Tuple[float, int]:
+    progress: ProgressHook | None = None,
+    progress_interval: float = 1,
+    progress_settings: Dict | None = None,
+    profile: bool = False,
+) -> Tuple[int, int, List[int]] | Tuple[int, int, List[int], List[Dict]]:
     """
     Compute the fragmentation probability of a graph G using a given fragmentation method by using multiple processes for the simulations
 
@@ -130,11 +184,19 @@ def _get_fragmentation_probability_multithreaded (
         If True, print debug information
     debug_interval : int
         The number of interations between two debug messages on the progress
+    progress : ProgressHook | None
+        The function called with the progress events, see `get_fragmentation_probability`
+    progress_interval : float
+        The time in seconds between two progress events
+    progress_settings : Dict | None
+        Entries added to every progress event
+    profile : bool
+        Whether to measure the time spent in each phase of the simulations
 
     Returns
     -------
-    Tuple[float, bool]
-        The estimated fragmentation probability and an int representing the number of iterations used to compute it
+    Tuple[int, int, List[int]] | Tuple[int, int, List[int], List[Dict]]
+        The number of fragmented graphs, the number of iterations and the seeds of the workers, followed by the profile of each worker if `profile` is True
     """
     start = time.time()
 
@@ -146,10 +208,24 @@ def _get_fragmentation_probability_multithreaded (
 
 
     with Pool(process_number,initializer=_init_fragmentation_probability_worker,initargs=(shared_n,shared_pfrag,shared_fragmentation_count)) as pool:
+        results = []
+        seeds = []
         for i in range(process_number):
-            pool.apply_async(_get_fragmentation_probability_worker, (G,fragment,fragment_settings,stop_condition,stop_condition_settings,is_fragmented,debug,debug_interval))
+            # Each worker gets its own seed drawn from the state of the parent, so seeding `random` before the call fixes the random streams of the workers
+            seed = random.getrandbits(64)
+            seeds.append(seed)
+            results.append(pool.apply_async(_get_fragmentation_probability_worker, (G,fragment,fragment_settings,stop_condition,stop_condition_settings,is_fragmented,debug,debug_interval,1000,seed,profile)))
         pool.close()
+        if progress is not None:
+            # The parent polls the shared values while the workers are running
+            for result in results:
+                while not result.ready():
+                    result.wait(progress_interval)
+                    with shared_n.get_lock():
+                        count, fragmented = shared_n.value, shared_fragmentation_count.value
+                    progress(_get_progress_event("progress", count, fragmented, time.time() - start, stop_condition, stop_condition_settings, progress_settings))
         pool.join()
+        workers = [result.get() for result in results] if profile else None
     if debug:
         print(
             "fragmentation setttings=",
@@ -161,7 +237,12 @@ def _get_fragmentation_probability_multithreaded (
             1000 * process_number * (time.time() - start) / shared_n.value,
             "ms/sim",
         )
-    return shared_pfrag.value, shared_n.value
+    if progress is not None:
+        progress(_get_progress_event("end", shared_n.value, shared_fragmentation_count.value, time.time() - start, stop_condition, stop_condition_settings, progress_settings))
+    # The shared probability is a single precision float, the counts are exact
+    if profile:
+        return shared_fragmentation_count.value, shared_n.value, seeds, workers
+    return shared_fragmentation_count.value, shared_n.value, seeds
 
 def _get_fragmentation_probability_singlethreaded(
     G: nx.Graph,
@@ -172,7 +253,10 @@ def _get_fragmentation_probability_singlethreaded(
     is_fragmented,
     debug: bool ,
     debug_interval: int ,
-) -> Tuple[float, int]:
+    progress: ProgressHook | None = None,
+    progress_interval: float = 1,
+    progress_settings: Dict | None = None,
+) -> Tuple[int, int]:
     """
     Compute the fragmentation probability of a graph G using a given fragmentation method by using a silngle processes for the simulations
 
@@ -194,16 +278,26 @@ def _get_fragmentation_probability_singlethreaded(
         If True, print debug information
     debug_interval : int
         The number of interations between two debug messages on the progress
+    progress : ProgressHook | None
+        The function called with the progress events, see `get_fragmentation_probability`
+    progress_interval : float
+        The time in seconds between two progress events
+    progress_settings : Dict | None
+        Entries added to every progress event
 
     Returns
     -------
-    Tuple[float, bool]
-        The estimated fragmentation probability and an int representing the number of iterations used to compute it
+    Tuple[int, int]
+        The number of fragmented graphs and the number of iterations
     """
     start = time.time()
+    next_progress = start + progress_interval
     fragmentation_count = 0
     pfrag = 0
     n = 0
+    profiler = profiling._profiler
+    phase_start = None
+    with_settings = len(signature(fragment).parameters) == 2
     while (
         type(stop_condition) == int
         and n < stop_condition
@@ -212,15 +306,30 @@ def _get_fragmentation_probability_singlethreaded(
             and not stop_condition(n, pfrag, stop_condition_settings, debug=(debug and n%debug_interval == 0))
         )
     ):
-        if len(signature(fragment).parameters) == 2:
+        if profiler is not None:
+            # The reduce phase goes from the end of the connectivity check to the start of the next simulation, including the stop condition
+            if phase_start is not None:
+                profiler.add("reduce", phase_start)
+            phase_start = time.perf_counter()
+        if with_settings:
             G_ = fragment(G, fragment_settings)
         else:
             G_ = fragment(G)
+        if profiler is not None:
+            phase_start = profiler.add("fragment", phase_start)
 
         n += 1
-        if is_fragmented(G_):
+        is_graph_fragmented = is_fragmented(G_)
+        if profiler is not None:
+            phase_start = profiler.add("is_fragmented", phase_start)
+        if is_graph_fragmented:
             fragmentation_count += 1
         pfrag = fragmentation_count / n
+        if progress is not None and time.time() >= next_progress:
+            next_progress = time.time() + progress_interval
+            progress(_get_progress_event("progress", n, fragmentation_count, time.time() - start, stop_condition, stop_condition_settings, progress_settings))
+    if profiler is not None and phase_start is not None:
+        profiler.add("reduce", phase_start)
     if debug:
         print(
             "fragmentation setttings=",
@@ -232,21 +341,26 @@ def _get_fragmentation_probability_singlethreaded(
             1000 * (time.time() - start) / n,
             "ms/sim",
         )
-    return pfrag, n
+    if progress is not None:
+        progress(_get_progress_event("end", n, fragmentation_count, time.time() - start, stop_condition, stop_condition_settings, progress_settings))
+    return fragmentation_count, n
 
 
 
 def get_fragmentation_probability(
     G: nx.Graph,
     stop_condition: int | Callable[[int, float, Dict], bool],
-    fragment: Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph],
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph],
     stop_condition_settings: Dict | None = None,
     fragment_settings: Dict | None = None,
     is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
     process_number: int = 1,
     debug: bool = False,
-    debug_interval: int = 100000
-) -> Tuple[float, int]:
+    debug_interval: int = 100000,
+    progress: ProgressHook | List[ProgressHook] | None = None,
+    progress_interval: float = 1,
+    profile: bool = False,
+) -> ProbabilityResult:
     """
     Compute the fragmentation probability of a graph G using a given fragmentation method
 
@@ -256,28 +370,66 @@ def get_fragmentation_probability(
         The graph to fragment
     stop_condition : int | Callable[[int, float, Dict], bool]
         The stop condition for the fragmentation process. If an int is given, the process will stop after this number of iterations. If a callable is given, the process will stop when the callable returns True. The callable takes as parameters the number of iterations, the current estimated fragmentation probability and the stop_condition_settings
-    fragment : Callable[[nx.Graph, Dict], None] | Callable[[nx.Graph], None]
-        The fragmentation method to use. It must take as parameter a graph and a dict of settings and return the fragmented graph. If the fragmentation method does not take settings, it can be given without the settings parameter
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], None] | Callable[[nx.Graph], None]
+        The fragmentation method to use. It must take as parameter a graph and a dict of settings and return the fragmented graph. If the fragmentation method does not take settings, it can be given without the settings parameter.
+        It can also be a `Fragmenter` (see `capsidgraph.analyser.fragmenter`), prepared once for the graph and sampling removal masks
     stop_condition_settings : Dict | None
         The settings to pass to the stop condition callable
     fragment_settings : Dict | None
-        The settings to pass to the fragmentation method
+        The settings to pass to the fragmentation method, or to add to the settings of a `Fragmenter`
+    is_fragmented : Callable[[nx.Graph], bool]
+        The function checking whether a fragmented graph is fragmented.
+        If `fragment` is a built-in method or a `Fragmenter`, the simulations sample removal masks of a compact copy of the graph instead of building the fragmented graphs (see `capsidgraph.analyser.compact`), with the same random draws.
+        A custom function then receives a read-only view of the fragmented graph, unless it is decorated with `requires_copy` (see `capsidgraph.analyser.view`)
     process_number: int
         Number of processes to spawn to perform the computation
     debug : bool
         If True, print debug information
     debug_interval : int
         The number of interations between two debug messages on the progress
+    progress : ProgressHook | List[ProgressHook] | None
+        A function, or a list of functions, called with progress events during the estimation. See `capsidgraph.analyser.progress` for built-in hooks.\n
+        Each event is a dict whose entry "event" is "progress" while the simulations are running and "end" once the estimation is done.
+        The other entries are the number of simulations "iterations", the number of fragmented graphs "fragmented", the current "estimate", the bounds "ci_low", "ci_high" and the width "ci_width" of its 95% confidence interval, the "elapsed" time, the throughput "sims_per_second", the expected number of simulations "target_iterations" and the remaining time "eta" if they can be predicted, and the "fragmentation" setting if any
+    progress_interval : float
+        The time in seconds between two "progress" events
+    profile : bool
+        Whether to measure the wall time and the number of calls of each phase of the simulations: the call to the fragmentation method ("fragment"), and for the built-in methods its parts "copy", "sample" and "remove" (only "sample" with the default `is_fragmented`), the connectivity check ("is_fragmented") and the update of the counters and of the stop condition ("reduce").
+        Profiling is disabled by default and then only costs a check per simulation.
 
     Returns
     -------
-    Tuple[float, bool]
-        The estimated fragmentation probability and an int representing the number of iterations used to compute it
+    ProbabilityResult
+        The result, unpacked as the estimated fragmentation probability and an int representing the number of iterations used to compute it.
+        If `profile` is True, they are followed by the profile report, with the totals of every phase and the profile of every worker process (see `capsidgraph.analyser.profiling.get_profile_report`).
+        The result also holds the number of fragmented graphs, the seeds of the worker processes, a copy of `fragment_settings` and the elapsed time, and can be merged with the results of other runs, see `capsidgraph.analyser.result`
     """
+    progress = _get_progress_hook(progress)
+    progress_settings = None
+    if fragment_settings is not None and "fragmentation" in fragment_settings:
+        progress_settings = {"fragmentation": fragment_settings["fragmentation"]}
+    settings = dict(fragment_settings) if fragment_settings is not None else None
+    fragment, is_fragmented = _get_default_methods(G, fragment, is_fragmented)
+    start = time.time()
+    if not profile:
+        if(process_number == 1):
+            seed = _seed_random()
+            fragmentation_count, n = _get_fragmentation_probability_singlethreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented,debug,debug_interval,progress,progress_interval,progress_settings)
+            return ProbabilityResult(fragmentation_count, n, [seed], settings, time.time() - start)
+        elif(process_number > 1):
+            fragmentation_count, n, seeds = _get_fragmentation_probability_multithreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented, process_number,debug,debug_interval,progress,progress_interval,progress_settings)
+            return ProbabilityResult(fragmentation_count, n, seeds, settings, time.time() - start)
     if(process_number == 1):
-        return _get_fragmentation_probability_singlethreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented,debug,debug_interval)
-    elif(process_number > 1):
-        return _get_fragmentation_probability_multithreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented, process_number,debug,debug_interval)
+        seeds = [_seed_random()]
+        previous_profiler = profiling._start_profiling()
+        try:
+            fragmentation_count, n = _get_fragmentation_probability_singlethreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented,debug,debug_interval,progress,progress_interval,progress_settings)
+        finally:
+            workers = [profiling._stop_profiling(previous_profiler)]
+    else:
+        fragmentation_count, n, seeds, workers = _get_fragmentation_probability_multithreaded(G,stop_condition,fragment,stop_condition_settings, fragment_settings,is_fragmented, process_number,debug,debug_interval,progress,progress_interval,progress_settings,profile=True)
+    elapsed = time.time() - start
+    return ProbabilityResult(fragmentation_count, n, seeds, settings, elapsed, profiling.get_profile_report(workers, elapsed, n))
 
 
 def _bisection_stop_condition(n: int, pfrag: float, settings: Dict, debug=False) -> bool:
@@ -314,19 +466,61 @@ def _bisection_stop_condition(n: int, pfrag: float, settings: Dict, debug=False)
     )
 
 
+def _get_target_iterations(
+    stop_condition: int | Callable[[int, float, Dict], bool],
+    n: int,
+    pfrag: float,
+    stop_condition_settings: Dict | None,
+) -> int | None:
+    """
+    Predict the total number of iterations of an estimation from its stop condition and the current estimate, None if it cannot be predicted
+    """
+    if type(stop_condition) == int:
+        return stop_condition
+    if stop_condition is _bisection_stop_condition:
+        max_iterations = stop_condition_settings.get("max_iterations", 1000000)
+        min_iterations = stop_condition_settings.get("min_iterations", 1000)
+        distance = 4 * (pfrag - 0.5) ** 2
+        if n == 0 or distance == 0:
+            return max_iterations
+        target = ceil(1 / (stop_condition_settings["error_probability"] * distance))
+        return min(max(target, min_iterations, n), max_iterations)
+    return None
+
+
+def _get_progress_event(
+    event: str,
+    n: int,
+    fragmentation_count: int,
+    elapsed: float,
+    stop_condition: int | Callable[[int, float, Dict], bool],
+    stop_condition_settings: Dict | None,
+    progress_settings: Dict | None,
+) -> Dict:
+    """
+    Create a progress event of an estimation
+    """
+    pfrag = fragmentation_count / n if n > 0 else 0
+    target = _get_target_iterations(stop_condition, n, pfrag, stop_condition_settings)
+    return _create_progress_event(event, n, fragmentation_count, elapsed, target, **(progress_settings or {}))
+
+
 def bisection(
     G: nx.Graph,
     steps: int,
     error_probability: float,
-    fragment: Callable[[nx.Graph, Dict], nx.Graph],
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
     fragment_settings: Dict | None = None,
     is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
     min_iterations: int = 1000,
     max_iterations: int = 1000000,
     debug: bool = False,
     debug_interval:int = 100000,
-    process_number: int = 1
-) -> Tuple[float, int]:
+    process_number: int = 1,
+    progress: ProgressHook | List[ProgressHook] | None = None,
+    progress_interval: float = 1,
+    profile: bool = False,
+) -> Tuple[float, int] | Tuple[float, int, Dict]:
     """
     Compute the fragmentation threshold of a graph G using a given fragmentation method, ie the "fragmentation" parameter of the fragmentation method for which the graph is fragmented with probability 1/2
 
@@ -338,9 +532,10 @@ def bisection(
         The number of bisection steps to perform
     error_probability : float
         The probability of making an error during the entire bisection process
-    fragment : Callable[[nx.Graph, Dict], None]
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], None]
         The fragmentation method to use. It must take as parameter a graph and a dict of settings and return the fragmented graph.
-        The fragmentation method must take a settings parameter which is a dict containing the "fragmentation" parameter, a value between 0 and 1
+        The fragmentation method must take a settings parameter which is a dict containing the "fragmentation" parameter, a value between 0 and 1.
+        A `Fragmenter` is prepared once for all the steps and its "fragmentation" setting is updated at every step
     fragment_settings : Dict | None
         The settings to pass to the fragmentation method, except for the "fragmentation", "min_iterations", "max_iterations" parameter
     min_iterations : int
@@ -351,10 +546,17 @@ def bisection(
         The number of iterations between two debug prints
     process_number: int
         Number of process to use for the simulations
+    progress : ProgressHook | List[ProgressHook] | None
+        A function, or a list of functions, called with progress events, see `get_fragmentation_probability`.
+        The events of each step also contain the "step" number and the "lower_bound" and "upper_bound" of the bisection, and a "step" event is emitted at the end of every step with the updated bounds.
+    progress_interval : float
+        The time in seconds between two "progress" events
+    profile : bool
+        Whether to measure the time spent in each phase of the simulations, see `get_fragmentation_probability`
     Returns
     -------
-    Tuple[float, int]
-        The estimated fragmentation threshold and the number of steps reached
+    Tuple[float, int] | Tuple[float, int, Dict]
+        The estimated fragmentation threshold and the number of steps reached, followed by the profile report of all the steps if `profile` is True
 
     """
     # Compute the upper bond of error for one bisection step from the upper bond of making a mistake in the entire process
@@ -364,11 +566,20 @@ def bisection(
     step_count = 0
     if(fragment_settings is None):
         fragment_settings = {}
+    progress = _get_progress_hook(progress)
+    # The compact graph and its cuts are computed once for all the steps
+    fragment, is_fragmented = _get_default_methods(G, fragment, is_fragmented)
+    reports = []
     while step_count < steps:
         middle = (lower_bound + upper_bound) / 2
         step_count += 1
         fragment_settings["fragmentation"] = middle
-        pfrag, iteration_count = get_fragmentation_probability(
+        step_progress = None
+        step_start = time.time()
+        if progress is not None:
+            bounds = {"step": step_count, "lower_bound": lower_bound, "upper_bound": upper_bound}
+            step_progress = lambda event: progress(dict(event, **bounds))
+        res = get_fragmentation_probability(
             G,
             _bisection_stop_condition,
             fragment,
@@ -381,14 +592,25 @@ def bisection(
             fragment_settings=fragment_settings,
             debug=debug,
             debug_interval=debug_interval,
-            process_number=process_number
+            process_number=process_number,
+            progress=step_progress,
+            progress_interval=progress_interval,
+            profile=profile,
         )
+        pfrag, iteration_count = res[:2]
+        if profile:
+            reports.append(res[2])
+        if iteration_count < max_iterations:
+            if pfrag > 0.5:
+                upper_bound = middle
+            else:
+                lower_bound = middle
+        if progress is not None:
+            progress(_create_progress_event("step", iteration_count, round(pfrag * iteration_count), time.time() - step_start, step=step_count, fragmentation=middle, lower_bound=lower_bound, upper_bound=upper_bound))
         if iteration_count >= max_iterations:
-            return middle, step_count
-        elif pfrag > 0.5:
-            upper_bound = middle
-        else:
-            lower_bound = middle
+            break
+    if profile:
+        return middle, step_count, profiling.merge_profile_reports(reports)
     return middle, step_count
 
 
@@ -397,7 +619,7 @@ def get_fragment_size_distribution(
     iterations: int,
     fragment: Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph],
     fragment_settings: Dict | None = None,
-) -> List[float]:
+) -> DistributionResult:
     """
     Compute the distribution of the size of the fragments obtained by fragmenting a graph G with a given fragmentation method
 
@@ -414,14 +636,17 @@ def get_fragment_size_distribution(
 
     Returns
     -------
-    List[float]
+    DistributionResult
         The distribution of the size of the fragments obtained by fragmenting a graph G with a given fragmentation method.
-        The entry i of the list is the estimated expected number of fragments of size i
+        The entry i of the list is the estimated expected number of fragments of size i, and the `counts` attribute holds the number of fragments of each size, see `capsidgraph.analyser.result`
     """
+    start = time.time()
+    seed = _seed_random()
     fragments_size = {}
     max_size = 0
+    with_settings = len(signature(fragment).parameters) == 2
     for i in range(iterations):
-        if len(signature(fragment).parameters) == 2:
+        if with_settings:
             G_ = fragment(G, fragment_settings)
         else:
             G_ = fragment(G)
@@ -429,10 +654,13 @@ def get_fragment_size_distribution(
             size = len(component)
             max_size = max(size, max_size)
             fragments_size[size] = fragments_size.get(size, 0) + 1
-    return [
-        fragments_size[i] / iterations if i in fragments_size else 0
-        for i in range(max_size + 1)
-    ]
+    return DistributionResult(
+        [fragments_size.get(i, 0) for i in range(max_size + 1)],
+        iterations,
+        [seed],
+        settings=dict(fragment_settings) if fragment_settings is not None else None,
+        elapsed=time.time() - start,
+    )
 
 
 def get_hole_size(fragmented_graph: nx.Graph, original_graph: nx.Graph) -> int:
@@ -480,7 +708,7 @@ def get_hole_size_distribution(
     iterations: int,
     fragment: Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph],
     fragment_settings: Dict | None = None,
-) -> List[float]:
+) -> DistributionResult:
     """
     Compute the distribution of the size of the holes obtained by fragmenting a graph G with a given fragmentation method.
 
@@ -497,20 +725,33 @@ def get_hole_size_distribution(
 
     Returns
     -------
-    List[float]:
-        The probability distribution of hole sizes. The i-th entry of the list is the probability of obtaining a hole of size i.
+    DistributionResult
+        The probability distribution of hole sizes. The i-th entry of the list is the probability of obtaining a hole of size i, and the `counts` attribute holds the number of holes of each size, see `capsidgraph.analyser.result`
     """
+    start = time.time()
     # Initialize the list of hole sizes
     holes_size = {}
+    # The built-in methods sample removal masks whose hole is computed on the compact graph
+    compact_methods = _get_compact_methods(G, fragment)
+    if compact_methods is not None:
+        fragment = compact_methods[0]
+        hole_size = fragment.cg.get_hole_size
+    else:
+        hole_size = lambda G_: get_hole_size(G_, G)
+    seed = _seed_random()
+    with_settings = len(signature(fragment).parameters) == 2
     # For each iteration
     for i in range(iterations):
-        if len(signature(fragment).parameters) == 2:
+        if with_settings:
             G_ = fragment(G, fragment_settings)
         else:
             G_ = fragment(G)
-        m = get_hole_size(G_, G)
+        m = hole_size(G_)
         holes_size[m] = holes_size.get(m, 0) + 1
-    return [
-        holes_size[i] / iterations if i in holes_size else 0
-        for i in range(len(G.nodes) + 1)
-    ]
+    return DistributionResult(
+        [holes_size.get(i, 0) for i in range(len(G.nodes) + 1)],
+        iterations,
+        [seed],
+        settings=dict(fragment_settings) if fragment_settings is not None else None,
+        elapsed=time.time() - start,
+    )
@@ -0,0 +1,488 @@
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import aclosing
+from inspect import signature
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+import networkx as nx
+from .analyse import (
+    _bisection_stop_condition,
+    _get_default_methods,
+    _get_progress_event,
+    _is_fragmented,
+)
+from .fragmenter import Fragmenter
+from .progress import ProgressHook, _create_progress_event, _get_progress_hook
+from .result import ProbabilityResult
+
+
+def _run_batch(
+    G: nx.Graph,
+    fragment: Callable,
+    fragment_settings: Dict | None,
+    is_fragmented: Callable,
+    batch_size: int,
+    seed: int,
+) -> int:
+    """
+    Run a batch of simulations in a worker process of the executor.
+
+    Returns
+    -------
+    int
+        The number of fragmented graphs
+    """
+    random.seed(seed)
+    with_settings = len(signature(fragment).parameters) == 2
+    count = 0
+    for _ in range(batch_size):
+        if with_settings:
+            G_ = fragment(G, fragment_settings)
+        else:
+            G_ = fragment(G)
+        if is_fragmented(G_):
+            count += 1
+    return count
+
+
+async def _iter_estimation(
+    G: nx.Graph,
+    stop_condition: int | Callable[[int, float, Dict], bool],
+    fragment: Callable,
+    stop_condition_settings: Dict | None,
+    fragment_settings: Dict | None,
+    is_fragmented: Callable,
+    process_number: int,
+    executor: Executor,
+    batch_size: int,
+    progress_interval: float,
+    seeds: List[int] | None = None,
+) -> AsyncIterator[Dict]:
+    """
+    Estimate a fragmentation probability with batches of simulations submitted to an executor, yielding the progress events of the estimation.
+
+    At most `process_number` batches are running at once. The results of the batches are merged in the order of their submission and the stop condition is checked after each of them, so the estimate only depends on the seed of the `random` module. The batches still running when the estimation stops, or when the iterator is closed or cancelled, are cancelled.
+    The seeds of the merged batches are appended to `seeds`.
+    """
+    loop = asyncio.get_running_loop()
+    progress_settings = None
+    if fragment_settings is not None and "fragmentation" in fragment_settings:
+        progress_settings = {"fragmentation": fragment_settings["fragmentation"]}
+    start = time.time()
+    next_progress = start + progress_interval
+    n = 0
+    fragmentation_count = 0
+    submitted = 0
+    pending = deque()
+
+    def submit():
+        nonlocal submitted
+        while len(pending) < process_number:
+            size = batch_size
+            if type(stop_condition) == int:
+                size = min(batch_size, stop_condition - submitted)
+                if size <= 0:
+                    return
+            seed = random.getrandbits(64)
+            future = loop.run_in_executor(
+                executor,
+                _run_batch,
+                G,
+                fragment,
+                fragment_settings,
+                is_fragmented,
+                size,
+                seed,
+            )
+            pending.append((size, seed, future))
+            submitted += size
+
+    try:
+        submit()
+        while len(pending) > 0:
+            size, seed, future = pending.popleft()
+            fragmentation_count += await future
+            n += size
+            if seeds is not None:
+                seeds.append(seed)
+            if type(stop_condition) == int:
+                if n >= stop_condition:
+                    break
+            elif stop_condition(n, fragmentation_count / n, stop_condition_settings):
+                break
+            if time.time() >= next_progress:
+                next_progress = time.time() + progress_interval
+                yield _get_progress_event(
+                    "progress",
+                    n,
+                    fragmentation_count,
+                    time.time() - start,
+                    stop_condition,
+                    stop_condition_settings,
+                    progress_settings,
+                )
+            submit()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+    yield _get_progress_event(
+        "end",
+        n,
+        fragmentation_count,
+        time.time() - start,
+        stop_condition,
+        stop_condition_settings,
+        progress_settings,
+    )
+
+
+async def iter_fragmentation_probability(
+    G: nx.Graph,
+    stop_condition: int | Callable[[int, float, Dict], bool],
+    fragment: Fragmenter
+    | Callable[[nx.Graph, Dict], nx.Graph]
+    | Callable[[nx.Graph], nx.Graph],
+    stop_condition_settings: Dict | None = None,
+    fragment_settings: Dict | None = None,
+    is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    process_number: int = 1,
+    executor: Executor | None = None,
+    batch_size: int = 1000,
+    progress_interval: float = 1,
+    seeds: List[int] | None = None,
+) -> AsyncIterator[Dict]:
+    """
+    Estimate the fragmentation probability of a graph without blocking the event loop, yielding the progress events of the estimation, see `get_fragmentation_probability`.
+
+    The simulations run by batches in the worker processes of an executor. The last event is the "end" event, whose "estimate" and "iterations" are the result of the estimation.
+    Cancelling the task iterating, or closing the iterator, cancels the batches that have not started yet and discards the running ones.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    stop_condition : int | Callable[[int, float, Dict], bool]
+        The number of simulations, or the stop condition checked after every batch, see `get_fragmentation_probability`
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph]
+        The fragmentation method to use, see `get_fragmentation_probability`
+    stop_condition_settings : Dict | None, optional
+        The settings to pass to the stop condition callable
+    fragment_settings : Dict | None, optional
+        The settings to pass to the fragmentation method
+    is_fragmented : Callable[[nx.Graph], bool], optional
+        The function checking whether a fragmented graph is fragmented, see `get_fragmentation_probability`. It must be picklable to be sent to the worker processes
+    process_number : int, optional
+        The maximum number of batches running at once, and the number of worker processes if `executor` is not given
+    executor : Executor | None, optional
+        The executor running the batches, for instance a `concurrent.futures.ProcessPoolExecutor` shared by several estimations. By default a process pool is created for the estimation and shut down at its end
+    batch_size : int, optional
+        The number of simulations of a batch
+    progress_interval : float, optional
+        The time in seconds between two "progress" events
+    seeds : List[int] | None, optional
+        A list to which the seeds of the batches counted in the estimate are appended
+
+    Yields
+    ------
+    Dict
+        The progress events, see `get_fragmentation_probability`
+    """
+    loop = asyncio.get_running_loop()
+    # The compact graph is built in a thread, not to block the event loop
+    fragment, is_fragmented = await loop.run_in_executor(
+        None, _get_default_methods, G, fragment, is_fragmented
+    )
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(process_number)
+    try:
+        async with aclosing(
+            _iter_estimation(
+                G,
+                stop_condition,
+                fragment,
+                stop_condition_settings,
+                fragment_settings,
+                is_fragmented,
+                process_number,
+                executor,
+                batch_size,
+                progress_interval,
+                seeds,
+            )
+        ) as events:
+            async for event in events:
+                yield event
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def get_fragmentation_probability_async(
+    G: nx.Graph,
+    stop_condition: int | Callable[[int, float, Dict], bool],
+    fragment: Fragmenter
+    | Callable[[nx.Graph, Dict], nx.Graph]
+    | Callable[[nx.Graph], nx.Graph],
+    stop_condition_settings: Dict | None = None,
+    fragment_settings: Dict | None = None,
+    is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    process_number: int = 1,
+    executor: Executor | None = None,
+    batch_size: int = 1000,
+    progress: ProgressHook | List[ProgressHook] | None = None,
+    progress_interval: float = 1,
+) -> ProbabilityResult:
+    """
+    Compute the fragmentation probability of a graph without blocking the event loop, see `get_fragmentation_probability` and `iter_fragmentation_probability`.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    stop_condition : int | Callable[[int, float, Dict], bool]
+        The number of simulations, or the stop condition checked after every batch, see `get_fragmentation_probability`
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph]
+        The fragmentation method to use, see `get_fragmentation_probability`
+    stop_condition_settings : Dict | None, optional
+        The settings to pass to the stop condition callable
+    fragment_settings : Dict | None, optional
+        The settings to pass to the fragmentation method
+    is_fragmented : Callable[[nx.Graph], bool], optional
+        The function checking whether a fragmented graph is fragmented, it must be picklable
+    process_number : int, optional
+        The maximum number of batches running at once, and the number of worker processes if `executor` is not given
+    executor : Executor | None, optional
+        The executor running the batches, by default a process pool created for the estimation
+    batch_size : int, optional
+        The number of simulations of a batch
+    progress : ProgressHook | List[ProgressHook] | None, optional
+        A function, or a list of functions, called with the progress events
+    progress_interval : float, optional
+        The time in seconds between two "progress" events
+
+    Returns
+    -------
+    ProbabilityResult
+        The result, unpacked as the estimated fragmentation probability and the number of simulations used to compute it, with the seeds of the batches, see `capsidgraph.analyser.result`
+    """
+    progress = _get_progress_hook(progress)
+    settings = dict(fragment_settings) if fragment_settings is not None else None
+    seeds = []
+    async with aclosing(
+        iter_fragmentation_probability(
+            G,
+            stop_condition,
+            fragment,
+            stop_condition_settings=stop_condition_settings,
+            fragment_settings=fragment_settings,
+            is_fragmented=is_fragmented,
+            process_number=process_number,
+            executor=executor,
+            batch_size=batch_size,
+            progress_interval=progress_interval,
+            seeds=seeds,
+        )
+    ) as events:
+        async for event in events:
+            if progress is not None:
+                progress(event)
+    return ProbabilityResult(
+        event["fragmented"], event["iterations"], seeds, settings, event["elapsed"]
+    )
+
+
+async def iter_bisection(
+    G: nx.Graph,
+    steps: int,
+    error_probability: float,
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict | None = None,
+    is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    min_iterations: int = 1000,
+    max_iterations: int = 1000000,
+    process_number: int = 1,
+    executor: Executor | None = None,
+    batch_size: int = 1000,
+    progress_interval: float = 1,
+) -> AsyncIterator[Dict]:
+    """
+    Compute the fragmentation threshold of a graph without blocking the event loop, yielding the progress events of the bisection, see `bisection`.
+
+    The events of each step contain the "step" number and the "lower_bound" and "upper_bound" of the bisection, and a "step" event is yielded at the end of every step with the updated bounds. The "fragmentation" and "step" of the last event are the result of the bisection.
+    Cancelling the task iterating, or closing the iterator, cancels the running step.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    steps : int
+        The number of bisection steps to perform
+    error_probability : float
+        The probability of making an error during the entire bisection process
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method to use, see `bisection`
+    fragment_settings : Dict | None, optional
+        The settings to pass to the fragmentation method, except for the "fragmentation". The dict is not modified
+    is_fragmented : Callable[[nx.Graph], bool], optional
+        The function checking whether a fragmented graph is fragmented, it must be picklable
+    min_iterations : int, optional
+        The minimum number of iterations to perform for each step
+    max_iterations : int, optional
+        The maximum number of iterations to perform for each step
+    process_number : int, optional
+        The maximum number of batches running at once, and the number of worker processes if `executor` is not given
+    executor : Executor | None, optional
+        The executor running the batches, by default a process pool created for the bisection and shared by its steps
+    batch_size : int, optional
+        The number of simulations of a batch
+    progress_interval : float, optional
+        The time in seconds between two "progress" events
+
+    Yields
+    ------
+    Dict
+        The progress events, see `bisection`
+    """
+    loop = asyncio.get_running_loop()
+    eps = 1 - (1 - error_probability) ** (1 / steps)
+    stop_condition_settings = {
+        "error_probability": eps,
+        "min_iterations": min_iterations,
+        "max_iterations": max_iterations,
+    }
+    lower_bound = 0
+    upper_bound = 1
+    step_count = 0
+    fragment, is_fragmented = await loop.run_in_executor(
+        None, _get_default_methods, G, fragment, is_fragmented
+    )
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(process_number)
+    try:
+        while step_count < steps:
+            middle = (lower_bound + upper_bound) / 2
+            step_count += 1
+            settings = dict(fragment_settings or {}, fragmentation=middle)
+            bounds = {
+                "step": step_count,
+                "lower_bound": lower_bound,
+                "upper_bound": upper_bound,
+            }
+            step_start = time.time()
+            async with aclosing(
+                _iter_estimation(
+                    G,
+                    _bisection_stop_condition,
+                    fragment,
+                    stop_condition_settings,
+                    settings,
+                    is_fragmented,
+                    process_number,
+                    executor,
+                    batch_size,
+                    progress_interval,
+                )
+            ) as events:
+                async for event in events:
+                    yield dict(event, **bounds)
+            iteration_count = event["iterations"]
+            fragmentation_count = event["fragmented"]
+            if iteration_count < max_iterations:
+                if fragmentation_count > iteration_count / 2:
+                    upper_bound = middle
+                else:
+                    lower_bound = middle
+            yield _create_progress_event(
+                "step",
+                iteration_count,
+                fragmentation_count,
+                time.time() - step_start,
+                step=step_count,
+                fragmentation=middle,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+            )
+            if iteration_count >= max_iterations:
+                break
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def bisection_async(
+    G: nx.Graph,
+    steps: int,
+    error_probability: float,
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict | None = None,
+    is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    min_iterations: int = 1000,
+    max_iterations: int = 1000000,
+    process_number: int = 1,
+    executor: Executor | None = None,
+    batch_size: int = 1000,
+    progress: ProgressHook | List[ProgressHook] | None = None,
+    progress_interval: float = 1,
+) -> Tuple[float, int]:
+    """
+    Compute the fragmentation threshold of a graph without blocking the event loop, see `bisection` and `iter_bisection`.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    steps : int
+        The number of bisection steps to perform
+    error_probability : float
+        The probability of making an error during the entire bisection process
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method to use, see `bisection`
+    fragment_settings : Dict | None, optional
+        The settings to pass to the fragmentation method, except for the "fragmentation"
+    is_fragmented : Callable[[nx.Graph], bool], optional
+        The function checking whether a fragmented graph is fragmented, it must be picklable
+    min_iterations : int, optional
+        The minimum number of iterations to perform for each step
+    max_iterations : int, optional
+        The maximum number of iterations to perform for each step
+    process_number : int, optional
+        The maximum number of batches running at once, and the number of worker processes if `executor` is not given
+    executor : Executor | None, optional
+        The executor running the batches, by default a process pool created for the bisection
+    batch_size : int, optional
+        The number of simulations of a batch
+    progress : ProgressHook | List[ProgressHook] | None, optional
+        A function, or a list of functions, called with the progress events
+    progress_interval : float, optional
+        The time in seconds between two "progress" events
+
+    Returns
+    -------
+    Tuple[float, int]
+        The estimated fragmentation threshold and the number of steps reached
+    """
+    progress = _get_progress_hook(progress)
+    async with aclosing(
+        iter_bisection(
+            G,
+            steps,
+            error_probability,
+            fragment,
+            fragment_settings=fragment_settings,
+            is_fragmented=is_fragmented,
+            min_iterations=min_iterations,
+            max_iterations=max_iterations,
+            process_number=process_number,
+            executor=executor,
+            batch_size=batch_size,
+            progress_interval=progress_interval,
+        )
+    ) as events:
+        async for event in events:
+            if progress is not None:
+                progress(event)
+    return event["fragmentation"], event["step"]
@@ -0,0 +1,79 @@
+import importlib.util
+
+# Module of the compiled kernels, None when the pure Python implementation is used
+_kernels = None
+# The selected backend, "auto" until the kernels are first needed
+_backend = "auto"
+# Whether the compiled kernels consume the uniform numbers of the Python implementation
+_exact_stream = True
+
+
+def _load_kernels():
+    """
+    Import the kernels compiled with Numba.
+    """
+    from . import kernels
+
+    return kernels
+
+
+def is_numba_available() -> bool:
+    """
+    Determine if Numba is installed.
+    """
+    return importlib.util.find_spec("numba") is not None
+
+
+def set_backend(backend: str = "auto", exact_stream: bool = True) -> None:
+    """
+    Select the implementation of the kernels of the compact graph: the connectivity check, the hole size computation and the removals of `strength_edges_fragment` and `strength_nodes_fragment`.
+
+    Parameters
+    ----------
+    backend : str, optional
+        `"numba"` to compile the kernels with Numba, `"python"` for the pure Python implementation, or `"auto"` to use Numba when it is installed
+    exact_stream : bool, optional
+        Whether the Numba kernels of the strength methods consume the same uniform numbers as the Python implementation, True by default
+
+    Notes
+    -----
+    The kernels are compiled at their first call and cached on disk.
+    With `exact_stream`, the Numba kernels of the strength methods consume the uniform numbers drawn by the generator given to the fragmenter in the same order as the Python implementation, so both backends give the same estimates for a given seed.
+    As the number of uniform numbers needed by a sample is only known once they are consumed, they are drawn by the interpreter ahead, then the generator is rewound and advanced by the number used, which limits the speedup of these kernels.
+    Without it, each sample draws a single seed from the generator and the kernels draw their uniform numbers from a compiled SplitMix64 generator: the estimates are still reproducible for a given seed, but differ from the ones of the Python implementation.
+    Worker processes started with the "fork" method inherit the selected backend.
+    """
+    global _kernels, _backend, _exact_stream
+    if backend == "python":
+        _kernels = None
+    elif backend == "numba":
+        if not is_numba_available():
+            raise ImportError("the numba backend requires the numba package")
+        _kernels = _load_kernels()
+    elif backend == "auto":
+        _kernels = None
+    else:
+        raise ValueError(
+            "backend must be 'auto', 'numba' or 'python', got %r" % backend
+        )
+    _backend = backend
+    _exact_stream = exact_stream
+
+
+def _get_kernels():
+    """
+    Return the module of the compiled kernels, None for the Python backend.
+    With the automatic selection, Numba is only imported the first time the kernels are needed.
+    """
+    global _kernels, _backend
+    if _backend == "auto":
+        _kernels = _load_kernels() if is_numba_available() else None
+        _backend = "python" if _kernels is None else "numba"
+    return _kernels
+
+
+def get_backend() -> str:
+    """
+    Return the selected backend, `"numba"` or `"python"`.
+    """
+    return "python" if _get_kernels() is None else "numba"
@@ -0,0 +1,762 @@
+import random
+import time
+from typing import Dict, List, Tuple
+import networkx as nx
+import numpy as np
+from . import backend, profiling
+from .view import MaskedGraph
+
+# Largest graph whose edge and node connectivity are computed exactly, the node connectivity needs a number of flow computations growing with the size of the graph
+_EXACT_CUTS_MAX_NODES = 100
+# Exact connectivities of the last graphs, keyed by their number of nodes and edge array, as every estimation compiles its own compact graph
+_CONNECTIVITY_CACHE = {}
+_CONNECTIVITY_CACHE_SIZE = 16
+
+
+class CompactGraph:
+    """
+    Compact adjacency of a graph, used to simulate fragmentations without copying the graph.
+
+    Nodes are numbered from 0 to n-1 in the order of `G.nodes` and edges from 0 to m-1 in the order of `G.edges`.
+    A fragmentation is described by a removal mask, a bytearray of length n+m whose entry i is 1 if the node i is removed and whose entry n+j is 1 if the edge j is removed.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph
+
+    Attributes
+    ----------
+    nodes : List
+        The labels of the nodes
+    edges : np.ndarray
+        Array of shape (m, 2) containing the indices of the extremities of each edge
+    indptr : np.ndarray
+        The neighbours of the node i are `indices[indptr[i]:indptr[i+1]]`, in the order of `G.adj`
+    indices : np.ndarray
+        The indices of the neighbours of every node
+    edge_ids : np.ndarray
+        The index of the edge leading to each neighbour in `indices`
+    """
+
+    def __init__(self, G: nx.Graph):
+        self.nodes = list(G.nodes)
+        self.n = len(self.nodes)
+        self.m = len(G.edges)
+        index = {node: i for i, node in enumerate(self.nodes)}
+        edge_index = {}
+        edges = []
+        for j, (a, b) in enumerate(G.edges):
+            edge_index[(a, b)] = j
+            edge_index[(b, a)] = j
+            edges.append((index[a], index[b]))
+        self.edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        # Neighbours and edges of each node, as python lists for fast traversals
+        self.adjacency = [
+            [
+                (index[neighbour], edge_index[(node, neighbour)])
+                for neighbour in G.adj[node]
+            ]
+            for node in self.nodes
+        ]
+        self.indptr = np.cumsum([0] + [len(a) for a in self.adjacency]).astype(
+            np.int64
+        )
+        self.indices = np.array(
+            [w for a in self.adjacency for w, _ in a], dtype=np.int64
+        )
+        self.edge_ids = np.array(
+            [e for a in self.adjacency for _, e in a], dtype=np.int64
+        )
+        self.is_connected = self.n > 0 and nx.is_connected(G)
+        strength = nx.get_edge_attributes(G, "strength")
+        self.edge_strength = (
+            [strength[e] for e in G.edges] if len(strength) == self.m else None
+        )
+        node_strength = nx.get_node_attributes(G, "strength")
+        self.node_strength = (
+            [node_strength[v] for v in self.nodes]
+            if len(node_strength) == self.n
+            else None
+        )
+        # Preallocated traversal state, a node is visited if its entry is equal to the current stamp
+        self._visited = [0] * self.n
+        self._stamp = 0
+        # Work arrays of the compiled kernels, stamped like `_visited`
+        self._kernel_visited = np.zeros(self.n, np.int64)
+        self._kernel_stack = np.empty(self.n, np.int64)
+        self._kernel_component = np.empty(self.n, np.int64)
+        self._kernel_largest = np.empty(self.n, np.int64)
+        # Cuts of the graph, unknown until `compute_cuts` is called
+        self.edge_connectivity = 0
+        self.node_connectivity = 0
+        self.bridges = None
+        self.articulation_points = None
+
+    def compute_cuts(self, exact: bool | None = None) -> None:
+        """
+        Compute the bridges, the articulation points, and the edge and node connectivity of the graph.
+        Removal masks removing fewer elements than the connectivity are then classified without traversal by `is_fragmented`.
+
+        Parameters
+        ----------
+        exact : bool | None, optional
+            Whether to compute the exact connectivity with flow computations, by default only for graphs of at most 100 nodes. The exact connectivities of the last graphs are cached.
+            Otherwise the connectivity is replaced by a lower bound deduced from the bridges and articulation points: 2 if there are none, 1 if the graph is connected and 0 otherwise
+        """
+        H = nx.Graph()
+        H.add_nodes_from(range(self.n))
+        H.add_edges_from(self.edges.tolist())
+        if not self.is_connected:
+            self.edge_connectivity = 0
+            self.node_connectivity = 0
+            self.bridges = set()
+            self.articulation_points = set()
+            return
+        edge_index = {}
+        for j, (a, b) in enumerate(self.edges.tolist()):
+            edge_index[(a, b)] = j
+            edge_index[(b, a)] = j
+        self.bridges = set(edge_index[e] for e in nx.bridges(H))
+        self.articulation_points = set(nx.articulation_points(H))
+        if exact is None:
+            exact = self.n <= _EXACT_CUTS_MAX_NODES
+        if exact:
+            key = (self.n, self.edges.tobytes())
+            if key not in _CONNECTIVITY_CACHE:
+                if len(_CONNECTIVITY_CACHE) >= _CONNECTIVITY_CACHE_SIZE:
+                    _CONNECTIVITY_CACHE.pop(next(iter(_CONNECTIVITY_CACHE)))
+                _CONNECTIVITY_CACHE[key] = (
+                    nx.edge_connectivity(H),
+                    nx.node_connectivity(H),
+                )
+            self.edge_connectivity, self.node_connectivity = _CONNECTIVITY_CACHE[key]
+        else:
+            self.edge_connectivity = 1 if len(self.bridges) > 0 else 2
+            self.node_connectivity = (
+                1 if len(self.articulation_points) > 0 or self.n < 3 else 2
+            )
+
+    def create_mask(self) -> bytearray:
+        """
+        Create a removal mask where nothing is removed.
+        """
+        return bytearray(self.n + self.m)
+
+    def _get_start(self, mask: bytearray) -> int | None:
+        """
+        Return a surviving node next to the first removed element, None if nothing is removed.
+        """
+        n = self.n
+        first = mask.find(1)
+        if first == -1:
+            return None
+        if first < n:
+            for w, _ in self.adjacency[first]:
+                if not mask[w]:
+                    return w
+        else:
+            for w in self.edges[first - n].tolist():
+                if not mask[w]:
+                    return w
+        # Every neighbour is removed, start from any surviving node
+        return mask.find(0, 0, n)
+
+    def is_fragmented(self, mask: bytearray) -> bool:
+        """
+        Determine if the graph is fragmented once the elements of a removal mask are removed.
+
+        Parameters
+        ----------
+        mask : bytearray
+            The removal mask
+
+        Returns
+        -------
+        bool
+            Whether the remaining graph has at least one node and is not connected, like `_is_fragmented` on the fragmented graph
+
+        Notes
+        -----
+        If `compute_cuts` has been called, masks removing fewer nodes or edges than the connectivity, or a single element which is not an articulation point or a bridge, are classified without traversal.
+        Otherwise the traversal starts next to a removed element and stops as soon as every surviving node has been reached.
+        """
+        n = self.n
+        removed_nodes = mask.count(1, 0, n)
+        surviving = n - removed_nodes
+        if surviving == 0:
+            return False
+        # Fewer removals than the connectivity cannot disconnect the graph
+        removed_edges = mask.count(1, n)
+        if removed_nodes == 0 and removed_edges < self.edge_connectivity:
+            return False
+        if removed_edges == 0 and removed_nodes < self.node_connectivity:
+            return False
+        # A disconnected graph stays disconnected without its articulation points and bridges
+        if (
+            removed_nodes + removed_edges == 1
+            and self.bridges is not None
+            and self.is_connected
+        ):
+            first = mask.find(1)
+            if first < n and first not in self.articulation_points:
+                return False
+            if first >= n and first - n not in self.bridges:
+                return False
+        start = self._get_start(mask)
+        if start is None:
+            return not self.is_connected
+        if surviving == 1:
+            return False
+        kernels = backend._get_kernels()
+        if kernels is not None:
+            self._stamp += 1
+            return kernels.is_fragmented(
+                self.indptr,
+                self.indices,
+                self.edge_ids,
+                np.frombuffer(mask, dtype=np.uint8),
+                n,
+                start,
+                surviving,
+                self._kernel_visited,
+                self._stamp,
+                self._kernel_stack,
+            )
+        self._stamp += 1
+        stamp = self._stamp
+        visited = self._visited
+        adjacency = self.adjacency
+        visited[start] = stamp
+        reached = 1
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for w, e in adjacency[v]:
+                if visited[w] != stamp and not mask[w] and not mask[n + e]:
+                    visited[w] = stamp
+                    reached += 1
+                    if reached == surviving:
+                        return False
+                    stack.append(w)
+        return True
+
+    def get_largest_component_size(self, mask: bytearray) -> int:
+        """
+        Compute the size of the largest connected component once the elements of a removal mask are removed.
+
+        Parameters
+        ----------
+        mask : bytearray
+            The removal mask
+
+        Returns
+        -------
+        int
+            The number of nodes of the largest connected component, 0 if every node is removed
+        """
+        n = self.n
+        self._stamp += 1
+        stamp = self._stamp
+        visited = self._visited
+        adjacency = self.adjacency
+        largest = 0
+        remaining = n - mask.count(1, 0, n)
+        for start in range(n):
+            if mask[start] or visited[start] == stamp:
+                continue
+            visited[start] = stamp
+            size = 1
+            stack = [start]
+            while stack:
+                v = stack.pop()
+                for w, e in adjacency[v]:
+                    if visited[w] != stamp and not mask[w] and not mask[n + e]:
+                        visited[w] = stamp
+                        size += 1
+                        stack.append(w)
+            largest = max(largest, size)
+            remaining -= size
+            if largest >= remaining:
+                break
+        return largest
+
+    def _get_hole(self, mask: bytearray, size: int | None) -> int | bool:
+        """
+        Compute the hole size of `get_hole_size` once the elements of a removal mask are removed, or whether it is at least `size` if it is given.
+        In the second case the traversals stop as soon as a component of the fragmented graph too large to leave such a hole, or a large enough hole, is found.
+        """
+        kernels = backend._get_kernels()
+        if kernels is not None:
+            # The kernel uses up to n stamps
+            stamp = self._stamp + 1
+            self._stamp += self.n
+            res = kernels.get_hole(
+                self.indptr,
+                self.indices,
+                self.edge_ids,
+                np.frombuffer(mask, dtype=np.uint8),
+                self.n,
+                -1 if size is None else size,
+                self._kernel_visited,
+                stamp,
+                self._kernel_component,
+                self._kernel_stack,
+                self._kernel_largest,
+            )
+            return res if size is None else res == 1
+        n = self.n
+        adjacency = self.adjacency
+        visited = self._visited
+        surviving = n - mask.count(1, 0, n)
+        if surviving == 0:
+            return n if size is None else n >= size
+        # Largest connected components of the fragmented graph
+        self._stamp += 1
+        stamp = self._stamp
+        largest = []
+        largest_size = 0
+        remaining = surviving
+        for start in range(n):
+            if remaining < largest_size:
+                # No other component can be as large
+                break
+            if mask[start] or visited[start] == stamp:
+                continue
+            visited[start] = stamp
+            component = [start]
+            i = 0
+            while i < len(component):
+                v = component[i]
+                i += 1
+                for w, e in adjacency[v]:
+                    if visited[w] != stamp and not mask[w] and not mask[n + e]:
+                        visited[w] = stamp
+                        component.append(w)
+            remaining -= len(component)
+            if size is not None and n - len(component) < size:
+                # The largest components are at least as large, their holes are smaller than `size`
+                return False
+            if len(component) > largest_size:
+                largest = [component]
+                largest_size = len(component)
+            elif len(component) == largest_size:
+                largest.append(component)
+        # Largest connected component of the original graph outside each of them
+        hole = 0
+        for component in largest:
+            outside = n - len(component)
+            if outside == 0:
+                return 0 if size is None else size <= 0
+            if size is not None and outside < size:
+                continue
+            self._stamp += 1
+            stamp = self._stamp
+            for v in component:
+                visited[v] = stamp
+            remaining = outside
+            for start in range(n):
+                if remaining <= hole or (size is not None and remaining < size):
+                    break
+                if visited[start] == stamp:
+                    continue
+                visited[start] = stamp
+                stack = [start]
+                count = 1
+                while stack:
+                    v = stack.pop()
+                    for w, _ in adjacency[v]:
+                        if visited[w] != stamp:
+                            visited[w] = stamp
+                            count += 1
+                            stack.append(w)
+                remaining -= count
+                if size is not None and count >= size:
+                    return True
+                hole = max(hole, count)
+        return hole if size is None else False
+
+    def get_hole_size(self, mask: bytearray) -> int:
+        """
+        Compute the size of the hole once the elements of a removal mask are removed, like `get_hole_size` on the fragmented graph.
+
+        Parameters
+        ----------
+        mask : bytearray
+            The removal mask
+
+        Returns
+        -------
+        int
+            The size of the hole
+        """
+        return self._get_hole(mask, None)
+
+    def has_hole(self, mask: bytearray, size: int) -> bool:
+        """
+        Determine if the hole left by a removal mask has at least a given size, without computing the whole hole.
+
+        Parameters
+        ----------
+        mask : bytearray
+            The removal mask
+        size : int
+            The hole size
+
+        Returns
+        -------
+        bool
+            Whether the size of the hole, see `get_hole_size`, is at least `size`
+        """
+        return self._get_hole(mask, size)
+
+    def to_graph(self, mask: bytearray) -> nx.Graph:
+        """
+        Build the fragmented graph described by a removal mask.
+
+        Parameters
+        ----------
+        mask : bytearray
+            The removal mask
+
+        Returns
+        -------
+        nx.Graph
+            The subgraph of the remaining nodes and edges
+        """
+        H = nx.Graph()
+        H.add_nodes_from(v for i, v in enumerate(self.nodes) if not mask[i])
+        H.add_edges_from(
+            (self.nodes[a], self.nodes[b])
+            for j, (a, b) in enumerate(self.edges.tolist())
+            if not mask[self.n + j] and not mask[a] and not mask[b]
+        )
+        return H
+
+
+class _StrengthEdgesProcess:
+    """
+    Removal process of `strength_edges_fragment` on a compact graph, one edge at a time, drawing the same random numbers.
+    """
+
+    def __init__(self, cg: CompactGraph, strength: float, rng=random):
+        self.cg = cg
+        self.strength = strength
+        self.rng = rng
+        self.remaining_edges = list(range(cg.m))
+        self.remaining_weights = [1 / s for s in cg.edge_strength]
+        self.min_bond_strength = 1 / max(self.remaining_weights)
+        self.mask = cg.create_mask()
+        self.finished = False
+
+    def step(self) -> int | None:
+        """
+        Draw and remove the next edge.
+
+        Returns
+        -------
+        int | None
+            The index of the removed edge, None if the process is finished
+        """
+        if self.finished or not self.strength > self.min_bond_strength:
+            self.finished = True
+            return None
+        bond_strength = self.cg.edge_strength
+        remaining_edges = self.remaining_edges
+        i = None
+        while (
+            i == None or self.strength <= bond_strength[remaining_edges[i]]
+        ) and len(remaining_edges) > 0:
+            [i] = self.rng.choices(
+                list(range(len(remaining_edges))),
+                weights=self.remaining_weights,
+                k=1,
+            )
+        if i == None:
+            self.finished = True
+            return None
+        edge = remaining_edges[i]
+        self.apply(edge)
+        return edge
+
+    def apply(self, edge: int) -> None:
+        """
+        Remove an edge, to replay a removal drawn by `step`.
+        """
+        i = self.remaining_edges.index(edge)
+        self.strength -= self.cg.edge_strength[edge]
+        self.mask[self.cg.n + edge] = 1
+        del self.remaining_edges[i]
+        del self.remaining_weights[i]
+        if len(self.remaining_weights) > 0:
+            self.min_bond_strength = 1 / max(self.remaining_weights)
+
+    def is_feasible(self, elements: List[int]) -> bool:
+        """
+        Whether the process can still remove all the given edges, as mask indices: an edge can be drawn if its strength is less than the remaining strength, so a set of edges can be removed if their total strength is.
+        """
+        if self.finished:
+            return len(elements) == 0
+        n = self.cg.n
+        if any(self.mask[i] or i < n for i in elements):
+            return False
+        return sum(self.cg.edge_strength[i - n] for i in elements) < self.strength
+
+
+class _StrengthNodesProcess:
+    """
+    Removal process of `strength_nodes_fragment` on a compact graph, one node at a time, drawing the same random numbers.
+    """
+
+    def __init__(self, cg: CompactGraph, strength: float, rng=random):
+        self.cg = cg
+        self.strength = strength
+        self.rng = rng
+        self.node_strength = cg.node_strength.copy()
+        self.weights = [1 / s for s in self.node_strength]
+        self.remaining_nodes = list(range(cg.n))
+        self.min_node_strength = 1 / max(self.weights)
+        self.mask = cg.create_mask()
+        self.finished = False
+
+    def step(self) -> int | None:
+        """
+        Draw and remove the next node, and the neighbours left without strength.
+
+        Returns
+        -------
+        int | None
+            The index of the drawn node, None if the process is finished
+        """
+        if self.finished or not self.strength + 1e-15 > self.min_node_strength:
+            self.finished = True
+            return None
+        node_strength = self.node_strength
+        remaining_nodes = self.remaining_nodes
+        i = None
+        while (
+            i == None or self.strength + 1e-15 < node_strength[remaining_nodes[i]]
+        ) and len(remaining_nodes) > 0:
+            [i] = self.rng.choices(
+                list(range(len(remaining_nodes))), weights=self.weights, k=1
+            )
+        if i == None:
+            self.finished = True
+            return None
+        node = remaining_nodes[i]
+        self.apply(node)
+        return node
+
+    def apply(self, node: int) -> None:
+        """
+        Remove a node, to replay a removal drawn by `step`.
+        """
+        node_strength = self.node_strength
+        remaining_nodes = self.remaining_nodes
+        weights = self.weights
+        mask = self.mask
+        i = remaining_nodes.index(node)
+        self.strength -= node_strength[node]
+        mask[node] = 1
+        # Update the strength and probability weight of the neighbours, like `_remove_node`
+        removed_neighbours = []
+        for neighbour, e in self.cg.adjacency[node]:
+            if not mask[neighbour]:
+                neighbour_index = remaining_nodes.index(neighbour)
+                node_strength[neighbour] -= self.cg.edge_strength[e]
+                if node_strength[neighbour] > 1e-15:
+                    weights[neighbour_index] = abs(1 / node_strength[neighbour])
+                else:
+                    removed_neighbours.append(neighbour)
+        del remaining_nodes[i]
+        del weights[i]
+        for neighbour in removed_neighbours:
+            neighbour_index = remaining_nodes.index(neighbour)
+            del remaining_nodes[neighbour_index]
+            del weights[neighbour_index]
+            mask[neighbour] = 1
+        if len(weights) > 0:
+            self.min_node_strength = 1 / max(weights)
+
+    def is_feasible(self, elements: List[int]) -> bool:
+        """
+        Whether the process may still remove all the given nodes, as mask indices, if their current total strength is at most the remaining strength.
+        The strength of a node decreases when its neighbours are removed, so this may reject feasible sets of adjacent nodes.
+        """
+        if self.finished:
+            return len(elements) == 0
+        if any(i >= self.cg.n or self.mask[i] for i in elements):
+            return False
+        return (
+            sum(self.node_strength[i] for i in elements) <= self.strength + 1e-15
+        )
+
+
+class _ProbabilityProcess:
+    """
+    Removal process of `probability_fragment` on a compact graph, deciding the removal of one node or edge at a time in a random order.
+    The final removal mask has the same distribution as the one of `probability_fragment`, and a partial run can be continued with new random decisions for the undecided elements.
+    """
+
+    def __init__(
+        self, cg: CompactGraph, p: float, fragmentation_type: str, rng=random
+    ):
+        self.cg = cg
+        self.p = p
+        self.rng = rng
+        if fragmentation_type == "nodes":
+            self.undecided = list(range(cg.n))
+        elif fragmentation_type == "edges":
+            self.undecided = list(range(cg.n, cg.n + cg.m))
+        else:
+            self.undecided = []
+        self.position = {element: i for i, element in enumerate(self.undecided)}
+        self.mask = cg.create_mask()
+        self.finished = len(self.undecided) == 0
+
+    def step(self) -> Tuple[int, bool] | None:
+        """
+        Decide whether a random undecided element is removed.
+
+        Returns
+        -------
+        Tuple[int, bool] | None
+            The mask index of the element and whether it is removed, None if the process is finished
+        """
+        if self.finished:
+            return None
+        element = self.undecided[self.rng.randrange(len(self.undecided))]
+        action = (element, self.rng.random() < self.p)
+        self.apply(action)
+        return action
+
+    def apply(self, action: Tuple[int, bool]) -> None:
+        """
+        Apply a decision drawn by `step`.
+        """
+        element, removed = action
+        # Swap the element with the last undecided one to remove it in constant time
+        i = self.position.pop(element)
+        last = self.undecided.pop()
+        if last != element:
+            self.undecided[i] = last
+            self.position[last] = i
+        if removed:
+            self.mask[element] = 1
+        self.finished = len(self.undecided) == 0
+
+    def is_feasible(self, elements: List[int]) -> bool:
+        """
+        Whether the process may still remove all the given elements, as mask indices: they must all be undecided.
+        """
+        return all(i in self.position for i in elements)
+
+
+class _CompactFragment:
+    """
+    Fragmentation method sampling the removal masks of a `Fragmenter` into a preallocated buffer instead of copying the graph.
+    It is used in place of a fragmentation method together with `_CompactIsFragmented`.
+    The settings given to the call update the `settings` of the fragmenter, and the returned mask is overwritten by the next call.
+    """
+
+    def __init__(self, fragmenter, cg: CompactGraph):
+        self.fragmenter = fragmenter
+        self.cg = cg
+        self.mask = cg.create_mask()
+
+    def __call__(self, G: nx.Graph, settings: Dict | None) -> bytearray:
+        if settings:
+            self.fragmenter.settings.update(settings)
+        profiler = profiling._profiler
+        if profiler is None:
+            self.fragmenter.sample(random, self.mask)
+            return self.mask
+        start = time.perf_counter()
+        self.fragmenter.sample(random, self.mask)
+        profiler.add("sample", start)
+        return self.mask
+
+
+class _CompactIsFragmented:
+    """
+    Fragmentation test of the removal masks sampled by `_CompactFragment`.
+    """
+
+    def __init__(self, cg: CompactGraph):
+        self.cg = cg
+
+    def __call__(self, mask: bytearray) -> bool:
+        return self.cg.is_fragmented(mask)
+
+
+class _GraphIsFragmented:
+    """
+    Custom fragmentation test applied to a read-only view of the fragmented graph described by a removal mask, or to a copy of it if the test `requires_copy`.
+    """
+
+    def __init__(self, G: nx.Graph, is_fragmented):
+        self.view = MaskedGraph(G)
+        self.is_fragmented = is_fragmented
+        self.requires_copy = getattr(is_fragmented, "requires_copy", False)
+
+    def __call__(self, mask: bytearray) -> bool:
+        G_ = self.view(mask)
+        if self.requires_copy:
+            G_ = G_.copy()
+        return self.is_fragmented(G_)
+
+
+class _CompactHasHole:
+    """
+    Hole fragmentation test of the removal masks sampled by `_CompactFragment`, see `HoleCriterion`.
+    """
+
+    def __init__(self, cg: CompactGraph, size: int):
+        self.cg = cg
+        self.size = size
+
+    def __call__(self, mask: bytearray) -> bool:
+        return self.cg.has_hole(mask, self.size)
+
+
+def _get_mask_test(G: nx.Graph, cg: CompactGraph, is_fragmented):
+    """
+    Return the test of removal masks equivalent to a fragmentation test of the fragmented graphs.
+    The default test and `HoleCriterion` run on the compact graph, other tests receive views of the fragmented graphs.
+    """
+    from .analyse import _is_fragmented
+    from .hole import HoleCriterion
+
+    if is_fragmented is _is_fragmented:
+        if cg.bridges is None:
+            cg.compute_cuts()
+        return _CompactIsFragmented(cg)
+    if isinstance(is_fragmented, HoleCriterion):
+        return _CompactHasHole(cg, is_fragmented.size)
+    return _GraphIsFragmented(G, is_fragmented)
+
+
+def _get_compact_methods(G: nx.Graph, fragment):
+    """
+    Return the compact fragmentation method and test replacing a `Fragmenter` or a built-in fragmentation method, or None if `fragment` is another method or the graph lacks the `strength` attributes a built-in method needs.
+
+    Returns
+    -------
+    Tuple[_CompactFragment, _CompactIsFragmented] | None
+        The fragmentation method and the fragmentation test to use
+    """
+    from .fragmenter import Fragmenter, _get_builtin_fragmenter
+
+    if isinstance(fragment, Fragmenter):
+        fragmenter = fragment
+    else:
+        fragmenter = _get_builtin_fragmenter(fragment)
+        if fragmenter is None or not fragmenter.is_supported(G):
+            return None
+    fragmenter.prepare(G)
+    cg = getattr(fragmenter, "graph", None)
+    if not isinstance(cg, CompactGraph):
+        cg = CompactGraph(G)
+    if cg.bridges is None:
+        cg.compute_cuts()
+    return _CompactFragment(fragmenter, cg), _CompactIsFragmented(cg)
@@ -0,0 +1,198 @@
+import random
+import time
+from inspect import signature
+from multiprocessing import Pool
+from typing import Callable, Dict, List
+import networkx as nx
+from .analyse import _is_fragmented, _seed_random
+from .compact import CompactGraph, _get_compact_methods, _get_mask_test
+from .fragment import probability_fragment
+from .fragmenter import Fragmenter, ProbabilityFragmenter
+from .result import CurveResult
+
+
+def _get_uniform_counts(
+    cg: CompactGraph,
+    fragmentations: List[float],
+    iterations: int,
+    fragmentation_type: str,
+    is_fragmented: Callable[[bytearray], bool],
+) -> List[int]:
+    """
+    Count the fragmented graphs of `probability_fragment` at every removal probability, drawing one uniform number per node or edge in each simulation: an element is removed at the probability p if its number is less than p.
+    `is_fragmented` tests the removal masks.
+    """
+    counts = [0] * len(fragmentations)
+    if fragmentation_type == "nodes":
+        offset, size = 0, cg.n
+    elif fragmentation_type == "edges":
+        offset, size = cg.n, cg.m
+    else:
+        offset, size = 0, 0
+    for _ in range(iterations):
+        # The same draws as `probability_fragment`
+        uniforms = [random.random() for _ in range(size)]
+        for k, p in enumerate(fragmentations):
+            mask = cg.create_mask()
+            mask[offset : offset + size] = bytearray([u < p for u in uniforms])
+            if is_fragmented(mask):
+                counts[k] += 1
+    return counts
+
+
+def _get_replayed_counts(
+    G: nx.Graph,
+    fragmentations: List[float],
+    iterations: int,
+    fragment: Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict,
+    is_fragmented: Callable[[nx.Graph], bool],
+) -> List[int]:
+    """
+    Count the fragmented graphs of any fragmentation method at every value of the `fragmentation` setting, replaying the same state of the `random` module for every value in each simulation.
+    """
+    counts = [0] * len(fragmentations)
+    compact_methods = _get_compact_methods(G, fragment)
+    if compact_methods is not None:
+        # Sample removal masks, a custom test receives views of the fragmented graphs
+        fragment = compact_methods[0]
+        is_fragmented = _get_mask_test(G, fragment.cg, is_fragmented)
+    for _ in range(iterations):
+        state = random.getstate()
+        for k, value in enumerate(fragmentations):
+            random.setstate(state)
+            settings = dict(fragment_settings, fragmentation=value)
+            if is_fragmented(fragment(G, settings)):
+                counts[k] += 1
+    return counts
+
+
+def _get_fragmentation_curve_worker(
+    G, fragmentations, iterations, fragment, fragment_settings, is_fragmented, seed
+):
+    """
+    This function is called by a multiprocessing.Pool to count the fragmented graphs of a share of the simulations
+
+    Returns
+    -------
+    List[int]
+        The number of fragmented graphs at every value of the fragmentation setting
+    """
+    if seed is not None:
+        random.seed(seed)
+    if isinstance(fragment, ProbabilityFragmenter):
+        fragment_settings = dict(fragment.settings, **fragment_settings)
+        fragment = probability_fragment
+    if fragment is probability_fragment:
+        cg = CompactGraph(G)
+        is_fragmented = _get_mask_test(G, cg, is_fragmented)
+        return _get_uniform_counts(
+            cg,
+            fragmentations,
+            iterations,
+            fragment_settings["fragmentation_type"],
+            is_fragmented,
+        )
+    return _get_replayed_counts(
+        G, fragmentations, iterations, fragment, fragment_settings, is_fragmented
+    )
+
+
+def get_fragmentation_probability_curve(
+    G: nx.Graph,
+    fragmentations: List[float],
+    iterations: int,
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict | None = None,
+    is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    process_number: int = 1,
+) -> CurveResult:
+    """
+    Estimate the fragmentation probability of a graph for several values of the `fragmentation` setting, with common random numbers: every simulation is evaluated at all the values on the same random draws.
+
+    The estimates at different values are strongly correlated, so the curve is much smoother and the differences between its points have a much smaller variance than with independent estimations.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    fragmentations : List[float]
+        The values of the `fragmentation` setting, removal probabilities or strengths to remove
+    iterations : int
+        The number of simulations
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method, taking the graph and its settings, or a `Fragmenter`.\n
+        For `probability_fragment` and `ProbabilityFragmenter`, every simulation draws one uniform number per node or edge and an element is removed at the probability p if its number is less than p, so the removed elements grow with p and the curve increases with p for edge removal.\n
+        Other methods are called once per value, with the state of the `random` module restored to the same point, so they use the same random numbers
+    fragment_settings : Dict | None, optional
+        The other settings of the fragmentation method, such as the `fragmentation_type` of `probability_fragment`
+    is_fragmented : Callable[[nx.Graph], bool], optional
+        The function checking whether a fragmented graph is fragmented, for instance a criterion based on `get_hole_size`.
+        For the built-in methods and the fragmenters, it receives a read-only view of the fragmented graph, see `capsidgraph.analyser.view`
+    process_number : int, optional
+        Number of processes to spawn to perform the computation
+
+    Returns
+    -------
+    CurveResult
+        The result, unpacked as the estimated fragmentation probability at every value of `fragmentations` and the number of simulations. It also holds the number of fragmented graphs at every value and can be merged with the curves of other runs, see `capsidgraph.analyser.result`
+    """
+    start = time.time()
+    fragment_settings = fragment_settings or {}
+    fragmentations = list(fragmentations)
+    if (
+        not isinstance(fragment, Fragmenter)
+        and len(signature(fragment).parameters) != 2
+    ):
+        raise ValueError(
+            "the fragmentation method must take the graph and its settings"
+        )
+    seeds = []
+    if process_number > 1:
+        with Pool(process_number) as pool:
+            results = []
+            for i in range(process_number):
+                # Each worker gets its own seed drawn from the state of the parent
+                share = iterations // process_number + (
+                    1 if i < iterations % process_number else 0
+                )
+                seed = random.getrandbits(64)
+                seeds.append(seed)
+                results.append(
+                    pool.apply_async(
+                        _get_fragmentation_curve_worker,
+                        (
+                            G,
+                            fragmentations,
+                            share,
+                            fragment,
+                            fragment_settings,
+                            is_fragmented,
+                            seed,
+                        ),
+                    )
+                )
+            pool.close()
+            pool.join()
+            counts = [0] * len(fragmentations)
+            for result in results:
+                counts = [a + b for a, b in zip(counts, result.get())]
+    else:
+        seeds.append(_seed_random())
+        counts = _get_fragmentation_curve_worker(
+            G,
+            fragmentations,
+            iterations,
+            fragment,
+            fragment_settings,
+            is_fragmented,
+            None,
+        )
+    return CurveResult(
+        fragmentations,
+        counts,
+        iterations,
+        seeds,
+        dict(fragment_settings),
+        time.time() - start,
+    )
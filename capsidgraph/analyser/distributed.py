@@ -0,0 +1,425 @@
+import hashlib
+import pickle
+import random
+import secrets
+import threading
+import time
+import traceback
+from collections import deque
+from inspect import signature
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Callable, Dict, List, Tuple
+import networkx as nx
+from .analyse import _get_default_methods, _is_fragmented
+from .fragmenter import Fragmenter
+from .result import ProbabilityResult
+
+
+def get_graph_fingerprint(G: nx.Graph) -> str:
+    """
+    Compute a fingerprint of a graph, identifying it in the work units sent to the workers.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph
+
+    Returns
+    -------
+    str
+        The SHA-256 digest of the nodes and edges of the graph with their attributes, in their order, as the compact graph numbers them in this order
+    """
+    h = hashlib.sha256()
+    h.update(repr(list(G.nodes(data=True))).encode())
+    h.update(repr(list(G.edges(data=True))).encode())
+    return h.hexdigest()
+
+
+def _run_unit(
+    G: nx.Graph,
+    fragment: Callable,
+    fragment_settings: Dict | None,
+    is_fragmented: Callable,
+    seed: int,
+    start: int,
+    stop: int,
+) -> int:
+    """
+    Run the simulations `start` to `stop` of an estimation, seeding the `random` module from the seed of the estimation and `start`.
+
+    Returns
+    -------
+    int
+        The number of fragmented graphs
+    """
+    random.seed(seed + start)
+    with_settings = len(signature(fragment).parameters) == 2
+    count = 0
+    for _ in range(start, stop):
+        if with_settings:
+            G_ = fragment(G, fragment_settings)
+        else:
+            G_ = fragment(G)
+        if is_fragmented(G_):
+            count += 1
+    return count
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes) -> int:
+    """
+    Connect to a `Coordinator` and run its work units until it is closed.
+
+    The graphs and fragmentation methods of the estimations are fetched from the coordinator the first time a unit needs them and kept for the next units.
+    If a unit raises an exception, its traceback is sent to the coordinator, which raises it in the estimation, and the worker goes on with the next units.
+
+    Parameters
+    ----------
+    address : Tuple[str, int]
+        The address of the coordinator
+    authkey : bytes
+        The authentication key of the coordinator, see `Coordinator.authkey`
+
+    Returns
+    -------
+    int
+        The number of units run
+    """
+    graphs = {}
+    methods = {}
+    units = 0
+    with Client(address, authkey=authkey) as conn:
+        try:
+            while True:
+                conn.send(("unit",))
+                unit = conn.recv()
+                if unit is None:
+                    break
+                unit_id, job_id, fingerprint, settings, seed, start, stop = unit
+                try:
+                    if fingerprint not in graphs:
+                        conn.send(("graph", fingerprint))
+                        graphs[fingerprint] = pickle.loads(conn.recv_bytes())
+                    G = graphs[fingerprint]
+                    if job_id not in methods:
+                        conn.send(("job", job_id))
+                        data = conn.recv_bytes()
+                        if len(data) == 0:
+                            # The estimation is over, for instance after an error
+                            continue
+                        fragment, is_fragmented = pickle.loads(data)
+                        methods[job_id] = _get_default_methods(
+                            G, fragment, is_fragmented
+                        )
+                    fragment, is_fragmented = methods[job_id]
+                    count = _run_unit(
+                        G, fragment, settings, is_fragmented, seed, start, stop
+                    )
+                except (EOFError, OSError):
+                    raise
+                except Exception:
+                    conn.send(("error", unit_id, traceback.format_exc()))
+                else:
+                    conn.send(("result", unit_id, count))
+                conn.recv()
+                units += 1
+        except (EOFError, OSError):
+            # The coordinator has been closed
+            pass
+    return units
+
+
+class Coordinator:
+    """
+    Coordinator of estimations distributed over worker processes, possibly on other machines, which connect to it with `run_worker`.
+
+    An estimation is split into work units, each made of the fingerprint of the graph, the settings of the fragmentation and a range of simulations with its seed. The workers take the units from the queue of the coordinator and send back their number of fragmented graphs, which the coordinator merges. The seeds are drawn from the `random` module of the coordinator and every unit seeds its own simulations, so the results do not depend on the number of workers nor on which worker runs which unit.
+
+    The connections are authenticated with `authkey` and the messages are pickled, so the key must be kept secret and the coordinator must only be reachable by trusted workers.
+    An exception raised by a unit on a worker is raised by the estimation on the coordinator, with the traceback of the worker.
+
+    Parameters
+    ----------
+    address : Tuple[str, int], optional
+        The address to listen on, by default a free port of localhost. The actual address is given by the `address` attribute
+    authkey : bytes | None, optional
+        The authentication key shared with the workers, by default a random hexadecimal key given by the `authkey` attribute
+    unit_size : int, optional
+        The number of simulations of a work unit
+    unit_timeout : float | None, optional
+        The time in seconds after which a unit taken by a worker without result is given to another worker, for instance if the first one has been stopped. If None, units are never given twice
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("localhost", 0),
+        authkey: bytes | None = None,
+        unit_size: int = 1000,
+        unit_timeout: float | None = None,
+    ):
+        if authkey is None:
+            # Hexadecimal, so that it can be given to the command line workers
+            authkey = secrets.token_hex(32).encode()
+        self.authkey = authkey
+        self.unit_size = unit_size
+        self.unit_timeout = unit_timeout
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self._condition = threading.Condition()
+        self._closed = False
+        self._graphs = {}
+        self._jobs = {}
+        self._units = {}
+        self._queue = deque()
+        self._taken = {}
+        self._results = {}
+        self._errors = {}
+        self._next_id = 0
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (OSError, AuthenticationError):
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _requeue(self):
+        """
+        Put back in the queue the units taken for longer than `unit_timeout`.
+        """
+        if self.unit_timeout is None:
+            return
+        now = time.monotonic()
+        for unit_id, taken in list(self._taken.items()):
+            if now - taken > self.unit_timeout:
+                del self._taken[unit_id]
+                self._queue.append(unit_id)
+
+    def _get_unit(self):
+        """
+        Wait for a unit to run, None once the coordinator is closed.
+        """
+        with self._condition:
+            while not self._closed:
+                self._requeue()
+                while len(self._queue) > 0:
+                    unit_id = self._queue.popleft()
+                    # Units whose result arrived in the meantime are skipped
+                    if unit_id in self._units and unit_id not in self._results:
+                        self._taken[unit_id] = time.monotonic()
+                        return (unit_id,) + self._units[unit_id]
+                self._condition.wait(self.unit_timeout)
+            return None
+
+    def _set_result(
+        self, unit_id: int, count: int | None, error: str | None = None
+    ):
+        """
+        Record the result of a unit, or the traceback of its failure.
+        """
+        with self._condition:
+            # The first result of a unit given twice is kept
+            if unit_id in self._units and unit_id not in self._results:
+                self._results[unit_id] = count
+                if error is not None:
+                    self._errors[unit_id] = error
+                self._taken.pop(unit_id, None)
+                self._condition.notify_all()
+
+    def _serve(self, conn: Connection):
+        unit = None
+        with conn:
+            try:
+                while True:
+                    message = conn.recv()
+                    if message[0] == "unit":
+                        unit = self._get_unit()
+                        conn.send(unit)
+                    elif message[0] == "graph":
+                        with self._condition:
+                            data = self._graphs[message[1]]
+                        conn.send_bytes(data)
+                    elif message[0] == "job":
+                        # The job is removed once its estimation is over
+                        with self._condition:
+                            data = self._jobs.get(message[1], b"")
+                        conn.send_bytes(data)
+                    elif message[0] == "result":
+                        _, unit_id, count = message
+                        self._set_result(unit_id, count)
+                        conn.send(None)
+                    elif message[0] == "error":
+                        _, unit_id, error = message
+                        self._set_result(unit_id, None, error)
+                        conn.send(None)
+            except (EOFError, OSError):
+                pass
+            except Exception:
+                # The unit being served fails, the worker is disconnected
+                if unit is not None:
+                    self._set_result(unit[0], None, traceback.format_exc())
+
+    def get_fragmentation_probabilities(
+        self,
+        G: nx.Graph,
+        iterations: int,
+        fragment: Fragmenter
+        | Callable[[nx.Graph, Dict], nx.Graph]
+        | Callable[[nx.Graph], nx.Graph],
+        fragment_settings: List[Dict | None],
+        is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    ) -> List[ProbabilityResult]:
+        """
+        Estimate the fragmentation probability of a graph for several settings of the fragmentation method, with the connected workers. The units of all the settings are queued at once.
+
+        Parameters
+        ----------
+        G : nx.Graph
+            The graph to fragment
+        iterations : int
+            The number of simulations for each settings
+        fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph]
+            The fragmentation method to use, see `get_fragmentation_probability`. It must be picklable
+        fragment_settings : List[Dict | None]
+            The settings of each estimation
+        is_fragmented : Callable[[nx.Graph], bool], optional
+            The function checking whether a fragmented graph is fragmented, see `get_fragmentation_probability`. It must be picklable
+
+        Returns
+        -------
+        List[ProbabilityResult]
+            The result of each settings, unpacked as the estimated fragmentation probability and the number of simulations. Its seed is the seed of the estimation, from which every unit derives the seed of its simulations
+
+        Raises
+        ------
+        ValueError
+            If the fragmentation methods can not be pickled, or if the coordinator is closed
+        RuntimeError
+            If a unit raised an exception on a worker
+        """
+        start = time.time()
+        fingerprint = get_graph_fingerprint(G)
+        # Pickled once for all the workers
+        try:
+            job = pickle.dumps((fragment, is_fragmented))
+        except Exception as e:
+            raise ValueError("fragment and is_fragmented must be picklable") from e
+        with self._condition:
+            if self._closed:
+                raise ValueError("the coordinator is closed")
+            if fingerprint not in self._graphs:
+                self._graphs[fingerprint] = pickle.dumps(G)
+            job_id = self._next_id
+            self._next_id += 1
+            self._jobs[job_id] = job
+            job_units = []
+            seeds = []
+            for settings in fragment_settings:
+                seed = random.getrandbits(64)
+                seeds.append(seed)
+                units = []
+                for first in range(0, iterations, self.unit_size):
+                    last = min(first + self.unit_size, iterations)
+                    unit_id = self._next_id
+                    self._next_id += 1
+                    self._units[unit_id] = (
+                        job_id,
+                        fingerprint,
+                        settings,
+                        seed,
+                        first,
+                        last,
+                    )
+                    self._queue.append(unit_id)
+                    units.append(unit_id)
+                job_units.append(units)
+            self._condition.notify_all()
+            try:
+                while True:
+                    errors = [
+                        self._errors[u]
+                        for units in job_units
+                        for u in units
+                        if u in self._errors
+                    ]
+                    if len(errors) > 0:
+                        raise RuntimeError(
+                            "a work unit failed on a worker:\n" + errors[0]
+                        )
+                    if all(u in self._results for us in job_units for u in us):
+                        break
+                    if self._closed:
+                        raise ValueError("the coordinator has been closed")
+                    self._requeue()
+                    self._condition.wait(self.unit_timeout)
+                res = []
+                elapsed = time.time() - start
+                for units, seed, settings in zip(job_units, seeds, fragment_settings):
+                    count = sum(self._results[u] for u in units)
+                    settings = dict(settings) if settings is not None else None
+                    res.append(
+                        ProbabilityResult(count, iterations, [seed], settings, elapsed)
+                    )
+            finally:
+                for units in job_units:
+                    for u in units:
+                        del self._units[u]
+                        self._results.pop(u, None)
+                        self._errors.pop(u, None)
+                        self._taken.pop(u, None)
+                del self._jobs[job_id]
+        return res
+
+    def get_fragmentation_probability(
+        self,
+        G: nx.Graph,
+        iterations: int,
+        fragment: Fragmenter
+        | Callable[[nx.Graph, Dict], nx.Graph]
+        | Callable[[nx.Graph], nx.Graph],
+        fragment_settings: Dict | None = None,
+        is_fragmented: Callable[[nx.Graph], bool] = _is_fragmented,
+    ) -> ProbabilityResult:
+        """
+        Estimate the fragmentation probability of a graph with the connected workers, see `get_fragmentation_probabilities`.
+
+        Returns
+        -------
+        ProbabilityResult
+            The result, unpacked as the estimated fragmentation probability and the number of simulations
+        """
+        return self.get_fragmentation_probabilities(
+            G, iterations, fragment, [fragment_settings], is_fragmented
+        )[0]
+
+    def close(self):
+        """
+        Stop the coordinator, the workers return after their current unit.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        # Wake up the thread waiting for connections
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+        self._thread.join()
+        self._listener.close()
+
@@ -1,6 +1,8 @@
 import networkx as nx
 import random
+import time
 from typing import Dict, List
+from . import profiling
 
 
 def probability_fragment(G: nx.Graph, settings: Dict) -> nx.Graph:
@@ -23,19 +25,28 @@ def probability_fragment(G: nx.Graph, settings: Dict) -> nx.Graph:
     nx.Graph
         The fragmented graph
     """
+    profiler = profiling._profiler
+    if profiler is not None:
+        start = time.perf_counter()
     G_ = G.copy()
+    if profiler is not None:
+        start = profiler.add("copy", start)
     p = settings["fragmentation"]
     fragmentation_type = settings["fragmentation_type"]
     if fragmentation_type == "nodes":
         # Remove each nodes with probability p
-        for node in G.nodes:
-            if random.random() < p:
-                G_.remove_node(node)
+        removed_nodes = [node for node in G.nodes if random.random() < p]
+        if profiler is not None:
+            start = profiler.add("sample", start)
+        G_.remove_nodes_from(removed_nodes)
     elif fragmentation_type == "edges":
         # Remove each edge with probability p
-        for a, b in G.edges:
-            if random.random() < p:
-                G_.remove_edge(a, b)
+        removed_edges = [e for e in G.edges if random.random() < p]
+        if profiler is not None:
+            start = profiler.add("sample", start)
+        G_.remove_edges_from(removed_edges)
+    if profiler is not None:
+        profiler.add("remove", start)
     return G_
 
 
@@ -59,6 +70,12 @@ def strength_edges_fragment(G: nx.Graph, settings: dict) -> nx.Graph:
     nx.Graph
         The fragmented graph
     """
+    profiler = profiling._profiler
+    if profiler is not None:
+        start = time.perf_counter()
+    G_ = G.copy()
+    if profiler is not None:
+        start = profiler.add("copy", start)
     # Get the attributes of the edges of the graph
     bond_strength = nx.get_edge_attributes(G, "strength")
     edges = list(G.edges)
@@ -67,7 +84,6 @@ def strength_edges_fragment(G: nx.Graph, settings: dict) -> nx.Graph:
     for e in edges:
         weights.append(1 / bond_strength[e])
     min_bond_strength = 1 / max(weights)  # strength of the weakest bond
-    G_ = G.copy()
     remaining_nodes = list(G_.edges)
     removed_edges = []
     remainig_edges_weights = weights.copy()
@@ -95,9 +111,13 @@ def strength_edges_fragment(G: nx.Graph, settings: dict) -> nx.Graph:
         else:
             # All edges have been removed
             break
+    if profiler is not None:
+        start = profiler.add("sample", start)
     # Remove the edges from the graoh
     for a, b in removed_edges:
         G_.remove_edge(a, b)
+    if profiler is not None:
+        profiler.add("remove", start)
     return G_
 
 
@@ -155,10 +175,15 @@ def strength_nodes_fragment(G: nx.Graph, settings: Dict) -> nx.Graph:
     nx.Graph
         The fragmented graph
     """
+    profiler = profiling._profiler
+    if profiler is not None:
+        start = time.perf_counter()
+    G_ = G.copy()
+    if profiler is not None:
+        start = profiler.add("copy", start)
     weights = []
     for e in G.nodes:
         weights.append(1 / G.nodes[e]["strength"])
-    G_ = G.copy()
     remaining_nodes = list(G_.nodes)
     removed_nodes = []
     strength = settings["fragmentation"]
@@ -186,7 +211,11 @@ def strength_nodes_fragment(G: nx.Graph, settings: Dict) -> nx.Graph:
             # All edges have been removed
             break
 
+    if profiler is not None:
+        start = profiler.add("sample", start)
     for node in removed_nodes:
         G_.remove_node(node)
+    if profiler is not None:
+        profiler.add("remove", start)
 
     return G_
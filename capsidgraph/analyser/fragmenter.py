@@ -0,0 +1,364 @@
+import random
+from inspect import signature
+from typing import Callable, Dict, Protocol, runtime_checkable
+import networkx as nx
+import numpy as np
+from . import backend
+from .compact import (
+    CompactGraph,
+    _StrengthEdgesProcess,
+    _StrengthNodesProcess,
+)
+
+
+@runtime_checkable
+class Fragmenter(Protocol):
+    """
+    Fragmentation method writing removal masks instead of returning fragmented graphs.
+
+    `prepare` is called once per graph to compile the state needed by the simulations, then `sample` is called for every simulation.
+    A removal mask is a bytearray of length n+m following the numbering of `CompactGraph`: its entry i is 1 if the i-th node of `G.nodes` is removed and its entry n+j is 1 if the j-th edge of `G.edges` is removed.
+
+    Attributes
+    ----------
+    settings : Dict
+        The settings of the fragmentation, updated with the `fragment_settings` given to `get_fragmentation_probability` and with the "fragmentation" of each step of `bisection`
+    """
+
+    settings: Dict
+
+    def prepare(self, G: nx.Graph) -> None:
+        """
+        Compile the state of the fragmentation of a graph.
+
+        Parameters
+        ----------
+        G : nx.Graph
+            The graph to fragment
+        """
+        ...
+
+    def sample(self, rng: random.Random, out_mask: bytearray) -> None:
+        """
+        Draw a fragmentation of the prepared graph.
+
+        Parameters
+        ----------
+        rng : random.Random
+            The random number generator, a `random.Random` instance or the `random` module
+        out_mask : bytearray
+            The removal mask to overwrite
+        """
+        ...
+
+
+class _CompactFragmenter:
+    """
+    Base of the built-in fragmenters, which compile the graph into a `CompactGraph`.
+    """
+
+    def __init__(self, settings: Dict | None = None):
+        self.settings = dict(settings or {})
+        self.graph = None
+
+    def is_supported(self, G: nx.Graph) -> bool:
+        """
+        Whether the graph has the attributes needed by the fragmentation.
+        """
+        return True
+
+    def prepare(self, G: nx.Graph) -> None:
+        if not self.is_supported(G):
+            raise ValueError(
+                "%s needs the strength attributes of the graph, see init_nodes_strength"
+                % type(self).__name__
+            )
+        self.graph = CompactGraph(G)
+
+
+class ProbabilityFragmenter(_CompactFragmenter):
+    """
+    Fragmenter of `probability_fragment`, removing each node or edge with a given probability, with the same random draws.
+
+    Parameters
+    ----------
+    settings : Dict | None, optional
+        The `fragmentation` probability and the `fragmentation_type`, `"nodes"` or `"edges"`, see `probability_fragment`
+    """
+
+    def sample(self, rng: random.Random, out_mask: bytearray) -> None:
+        n = self.graph.n
+        m = self.graph.m
+        p = self.settings["fragmentation"]
+        fragmentation_type = self.settings["fragmentation_type"]
+        out_mask[:] = bytes(n + m)
+        if fragmentation_type == "nodes":
+            out_mask[:n] = bytearray([rng.random() < p for _ in range(n)])
+        elif fragmentation_type == "edges":
+            out_mask[n:] = bytearray([rng.random() < p for _ in range(m)])
+
+
+# Arguments of the sampling kernels for the unused random source
+_NO_UNIFORMS = np.empty(0)
+_NO_SEED = np.uint64(0)
+
+
+def _run_kernel(rng: random.Random, run: Callable, batch: int) -> int:
+    """
+    Run a kernel of `capsidgraph.analyser.kernels` on uniform numbers drawn from `rng`, with as many numbers as it needs, and leave `rng` as if only the numbers used had been drawn.
+    Without the exact random stream (see `set_backend`), the kernel draws its numbers from a generator seeded with a single number drawn from `rng` instead.
+
+    Parameters
+    ----------
+    rng : random.Random
+        The random number generator, a `random.Random` instance or the `random` module
+    run : Callable
+        Function running the kernel on an array of uniform numbers and a seed, returning the number of numbers used or -1 if more are needed
+    batch : int
+        The number of uniform numbers drawn first
+
+    Returns
+    -------
+    int
+        The number of uniform numbers used
+    """
+    if not backend._exact_stream:
+        return run(_NO_UNIFORMS, np.uint64(rng.getrandbits(64)))
+    # The number of uniform numbers needed is only known once they are consumed, so the generator is rewound to draw exactly the ones used
+    state = rng.getstate()
+    uniforms = np.array([rng.random() for _ in range(batch)])
+    used = run(uniforms, _NO_SEED)
+    while used < 0:
+        more = np.array([rng.random() for _ in range(len(uniforms))])
+        uniforms = np.concatenate([uniforms, more])
+        used = run(uniforms, _NO_SEED)
+    rng.setstate(state)
+    for _ in range(used):
+        rng.random()
+    return used
+
+
+class StrengthEdgesFragmenter(_CompactFragmenter):
+    """
+    Fragmenter of `strength_edges_fragment`, removing random edges until a given strength has been removed, with the same random draws.
+
+    Parameters
+    ----------
+    settings : Dict | None, optional
+        The `fragmentation` strength to remove, see `strength_edges_fragment`
+    """
+
+    def is_supported(self, G: nx.Graph) -> bool:
+        strength = nx.get_edge_attributes(G, "strength")
+        return len(G.edges) > 0 and len(strength) == len(G.edges)
+
+    def prepare(self, G: nx.Graph) -> None:
+        super().prepare(G)
+        self._edge_strength = np.array(self.graph.edge_strength, dtype=float)
+        self._edge_weights = 1 / self._edge_strength
+        # Number of uniform numbers first drawn for the compiled kernels
+        self._batch = 16
+        # Work arrays of the compiled kernels
+        size = self._get_kernel_size()
+        self._remaining = np.empty(size, np.bool_)
+        self._order = np.empty(size, np.int64)
+        self._cumulative = np.empty(size, np.float64)
+
+    def _get_kernel_size(self) -> int:
+        """
+        The number of elements drawn by the compiled kernel.
+        """
+        return self.graph.m
+
+    def sample(self, rng: random.Random, out_mask: bytearray) -> None:
+        kernels = backend._get_kernels()
+        if kernels is not None:
+            self._sample_kernel(kernels, rng, out_mask)
+            return
+        process = self._create_process(rng)
+        while process.step() is not None:
+            pass
+        out_mask[:] = process.mask
+
+    def _create_process(self, rng: random.Random):
+        return _StrengthEdgesProcess(self.graph, self.settings["fragmentation"], rng)
+
+    def _sample_kernel(self, kernels, rng: random.Random, out_mask: bytearray):
+        cg = self.graph
+        mask = np.frombuffer(out_mask, dtype=np.uint8)
+        strength = self.settings["fragmentation"]
+
+        def run(uniforms, seed):
+            mask[:] = 0
+            return kernels.sample_strength_edges(
+                self._edge_strength,
+                self._edge_weights,
+                strength,
+                cg.n,
+                mask,
+                uniforms,
+                seed,
+                self._remaining,
+                self._order,
+                self._cumulative,
+            )
+
+        used = _run_kernel(rng, run, self._batch)
+        self._batch = max(self._batch, used + 8)
+
+
+class StrengthNodesFragmenter(StrengthEdgesFragmenter):
+    """
+    Fragmenter of `strength_nodes_fragment`, removing random nodes until a given strength has been removed, with the same random draws.
+
+    Parameters
+    ----------
+    settings : Dict | None, optional
+        The `fragmentation` strength to remove, see `strength_nodes_fragment`
+    """
+
+    def is_supported(self, G: nx.Graph) -> bool:
+        strength = nx.get_node_attributes(G, "strength")
+        return super().is_supported(G) and len(strength) == len(G.nodes)
+
+    def prepare(self, G: nx.Graph) -> None:
+        super().prepare(G)
+        self._node_strength = np.array(self.graph.node_strength, dtype=float)
+        n = self.graph.n
+        self._current_strength = np.empty(n, np.float64)
+        self._node_weights = np.empty(n, np.float64)
+        self._removed_neighbours = np.empty(n, np.int64)
+
+    def _get_kernel_size(self) -> int:
+        return self.graph.n
+
+    def _create_process(self, rng: random.Random):
+        return _StrengthNodesProcess(self.graph, self.settings["fragmentation"], rng)
+
+    def _sample_kernel(self, kernels, rng: random.Random, out_mask: bytearray):
+        cg = self.graph
+        mask = np.frombuffer(out_mask, dtype=np.uint8)
+        strength = self.settings["fragmentation"]
+
+        def run(uniforms, seed):
+            mask[:] = 0
+            return kernels.sample_strength_nodes(
+                cg.indptr,
+                cg.indices,
+                cg.edge_ids,
+                self._edge_strength,
+                self._node_strength,
+                strength,
+                mask,
+                uniforms,
+                seed,
+                self._current_strength,
+                self._node_weights,
+                self._remaining,
+                self._order,
+                self._cumulative,
+                self._removed_neighbours,
+            )
+
+        used = _run_kernel(rng, run, self._batch)
+        self._batch = max(self._batch, used + 8)
+
+
+class LegacyFragmenter(_CompactFragmenter):
+    """
+    Adapter of a fragmentation method returning the fragmented graph to the `Fragmenter` protocol.
+    The removed nodes and edges are the ones missing from the fragmented graph, other changes of the graph are lost.
+
+    Parameters
+    ----------
+    fragment : Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph]
+        The fragmentation method, it may not take the settings parameter
+    settings : Dict | None, optional
+        The settings to pass to the fragmentation method
+
+    Notes
+    -----
+    The fragmentation method draws its own random numbers, usually from the `random` module, so the generator given to `sample` is not used.
+    """
+
+    def __init__(
+        self,
+        fragment: Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph],
+        settings: Dict | None = None,
+    ):
+        super().__init__(settings)
+        self.fragment = fragment
+        self.with_settings = len(signature(fragment).parameters) == 2
+        self.G = None
+
+    def prepare(self, G: nx.Graph) -> None:
+        super().prepare(G)
+        self.G = G
+
+    def sample(self, rng: random.Random, out_mask: bytearray) -> None:
+        if self.with_settings:
+            G_ = self.fragment(self.G, self.settings)
+        else:
+            G_ = self.fragment(self.G)
+        cg = self.graph
+        n = cg.n
+        for i, v in enumerate(cg.nodes):
+            out_mask[i] = v not in G_
+        for j, (a, b) in enumerate(cg.edges.tolist()):
+            # The edges of removed nodes are implicitly removed
+            out_mask[n + j] = (
+                not out_mask[a]
+                and not out_mask[b]
+                and not G_.has_edge(cg.nodes[a], cg.nodes[b])
+            )
+
+
+def _get_builtin_fragmenter(fragment) -> _CompactFragmenter | None:
+    """
+    Return the fragmenter of a built-in fragmentation method, None for other methods.
+    """
+    from .fragment import (
+        probability_fragment,
+        strength_edges_fragment,
+        strength_nodes_fragment,
+    )
+
+    if fragment is probability_fragment:
+        return ProbabilityFragmenter()
+    elif fragment is strength_edges_fragment:
+        return StrengthEdgesFragmenter()
+    elif fragment is strength_nodes_fragment:
+        return StrengthNodesFragmenter()
+    return None
+
+
+def get_fragmenter(
+    fragment: Fragmenter
+    | Callable[[nx.Graph, Dict], nx.Graph]
+    | Callable[[nx.Graph], nx.Graph],
+    settings: Dict | None = None,
+) -> Fragmenter:
+    """
+    Convert a fragmentation method to a `Fragmenter`.
+
+    Parameters
+    ----------
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph] | Callable[[nx.Graph], nx.Graph]
+        The fragmentation method. The built-in methods are converted to their fragmenters, other functions are wrapped in a `LegacyFragmenter`
+    settings : Dict | None, optional
+        The settings of the fragmentation, added to the settings of a `Fragmenter`
+
+    Returns
+    -------
+    Fragmenter
+        The fragmenter, not prepared yet
+    """
+    if isinstance(fragment, Fragmenter):
+        fragmenter = fragment
+    else:
+        fragmenter = _get_builtin_fragmenter(fragment)
+        if fragmenter is None:
+            fragmenter = LegacyFragmenter(fragment)
+    if settings:
+        fragmenter.settings.update(settings)
+    return fragmenter
@@ -0,0 +1,147 @@
+from typing import Callable, Dict, List, Tuple
+import networkx as nx
+from .analyse import bisection, get_hole_size
+from .curve import get_fragmentation_probability_curve
+from .fragmenter import Fragmenter
+from .progress import ProgressHook
+from .result import CurveResult
+
+
+class HoleCriterion:
+    """
+    Fragmentation test considering a graph as fragmented if it has a hole of at least a given size, see `get_hole_size`.
+
+    With the built-in fragmentation methods and the fragmenters, the test is checked on the removal masks by `CompactGraph.has_hole`, which stops as soon as a component of the fragmented graph too large to leave such a hole, or a large enough hole, is found.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The original graph
+    size : int | None, optional
+        The minimum size of the hole, by default half the number of nodes (rounded down)
+    """
+
+    def __init__(self, G: nx.Graph, size: int | None = None):
+        self.G = G
+        self.size = len(G.nodes) // 2 if size is None else size
+
+    def __call__(self, G_: nx.Graph) -> bool:
+        return get_hole_size(G_, self.G) >= self.size
+
+
+def get_hole_fragmentation_threshold(
+    G: nx.Graph,
+    steps: int,
+    error_probability: float,
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict | None = None,
+    hole_size: int | None = None,
+    min_iterations: int = 1000,
+    max_iterations: int = 1000000,
+    debug: bool = False,
+    debug_interval: int = 100000,
+    process_number: int = 1,
+    progress: ProgressHook | List[ProgressHook] | None = None,
+    progress_interval: float = 1,
+    profile: bool = False,
+) -> Tuple[float, int] | Tuple[float, int, Dict]:
+    """
+    Compute the hole fragmentation threshold of a graph, ie the "fragmentation" parameter of the fragmentation method for which the graph has a hole of at least `hole_size` nodes with probability 1/2.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    steps : int
+        The number of bisection steps to perform
+    error_probability : float
+        The probability of making an error during the entire bisection process
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method to use, see `bisection`
+    fragment_settings : Dict | None, optional
+        The settings to pass to the fragmentation method, except for the "fragmentation"
+    hole_size : int | None, optional
+        The minimum size of the hole of a fragmented graph, by default half the number of nodes (rounded down)
+    min_iterations : int, optional
+        The minimum number of iterations to perform for each step
+    max_iterations : int, optional
+        The maximum number of iterations to perform for each step
+    debug : bool, optional
+        If True, print debug information
+    debug_interval : int, optional
+        The number of iterations between two debug prints
+    process_number : int, optional
+        Number of process to use for the simulations
+    progress : ProgressHook | List[ProgressHook] | None, optional
+        A function, or a list of functions, called with progress events, see `bisection`
+    progress_interval : float, optional
+        The time in seconds between two "progress" events
+    profile : bool, optional
+        Whether to measure the time spent in each phase of the simulations, see `get_fragmentation_probability`
+
+    Returns
+    -------
+    Tuple[float, int] | Tuple[float, int, Dict]
+        The estimated threshold and the number of steps reached, followed by the profile report if `profile` is True
+    """
+    return bisection(
+        G,
+        steps,
+        error_probability,
+        fragment,
+        fragment_settings=fragment_settings,
+        is_fragmented=HoleCriterion(G, hole_size),
+        min_iterations=min_iterations,
+        max_iterations=max_iterations,
+        debug=debug,
+        debug_interval=debug_interval,
+        process_number=process_number,
+        progress=progress,
+        progress_interval=progress_interval,
+        profile=profile,
+    )
+
+
+def get_hole_fragmentation_curve(
+    G: nx.Graph,
+    fragmentations: List[float],
+    iterations: int,
+    fragment: Fragmenter | Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict | None = None,
+    hole_size: int | None = None,
+    process_number: int = 1,
+) -> CurveResult:
+    """
+    Estimate the probability that the graph has a hole of at least `hole_size` nodes for several values of the `fragmentation` setting, with common random numbers, see `get_fragmentation_probability_curve`.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    fragmentations : List[float]
+        The values of the `fragmentation` setting
+    iterations : int
+        The number of simulations
+    fragment : Fragmenter | Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method, taking the graph and its settings, or a `Fragmenter`
+    fragment_settings : Dict | None, optional
+        The other settings of the fragmentation method
+    hole_size : int | None, optional
+        The minimum size of the hole of a fragmented graph, by default half the number of nodes (rounded down)
+    process_number : int, optional
+        Number of processes to spawn to perform the computation
+
+    Returns
+    -------
+    CurveResult
+        The estimated probability at every value of `fragmentations` and the number of simulations, see `get_fragmentation_probability_curve`
+    """
+    return get_fragmentation_probability_curve(
+        G,
+        fragmentations,
+        iterations,
+        fragment,
+        fragment_settings=fragment_settings,
+        is_fragmented=HoleCriterion(G, hole_size),
+        process_number=process_number,
+    )
@@ -0,0 +1,185 @@
+import random
+from math import exp, log, sqrt
+from typing import Collection, Dict, List, Tuple
+import networkx as nx
+from .compact import _EXACT_CUTS_MAX_NODES, CompactGraph
+
+
+def _get_star_cuts(cg: CompactGraph, fragmentation_type: str) -> List[List[int]]:
+    """
+    List the mask indices of the elements isolating each node: its edges for edge removal, its neighbours for node removal.
+    """
+    if fragmentation_type == "edges":
+        return [[cg.n + e for _, e in cg.adjacency[v]] for v in range(cg.n)]
+    return [[w for w, _ in cg.adjacency[v]] for v in range(cg.n)]
+
+
+def _get_min_node_cuts(
+    G: nx.Graph, cg: CompactGraph, fragmentation_type: str
+) -> List[List[int]]:
+    """
+    List the minimum node cuts of the graph as mask indices for node removal, when they are smaller than the degrees and the connectivity is known exactly.
+    Requires `cg.compute_cuts()`.
+    """
+    min_degree = min((len(a) for a in cg.adjacency), default=0)
+    if (
+        fragmentation_type == "nodes"
+        and cg.n <= _EXACT_CUTS_MAX_NODES
+        and 0 < cg.node_connectivity < min_degree
+    ):
+        return _get_mask_cuts(G, cg, nx.all_node_cuts(G), fragmentation_type)
+    return []
+
+
+def _get_mask_cuts(
+    G: nx.Graph, cg: CompactGraph, cuts: List[Collection], fragmentation_type: str
+) -> List[List[int]]:
+    """
+    Convert cuts given as sets of nodes or edges of G to mask indices.
+    """
+    if fragmentation_type == "edges":
+        index = {}
+        for j, (a, b) in enumerate(G.edges):
+            index[(a, b)] = cg.n + j
+            index[(b, a)] = cg.n + j
+        return [[index[tuple(e)] for e in cut] for cut in cuts]
+    index = {v: i for i, v in enumerate(cg.nodes)}
+    return [[index[v] for v in cut] for cut in cuts]
+
+
+def _get_element_range(cg: CompactGraph, fragmentation_type: str) -> range:
+    """
+    The mask indices of the elements that can be removed.
+    """
+    if fragmentation_type == "edges":
+        return range(cg.n, cg.n + cg.m)
+    return range(cg.n)
+
+
+def get_fragmentation_probability_importance_sampling(
+    G: nx.Graph,
+    iterations: int,
+    fragment_settings: Dict,
+    proposal: str = "cuts",
+    proposal_probability: float | None = None,
+    cut_probability: float = 0.5,
+    cuts: List[Collection] | None = None,
+) -> Tuple[float, float, int]:
+    """
+    Estimate the fragmentation probability of `probability_fragment` by importance sampling, for small removal probabilities where fragmentations are too rare to be observed by direct simulations.
+
+    The removals are drawn from a proposal distribution under which fragmentations are frequent, and each fragmented sample is weighted by the likelihood ratio of the removal probability to the proposal.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    iterations : int
+        The number of samples
+    fragment_settings : Dict
+        The settings of `probability_fragment`, the removal probability `fragmentation` and the `fragmentation_type`, `"nodes"` or `"edges"`
+    proposal : str, optional
+        The proposal distribution.\n
+        `"tilted"` removes every element with the higher probability `proposal_probability`.\n
+        `"cuts"` is a mixture: with probability `cut_probability`, all the elements isolating a random node (its edges, or its neighbours for node removal) are removed, and the other elements are removed with the original probability; otherwise the elements are removed with the original probability
+    proposal_probability : float | None, optional
+        The removal probability of the `"tilted"` proposal, by default the probability for which the expected number of removed elements is the minimum degree of the graph
+    cut_probability : float, optional
+        The probability of forcing a cut in the `"cuts"` proposal
+    cuts : List[Collection] | None, optional
+        The cuts of the `"cuts"` proposal, sets of nodes or of edges depending on the `fragmentation_type`, by default the sets isolating each node, and for node removal the minimum node cuts given by `nx.all_node_cuts` when they are smaller than the degrees.
+        The estimate is unbiased for any cuts, but its variance is only small if the cuts most likely to fragment the graph are included
+
+    Returns
+    -------
+    Tuple[float, float, int]
+        The estimated fragmentation probability, its relative standard error and the number of samples.
+        The relative error is infinite if no fragmented graph was sampled
+
+    Notes
+    -----
+    A graph is fragmented if it has at least one node and is not connected, like the default `is_fragmented` of `get_fragmentation_probability`.
+    If the proposal misses the most likely fragmentations, the estimate and its relative error are both underestimated until one of them is sampled.
+    """
+    cg = CompactGraph(G)
+    cg.compute_cuts()
+    p = fragment_settings["fragmentation"]
+    fragmentation_type = fragment_settings["fragmentation_type"]
+    elements = _get_element_range(cg, fragmentation_type)
+    size = len(elements)
+    if proposal == "tilted":
+        if proposal_probability is None:
+            min_degree = min((len(a) for a in cg.adjacency), default=0)
+            proposal_probability = min(max(p, min_degree / max(size, 1)), 0.5)
+        q = proposal_probability
+        # Log-likelihood ratio of a removed and of a kept element
+        removed_ratio = log(p / q) if p > 0 else None
+        kept_ratio = log((1 - p) / (1 - q)) if q < 1 else None
+    elif proposal == "cuts":
+        if cuts is None:
+            cuts = _get_star_cuts(cg, fragmentation_type)
+            # A minimum node cut may be the neighbourhood of a node
+            stars = set(tuple(sorted(cut)) for cut in cuts)
+            cuts += [
+                cut
+                for cut in _get_min_node_cuts(G, cg, fragmentation_type)
+                if tuple(sorted(cut)) not in stars
+            ]
+        else:
+            cuts = _get_mask_cuts(G, cg, cuts, fragmentation_type)
+        cut_weights = [p ** (-len(cut)) if p > 0 else None for cut in cuts]
+    else:
+        raise ValueError("proposal must be 'tilted' or 'cuts', got %r" % proposal)
+    total = 0.0
+    total_squares = 0.0
+    for _ in range(iterations):
+        mask = cg.create_mask()
+        if proposal == "tilted":
+            removed = 0
+            for i in elements:
+                if random.random() < q:
+                    mask[i] = 1
+                    removed += 1
+            if not cg.is_fragmented(mask):
+                continue
+            if removed > 0 and removed_ratio is None:
+                # Impossible under the removal probability
+                continue
+            weight = exp(
+                (removed_ratio * removed if removed > 0 else 0)
+                + (kept_ratio * (size - removed) if size > removed else 0)
+            )
+        else:
+            for i in elements:
+                if random.random() < p:
+                    mask[i] = 1
+            if len(cuts) > 0 and random.random() < cut_probability:
+                for i in random.choice(cuts):
+                    mask[i] = 1
+            if not cg.is_fragmented(mask):
+                continue
+            if p == 0:
+                # Only a forced cut can fragment the graph, which is impossible without removals
+                continue
+            # Ratio of the proposal density to the original one, the cuts contained in the sample could all have been forced
+            density_ratio = 1 - cut_probability
+            if len(cuts) > 0:
+                density_ratio += (
+                    cut_probability
+                    / len(cuts)
+                    * sum(
+                        w
+                        for cut, w in zip(cuts, cut_weights)
+                        if all(mask[i] for i in cut)
+                    )
+                )
+            weight = 1 / density_ratio
+        total += weight
+        total_squares += weight * weight
+    if iterations == 0:
+        return 0.0, float("inf"), 0
+    pfrag = total / iterations
+    if pfrag == 0:
+        return 0.0, float("inf"), iterations
+    variance = max(total_squares / iterations - pfrag * pfrag, 0)
+    return pfrag, sqrt(variance / iterations) / pfrag, iterations
@@ -0,0 +1,296 @@
+import numpy as np
+from numba import njit
+
+# Kernels of the compact graph compiled with Numba, see `capsidgraph.analyser.backend`.
+# The graph is given by the arrays `indptr`, `indices` and `edge_ids` of `CompactGraph` and the removal masks are uint8 arrays sharing the memory of the bytearrays
+# The work arrays are preallocated by the callers, so that the kernels do not allocate memory
+
+
+@njit(cache=True)
+def is_fragmented(
+    indptr, indices, edge_ids, mask, n, start, surviving, visited, stamp, stack
+):
+    """
+    Traverse the remaining graph from `start` and determine if some of the `surviving` nodes are not reached.
+    A node is visited if its entry of `visited` is equal to `stamp`, which must differ from all the entries at the call, and `stack` has n entries.
+    """
+    visited[start] = stamp
+    stack[0] = start
+    top = 1
+    reached = 1
+    while top > 0:
+        top -= 1
+        v = stack[top]
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            if visited[w] != stamp and mask[w] == 0 and mask[n + edge_ids[k]] == 0:
+                visited[w] = stamp
+                reached += 1
+                if reached == surviving:
+                    return False
+                stack[top] = w
+                top += 1
+    return True
+
+
+@njit(cache=True)
+def get_hole(
+    indptr, indices, edge_ids, mask, n, size, visited, stamp, component, queue, largest
+):
+    """
+    Compute the hole size of a removal mask, or if `size` is not negative, 1 if the hole has at least `size` nodes and 0 otherwise, like `CompactGraph._get_hole`.
+    The traversals mark `visited` with the stamps from `stamp` to `stamp + n - 1`, which must differ from all the entries at the call, and `component`, `queue` and `largest` have n entries.
+    """
+    surviving = 0
+    for v in range(n):
+        if mask[v] == 0:
+            surviving += 1
+    if surviving == 0:
+        if size < 0:
+            return n
+        return 1 if n >= size else 0
+    # Label the components of the fragmented graph, keeping the largest ones
+    component[:] = -1
+    largest_count = 0
+    largest_size = 0
+    remaining = surviving
+    label = 0
+    for start in range(n):
+        if remaining < largest_size:
+            break
+        if mask[start] != 0 or component[start] != -1:
+            continue
+        component[start] = label
+        queue[0] = start
+        head = 0
+        tail = 1
+        while head < tail:
+            v = queue[head]
+            head += 1
+            for k in range(indptr[v], indptr[v + 1]):
+                w = indices[k]
+                if component[w] == -1 and mask[w] == 0 and mask[n + edge_ids[k]] == 0:
+                    component[w] = label
+                    queue[tail] = w
+                    tail += 1
+        remaining -= tail
+        if size >= 0 and n - tail < size:
+            return 0
+        if tail > largest_size:
+            largest_size = tail
+            largest[0] = label
+            largest_count = 1
+        elif tail == largest_size:
+            largest[largest_count] = label
+            largest_count += 1
+        label += 1
+    # Largest connected component of the original graph outside each of them
+    hole = 0
+    for c in range(largest_count):
+        outside = n - largest_size
+        if outside == 0:
+            if size < 0:
+                return 0
+            return 1 if size <= 0 else 0
+        if size >= 0 and outside < size:
+            continue
+        current = stamp + c
+        for v in range(n):
+            if component[v] == largest[c]:
+                visited[v] = current
+        remaining = outside
+        for start in range(n):
+            if remaining <= hole or (size >= 0 and remaining < size):
+                break
+            if visited[start] == current:
+                continue
+            visited[start] = current
+            queue[0] = start
+            top = 1
+            count = 1
+            while top > 0:
+                top -= 1
+                v = queue[top]
+                for k in range(indptr[v], indptr[v + 1]):
+                    w = indices[k]
+                    if visited[w] != current:
+                        visited[w] = current
+                        count += 1
+                        queue[top] = w
+                        top += 1
+            remaining -= count
+            if size >= 0 and count >= size:
+                return 1
+            hole = max(hole, count)
+    if size < 0:
+        return hole
+    return 0
+
+
+@njit(cache=True)
+def _accumulate(weights, remaining, order, cumulative):
+    """
+    Write the remaining indices and the cumulative sums of their weights, in increasing order, and return their number.
+    """
+    count = 0
+    total = 0.0
+    for j in range(len(weights)):
+        if remaining[j]:
+            total += weights[j]
+            order[count] = j
+            cumulative[count] = total
+            count += 1
+    return count
+
+
+@njit(cache=True)
+def _draw(order, cumulative, count, u):
+    """
+    Draw an index with a probability proportional to its weight from a uniform number `u`, like `random.choices`.
+    """
+    r = u * cumulative[count - 1]
+    # First cumulative weight larger than r, like `bisect.bisect_right`
+    k = 0
+    while k < count - 1 and cumulative[k] <= r:
+        k += 1
+    return order[k]
+
+
+@njit(cache=True)
+def _splitmix(state):
+    """
+    Advance the state of a SplitMix64 generator and return it with a uniform number of [0, 1) drawn from it.
+    """
+    state += np.uint64(0x9E3779B97F4A7C15)
+    z = state
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return state, (z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+@njit(cache=True)
+def sample_strength_edges(
+    edge_strength,
+    weights,
+    strength,
+    n,
+    out_mask,
+    uniforms,
+    seed,
+    remaining,
+    order,
+    cumulative,
+):
+    """
+    Remove random edges until the given strength has been removed, like `strength_edges_fragment`, using the uniform numbers drawn by `random.random` in `uniforms`.
+    If `uniforms` is empty, the uniform numbers are drawn from a SplitMix64 generator seeded with `seed` instead.
+    `weights` contains the inverses of the strengths, and `remaining`, `order` and `cumulative` have m entries.
+
+    Returns the number of uniform numbers used, -1 if more are needed.
+    """
+    m = len(edge_strength)
+    remaining[:] = True
+    state = seed
+    used = 0
+    count = m
+    while count > 0:
+        max_weight = 0.0
+        for j in range(m):
+            if remaining[j]:
+                max_weight = max(max_weight, weights[j])
+        if not strength > 1 / max_weight:
+            break
+        _accumulate(weights, remaining, order, cumulative)
+        # Draw edges until one is weaker than the remaining strength
+        i = -1
+        while i == -1 or strength <= edge_strength[i]:
+            if len(uniforms) == 0:
+                state, u = _splitmix(state)
+            elif used == len(uniforms):
+                return -1
+            else:
+                u = uniforms[used]
+            i = _draw(order, cumulative, count, u)
+            used += 1
+        strength -= edge_strength[i]
+        remaining[i] = False
+        count -= 1
+        out_mask[n + i] = 1
+    return used
+
+
+@njit(cache=True)
+def sample_strength_nodes(
+    indptr,
+    indices,
+    edge_ids,
+    edge_strength,
+    node_strength,
+    strength,
+    out_mask,
+    uniforms,
+    seed,
+    current_strength,
+    weights,
+    remaining,
+    order,
+    cumulative,
+    removed_neighbours,
+):
+    """
+    Remove random nodes until the given strength has been removed, like `strength_nodes_fragment`, using the uniform numbers drawn by `random.random` in `uniforms`.
+    If `uniforms` is empty, the uniform numbers are drawn from a SplitMix64 generator seeded with `seed` instead.
+    The strength of the neighbours of a removed node is decreased, and the neighbours left without strength are removed.
+    `current_strength`, `weights`, `remaining`, `order`, `cumulative` and `removed_neighbours` have n entries.
+
+    Returns the number of uniform numbers used, -1 if more are needed.
+    """
+    n = len(node_strength)
+    current_strength[:] = node_strength
+    node_strength = current_strength
+    for v in range(n):
+        weights[v] = 1 / node_strength[v]
+    remaining[:] = True
+    state = seed
+    used = 0
+    count = n
+    while count > 0:
+        max_weight = 0.0
+        for v in range(n):
+            if remaining[v]:
+                max_weight = max(max_weight, weights[v])
+        if not strength + 1e-15 > 1 / max_weight:
+            break
+        _accumulate(weights, remaining, order, cumulative)
+        i = -1
+        while i == -1 or strength + 1e-15 < node_strength[i]:
+            if len(uniforms) == 0:
+                state, u = _splitmix(state)
+            elif used == len(uniforms):
+                return -1
+            else:
+                u = uniforms[used]
+            i = _draw(order, cumulative, count, u)
+            used += 1
+        strength -= node_strength[i]
+        out_mask[i] = 1
+        remaining[i] = False
+        count -= 1
+        # Update the strength and probability weight of the neighbours, like `_remove_node`
+        removed_count = 0
+        for k in range(indptr[i], indptr[i + 1]):
+            w = indices[k]
+            if out_mask[w] == 0:
+                node_strength[w] -= edge_strength[edge_ids[k]]
+                if node_strength[w] > 1e-15:
+                    weights[w] = abs(1 / node_strength[w])
+                else:
+                    removed_neighbours[removed_count] = w
+                    removed_count += 1
+        for k in range(removed_count):
+            w = removed_neighbours[k]
+            out_mask[w] = 1
+            remaining[w] = False
+            count -= 1
+    return used
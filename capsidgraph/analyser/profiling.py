@@ -0,0 +1,198 @@
+import os
+import time
+from typing import Dict, List
+
+# Phases of a simulation, in the order in which they are reported
+PHASES = ["fragment", "copy", "sample", "remove", "is_fragmented", "reduce"]
+
+
+class PhaseProfiler:
+    """
+    Accumulate the wall time and the number of calls of the phases of the simulations.
+
+    The phases are `fragment` (the whole call to the fragmentation method), its parts `copy` (copy of the graph), `sample` (random draws of the removed elements) and `remove` (removal from the copy), `is_fragmented` (connectivity check) and `reduce` (update of the counters and of the stop condition).
+    The parts of `fragment` are only measured for the built-in fragmentation methods.
+    """
+
+    def __init__(self):
+        self.times = {}
+        self.calls = {}
+
+    def add(self, phase: str, start: float) -> float:
+        """
+        Add the time elapsed since `start` to a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase
+        start : float
+            The value of `time.perf_counter()` at the start of the phase
+
+        Returns
+        -------
+        float
+            The current value of `time.perf_counter()`, to chain phases
+        """
+        now = time.perf_counter()
+        self.times[phase] = self.times.get(phase, 0) + now - start
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        return now
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the profile into a dict of phases, see `get_profile_report`.
+        """
+        return {
+            "pid": os.getpid(),
+            "phases": {
+                phase: {"time": self.times[phase], "calls": self.calls[phase]}
+                for phase in sorted(self.times, key=_get_phase_order)
+            },
+        }
+
+
+# Profiler of the current process, None when profiling is disabled
+_profiler: PhaseProfiler | None = None
+
+
+def _get_phase_order(phase: str) -> int:
+    """
+    Sort key of the phases, unknown phases are reported last.
+    """
+    return PHASES.index(phase) if phase in PHASES else len(PHASES)
+
+
+def _start_profiling() -> PhaseProfiler | None:
+    """
+    Enable profiling in the current process.
+
+    Returns
+    -------
+    PhaseProfiler | None
+        The profiler that was active before, to give back to `_stop_profiling`
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = PhaseProfiler()
+    return previous
+
+
+def _stop_profiling(previous: PhaseProfiler | None = None) -> Dict:
+    """
+    Disable profiling in the current process and restore the previous profiler.
+
+    Returns
+    -------
+    Dict
+        The profile of the current process, see `PhaseProfiler.to_dict`
+    """
+    global _profiler
+    res = _profiler.to_dict()
+    _profiler = previous
+    return res
+
+
+def get_profile_report(
+    workers: List[Dict], wall_time: float, iterations: int
+) -> Dict:
+    """
+    Combine the profiles of the worker processes into a report.
+
+    Parameters
+    ----------
+    workers : List[Dict]
+        The profile of each worker, as returned by `PhaseProfiler.to_dict`
+    wall_time : float
+        The wall time of the whole estimation, in seconds
+    iterations : int
+        The number of simulations
+
+    Returns
+    -------
+    Dict
+        The entry "phases" maps every phase to its total "time" in seconds over all the workers, its number of "calls", its "mean" time per call and its "share" of the total time of the workers.
+        The entry "workers" contains the profile of each worker, "wall_time" the wall time and "iterations" the number of simulations.
+    """
+    times = {}
+    calls = {}
+    for worker in workers:
+        for phase, data in worker["phases"].items():
+            times[phase] = times.get(phase, 0) + data["time"]
+            calls[phase] = calls.get(phase, 0) + data["calls"]
+    # Parts of the `fragment` phase are not counted twice
+    total = sum(
+        t for phase, t in times.items() if phase not in ("copy", "sample", "remove")
+    )
+    return {
+        "phases": {
+            phase: {
+                "time": times[phase],
+                "calls": calls[phase],
+                "mean": times[phase] / calls[phase],
+                "share": times[phase] / total if total > 0 else 0,
+            }
+            for phase in sorted(times, key=_get_phase_order)
+        },
+        "workers": workers,
+        "wall_time": wall_time,
+        "iterations": iterations,
+    }
+
+
+def merge_profile_reports(reports: List[Dict]) -> Dict:
+    """
+    Merge the reports of several estimations, for instance the steps of a bisection.
+
+    Parameters
+    ----------
+    reports : List[Dict]
+        The reports returned by `get_profile_report`
+
+    Returns
+    -------
+    Dict
+        A report of all the estimations, its "workers" entry lists the workers of every estimation
+    """
+    workers = [w for report in reports for w in report["workers"]]
+    return get_profile_report(
+        workers,
+        sum(r["wall_time"] for r in reports),
+        sum(r["iterations"] for r in reports),
+    )
+
+
+def format_profile_report(report: Dict) -> str:
+    """
+    Format a profile report as a table.
+
+    Parameters
+    ----------
+    report : Dict
+        The report returned by `get_profile_report`
+
+    Returns
+    -------
+    str
+        One line per phase with its total time, number of calls, mean time per call and share of the time
+    """
+    lines = [
+        "%-14s %10s %10s %12s %7s"
+        % ("phase", "time (s)", "calls", "mean (us)", "share")
+    ]
+    for phase, data in report["phases"].items():
+        lines.append(
+            "%-14s %10.3f %10d %12.2f %6.1f%%"
+            % (
+                phase,
+                data["time"],
+                data["calls"],
+                1e6 * data["mean"],
+                100 * data["share"],
+            )
+        )
+    lines.append(
+        "%d iterations in %.3f s on %d worker(s)"
+        % (report["iterations"], report["wall_time"], len(report["workers"]))
+    )
+    return "\n".join(lines)
@@ -0,0 +1,248 @@
+import json
+import logging
+from math import sqrt
+from typing import Callable, Dict, List, Tuple
+
+ProgressHook = Callable[[Dict], None]
+
+# Quantile of the normal distribution used for the 95% confidence intervals
+_Z = 1.959963984540054
+
+
+def get_confidence_interval(
+    fragmented: int, iterations: int, z: float = _Z
+) -> Tuple[float, float]:
+    """
+    Compute the Wilson score interval of a fragmentation probability.
+
+    Parameters
+    ----------
+    fragmented : int
+        The number of fragmented graphs
+    iterations : int
+        The number of simulations
+    z : float, optional
+        The quantile of the normal distribution, the default gives a 95% confidence interval
+
+    Returns
+    -------
+    Tuple[float, float]
+        The lower and upper bounds of the interval, (0, 1) if no simulation has been done
+    """
+    if iterations == 0:
+        return 0.0, 1.0
+    p = fragmented / iterations
+    denominator = 1 + z * z / iterations
+    center = (p + z * z / (2 * iterations)) / denominator
+    half_width = (
+        z * sqrt(p * (1 - p) / iterations + z * z / (4 * iterations**2)) / denominator
+    )
+    return max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def _create_progress_event(
+    event: str,
+    iterations: int,
+    fragmented: int,
+    elapsed: float,
+    target: int | None = None,
+    **extra
+) -> Dict:
+    """
+    Create the event passed to progress hooks.
+
+    Parameters
+    ----------
+    event : str
+        The type of the event, `"progress"` while simulations are running, `"end"` when an estimation is done and `"step"` after each step of a bisection
+    iterations : int
+        The number of simulations done
+    fragmented : int
+        The number of fragmented graphs
+    elapsed : float
+        The time since the start of the estimation, in seconds
+    target : int | None, optional
+        The expected total number of simulations, if it can be predicted
+    extra
+        Other entries of the event
+
+    Returns
+    -------
+    Dict
+        The event, see `get_fragmentation_probability`
+    """
+    lower, upper = get_confidence_interval(fragmented, iterations)
+    rate = iterations / elapsed if elapsed > 0 else None
+    eta = None
+    if target is not None and rate:
+        eta = max(target - iterations, 0) / rate
+    res = {
+        "event": event,
+        "iterations": iterations,
+        "fragmented": fragmented,
+        "estimate": fragmented / iterations if iterations > 0 else None,
+        "ci_low": lower,
+        "ci_high": upper,
+        "ci_width": upper - lower,
+        "elapsed": elapsed,
+        "sims_per_second": rate,
+        "target_iterations": target,
+        "eta": eta,
+    }
+    res.update(extra)
+    return res
+
+
+def _get_progress_hook(
+    progress: ProgressHook | List[ProgressHook] | None,
+) -> ProgressHook | None:
+    """
+    Combine a list of progress hooks into a single one.
+    """
+    if progress is None or callable(progress):
+        return progress
+    hooks = list(progress)
+    if len(hooks) == 0:
+        return None
+
+    def hook(event: Dict):
+        for h in hooks:
+            h(event)
+
+    return hook
+
+
+def format_progress_event(event: Dict) -> str:
+    """
+    Format a progress event as a single line of text.
+
+    Parameters
+    ----------
+    event : Dict
+        The event
+
+    Returns
+    -------
+    str
+        A line containing the number of simulations, the estimate with the half width of its confidence interval, the throughput, the remaining time and the bisection bounds if any
+    """
+    res = "%s n=%d" % (event["event"], event["iterations"])
+    if event["estimate"] is not None:
+        res += " p=%.4f±%.4f" % (event["estimate"], event["ci_width"] / 2)
+    if event["sims_per_second"] is not None:
+        res += " %.0f sims/s" % event["sims_per_second"]
+    if event["eta"] is not None:
+        res += " ETA %.0fs" % event["eta"]
+    if "fragmentation" in event:
+        res += " fragmentation=%g" % event["fragmentation"]
+    if "lower_bound" in event:
+        res += " bounds=[%g, %g] step %d" % (
+            event["lower_bound"],
+            event["upper_bound"],
+            event["step"],
+        )
+    return res
+
+
+def create_log_sink(
+    logger: logging.Logger | None = None, level: int = logging.INFO
+) -> ProgressHook:
+    """
+    Create a progress hook logging every event as a single line.
+
+    Parameters
+    ----------
+    logger : logging.Logger | None, optional
+        The logger to use, by default the `capsidgraph.analyser` logger
+    level : int, optional
+        The level of the log messages
+
+    Returns
+    -------
+    ProgressHook
+        The progress hook
+    """
+    if logger is None:
+        logger = logging.getLogger("capsidgraph.analyser")
+
+    def hook(event: Dict):
+        logger.log(level, format_progress_event(event))
+
+    return hook
+
+
+def create_jsonl_sink(path: str) -> ProgressHook:
+    """
+    Create a progress hook appending every event to a file, as one JSON object per line.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file
+
+    Returns
+    -------
+    ProgressHook
+        The progress hook
+
+    Notes
+    -----
+    The file is opened for each event so that it can be followed while a long run is in progress, and no file handle is kept open.
+    """
+
+    def hook(event: Dict):
+        with open(path, "a") as f:
+            f.write(json.dumps(event, default=str) + "\n")
+
+    return hook
+
+
+def create_tqdm_sink(**tqdm_settings) -> ProgressHook:
+    """
+    Create a progress hook showing a tqdm progress bar for every estimation.
+
+    Parameters
+    ----------
+    tqdm_settings
+        Arguments passed to `tqdm.tqdm`
+
+    Returns
+    -------
+    ProgressHook
+        The progress hook
+
+    Notes
+    -----
+    The `tqdm` package is required. The total of the bar is the expected number of simulations when it can be predicted.
+    """
+    try:
+        from tqdm import tqdm
+    except ImportError as e:
+        raise ImportError("create_tqdm_sink requires the tqdm package") from e
+    bar = None
+
+    def hook(event: Dict):
+        nonlocal bar
+        if event["event"] == "step":
+            return
+        if bar is None:
+            bar = tqdm(**tqdm_settings)
+        if "lower_bound" in event:
+            bar.set_description(
+                "step %d [%g, %g]"
+                % (event["step"], event["lower_bound"], event["upper_bound"])
+            )
+        bar.total = event["target_iterations"]
+        bar.n = event["iterations"]
+        if event["estimate"] is not None:
+            bar.set_postfix(
+                p="%.4f" % event["estimate"],
+                ci="%.4f" % event["ci_width"],
+                refresh=False,
+            )
+        bar.refresh()
+        if event["event"] == "end":
+            bar.close()
+            bar = None
+
+    return hook
@@ -0,0 +1,304 @@
+from math import comb
+from typing import Dict, List
+import networkx as nx
+import numpy as np
+
+
+class FragmentationPolynomial:
+    """
+    Exact fragmentation probability of a graph when every node or every edge is removed independently with probability p.
+
+    The probability is stored in the Bernstein basis: if `counts[k]` is the number of sets of k removed elements that fragment the graph, the fragmentation probability is the sum over k of `counts[k] * p**k * (1-p)**(size-k)`.
+
+    Parameters
+    ----------
+    counts : List[int]
+        The number of fragmenting sets of removed elements of each size
+    fragmentation_type : str
+        `"nodes"` or `"edges"`, the type of the removed elements
+
+    Attributes
+    ----------
+    size : int
+        The number of nodes or edges that can be removed
+    """
+
+    def __init__(self, counts: List[int], fragmentation_type: str):
+        self.counts = counts
+        self.fragmentation_type = fragmentation_type
+        self.size = len(counts) - 1
+
+    def __call__(self, p: float | np.ndarray) -> float | np.ndarray:
+        """
+        Evaluate the fragmentation probability.
+
+        Parameters
+        ----------
+        p : float | np.ndarray
+            The removal probability, or an array of removal probabilities
+
+        Returns
+        -------
+        float | np.ndarray
+            The fragmentation probability
+        """
+        p = np.asarray(p, dtype=float)
+        res = np.zeros_like(p)
+        for k, count in enumerate(self.counts):
+            if count:
+                res += float(count) * p**k * (1 - p) ** (self.size - k)
+        return res if res.ndim > 0 else float(res)
+
+    @property
+    def coefficients(self) -> List[int]:
+        """
+        The exact integer coefficients of the polynomial in the power basis, from the constant term to the term of degree `size`.
+        """
+        res = [0] * (self.size + 1)
+        for k, count in enumerate(self.counts):
+            if count:
+                for j in range(self.size - k + 1):
+                    res[k + j] += count * comb(self.size - k, j) * (-1) ** j
+        return res
+
+    def threshold(self, probability: float = 0.5, steps: int = 50) -> float:
+        """
+        Find the removal probability at which the fragmentation probability reaches a value, by bisection.
+
+        Parameters
+        ----------
+        probability : float, optional
+            The fragmentation probability to reach
+        steps : int, optional
+            The number of bisection steps, the result is within 2**(-steps) of the solution
+
+        Returns
+        -------
+        float
+            The removal probability
+
+        Notes
+        -----
+        Like `bisection`, the fragmentation probability is assumed to increase with the removal probability on the interval of interest.
+        For node removal it decreases again close to 1, since removing every node leaves an empty graph which is not fragmented.
+        """
+        lower_bound = 0
+        upper_bound = 1
+        for _ in range(steps):
+            middle = (lower_bound + upper_bound) / 2
+            if self(middle) > probability:
+                upper_bound = middle
+            else:
+                lower_bound = middle
+        return (lower_bound + upper_bound) / 2
+
+
+def _get_vertex_order(G: nx.Graph) -> List:
+    """
+    Order the nodes so that the frontier of processed nodes with unprocessed neighbours stays small.
+    The next node is the one with the most processed neighbours, then the fewest unprocessed ones.
+    """
+    order = []
+    processed = set()
+    remaining = set(G.nodes)
+    score = {v: 0 for v in G.nodes}
+    while remaining:
+        if len(order) == 0 or max(score[v] for v in remaining) == 0:
+            # First node of a connected component
+            v = min(remaining, key=lambda v: (G.degree(v), str(v)))
+        else:
+            v = max(
+                remaining,
+                key=lambda v: (score[v], -G.degree(v) + score[v], str(v)),
+            )
+        order.append(v)
+        processed.add(v)
+        remaining.remove(v)
+        for w in G.adj[v]:
+            if w not in processed:
+                score[w] += 1
+    return order
+
+
+def _canonical(labels: tuple) -> tuple:
+    """
+    Relabel the components of a frontier by order of appearance, 0 marks removed nodes.
+    """
+    mapping = {0: 0}
+    res = []
+    for label in labels:
+        if label not in mapping:
+            mapping[label] = len(mapping)
+        res.append(mapping[label])
+    return tuple(res)
+
+
+def _add_counts(states: Dict, state: tuple, counts: List[int], shift: int):
+    """
+    Add the counts of a partial state, shifted by a number of removed elements, to a state of the next step.
+    """
+    if state not in states:
+        states[state] = [0] * len(counts)
+    target = states[state]
+    for k in range(len(counts) - shift):
+        target[k + shift] += counts[k]
+
+
+def _get_edge_connected_counts(G: nx.Graph) -> List[int]:
+    """
+    Count the sets of removed edges of each size that leave the graph connected, with a frontier dynamic programming over the edges.
+    """
+    m = len(G.edges)
+    position = {v: i for i, v in enumerate(_get_vertex_order(G))}
+    edges = sorted(
+        G.edges,
+        key=lambda e: (
+            max(position[e[0]], position[e[1]]),
+            min(position[e[0]], position[e[1]]),
+        ),
+    )
+    last_edge = {}
+    for j, (a, b) in enumerate(edges):
+        last_edge[a] = j
+        last_edge[b] = j
+    frontier = []
+    # The state is the component of each node of the frontier, the counts are indexed by the number of removed edges
+    states = {(): [1] + [0] * m}
+    for j, (a, b) in enumerate(edges):
+        for v in (a, b):
+            if v not in frontier:
+                frontier.append(v)
+                states = {
+                    state + (len(frontier) + 1,): c for state, c in states.items()
+                }
+        ia = frontier.index(a)
+        ib = frontier.index(b)
+        new_states = {}
+        for state, counts in states.items():
+            # Edge removed
+            _add_counts(new_states, _canonical(state), counts, 1)
+            # Edge kept, the components of its extremities are merged
+            la, lb = state[ia], state[ib]
+            kept = tuple(la if label == lb else label for label in state)
+            _add_counts(new_states, _canonical(kept), counts, 0)
+        states = new_states
+        # Nodes whose edges are all processed leave the frontier
+        for v in (a, b):
+            if last_edge[v] != j or v not in frontier:
+                continue
+            i = frontier.index(v)
+            del frontier[i]
+            new_states = {}
+            for state, counts in states.items():
+                rest = state[:i] + state[i + 1 :]
+                if state[i] not in rest and (len(rest) > 0 or j < m - 1):
+                    # The component of the node is closed while other nodes remain, the graph is disconnected
+                    continue
+                _add_counts(new_states, _canonical(rest), counts, 0)
+            states = new_states
+    return states.get((), [0] * (m + 1))
+
+
+def _get_node_connected_counts(G: nx.Graph) -> List[int]:
+    """
+    Count the sets of removed nodes of each size that leave the graph connected or empty, with a frontier dynamic programming over the nodes.
+    """
+    n = len(G.nodes)
+    order = _get_vertex_order(G)
+    position = {v: i for i, v in enumerate(order)}
+    last_neighbour = {
+        v: max([position[w] for w in G.adj[v]] + [position[v]]) for v in G.nodes
+    }
+    frontier = []
+    # The state is the component of each node of the frontier (0 if removed) followed by whether a component has been closed
+    states = {(False,): [1] + [0] * n}
+    for t, v in enumerate(order):
+        neighbours = [i for i, w in enumerate(frontier) if w in G.adj[v]]
+        new_states = {}
+        for state, counts in states.items():
+            labels, closed = state[:-1], state[-1]
+            # Node removed
+            _add_counts(new_states, labels + (0, closed), counts, 1)
+            # Node kept, it joins the components of its kept neighbours
+            if closed:
+                # A closed component cannot be connected to this node
+                continue
+            merged = set(labels[i] for i in neighbours) - {0}
+            label = len(labels) + 1
+            kept = tuple(label if l in merged else l for l in labels)
+            _add_counts(new_states, kept + (label, closed), counts, 0)
+        states = new_states
+        frontier.append(v)
+        # Nodes whose neighbours are all processed leave the frontier
+        for w in [w for w in frontier if last_neighbour[w] <= t]:
+            i = frontier.index(w)
+            del frontier[i]
+            new_states = {}
+            for state, counts in states.items():
+                labels, closed = state[:-1], state[-1]
+                rest = labels[:i] + labels[i + 1 :]
+                if labels[i] != 0 and labels[i] not in rest:
+                    if any(l != 0 for l in rest):
+                        # Another component remains, the graph is disconnected
+                        continue
+                    closed = True
+                _add_counts(new_states, _canonical(rest) + (closed,), counts, 0)
+            states = new_states
+        states = _merge_states(states)
+    res = [0] * (n + 1)
+    for counts in states.values():
+        for k, c in enumerate(counts):
+            res[k] += c
+    return res
+
+
+def _merge_states(states: Dict) -> Dict:
+    """
+    Merge the states that are equal once canonicalized.
+    """
+    res = {}
+    for state, counts in states.items():
+        _add_counts(res, _canonical(state[:-1]) + (state[-1],), counts, 0)
+    return res
+
+
+def get_fragmentation_polynomial(
+    G: nx.Graph, fragmentation_type: str = "edges"
+) -> FragmentationPolynomial:
+    """
+    Compute exactly the fragmentation probability of a graph when every node or every edge is removed independently with probability p, as a polynomial in p.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph
+    fragmentation_type : str, optional
+        `"edges"` or `"nodes"`, the type of the removed elements, as in `probability_fragment`
+
+    Returns
+    -------
+    FragmentationPolynomial
+        The fragmentation probability, a graph is fragmented if it has at least one node and is not connected
+
+    Notes
+    -----
+    The sets of removed elements leaving the graph connected are counted with a frontier-based dynamic programming, whose cost grows exponentially with the largest number of processed nodes having unprocessed neighbours.
+    It is meant for small graphs such as the AaLS capsids or T=1 icosahedral capsids.
+    """
+    if fragmentation_type == "edges":
+        size = len(G.edges)
+        if len(G.nodes) <= 1:
+            connected = [comb(size, k) for k in range(size + 1)]
+        elif any(d == 0 for _, d in G.degree):
+            connected = [0] * (size + 1)
+        else:
+            connected = _get_edge_connected_counts(G)
+    elif fragmentation_type == "nodes":
+        size = len(G.nodes)
+        connected = _get_node_connected_counts(G)
+    else:
+        raise ValueError(
+            "fragmentation_type must be 'nodes' or 'edges', got %r" % fragmentation_type
+        )
+    counts = [comb(size, k) - c for k, c in enumerate(connected)]
+    return FragmentationPolynomial(counts, fragmentation_type)
@@ -0,0 +1,276 @@
+from typing import Dict, List, Tuple
+from .profiling import merge_profile_reports
+from .progress import _Z, get_confidence_interval
+
+
+def _merge_seeds(results) -> List[int]:
+    """
+    Concatenate the seeds of several results, checking that no simulation is counted twice.
+    """
+    seeds = []
+    for result in results:
+        seeds.extend(result.seeds)
+    if len(set(seeds)) < len(seeds):
+        raise ValueError(
+            "the results share random seeds, their simulations would be counted twice"
+        )
+    return seeds
+
+
+def _check_settings(results):
+    """
+    Check that the results have been computed with the same settings.
+    """
+    for result in results[1:]:
+        if result.settings != results[0].settings:
+            raise ValueError(
+                "cannot merge results computed with different settings: %r and %r"
+                % (results[0].settings, result.settings)
+            )
+
+
+class ProbabilityResult(tuple):
+    """
+    Result of a fragmentation probability estimation, unpacked as `(pfrag, n)` like the tuples returned before, or as `(pfrag, n, report)` if the estimation was profiled.
+
+    The integer counts are kept, so the results of independent runs, for instance on several machines, are combined exactly by `merge`.
+
+    Parameters
+    ----------
+    fragmented : int
+        The number of fragmented graphs
+    iterations : int
+        The number of simulations
+    seeds : List[int] | None, optional
+        The seeds of the random streams of the simulations. The simulations run in the calling process are seeded like those of a worker, with a seed drawn from the `random` module
+    settings : Dict | None, optional
+        The settings of the fragmentation method
+    elapsed : float, optional
+        The wall time of the estimation, in seconds. The time of merged results is the sum of their times
+    profile : Dict | None, optional
+        The profile report of the estimation, see `get_fragmentation_probability`
+
+    Attributes
+    ----------
+    probability : float
+        The estimated fragmentation probability, 0 without simulations
+    """
+
+    def __new__(
+        cls,
+        fragmented: int,
+        iterations: int,
+        seeds: List[int] | None = None,
+        settings: Dict | None = None,
+        elapsed: float = 0.0,
+        profile: Dict | None = None,
+    ):
+        probability = fragmented / iterations if iterations > 0 else 0.0
+        if profile is None:
+            self = super().__new__(cls, (probability, iterations))
+        else:
+            self = super().__new__(cls, (probability, iterations, profile))
+        self.fragmented = fragmented
+        self.iterations = iterations
+        self.probability = probability
+        self.seeds = list(seeds or [])
+        self.settings = settings
+        self.elapsed = elapsed
+        self.profile = profile
+        return self
+
+    def __getnewargs__(self):
+        return (
+            self.fragmented,
+            self.iterations,
+            self.seeds,
+            self.settings,
+            self.elapsed,
+            self.profile,
+        )
+
+    def get_confidence_interval(self, z: float = _Z) -> Tuple[float, float]:
+        """
+        Compute the Wilson score interval of the estimated probability, see `get_confidence_interval`.
+        """
+        return get_confidence_interval(self.fragmented, self.iterations, z)
+
+    def merge(self, *others: "ProbabilityResult") -> "ProbabilityResult":
+        """
+        Combine independent estimations with the same settings into one.
+
+        Parameters
+        ----------
+        others : ProbabilityResult
+            The other results
+
+        Returns
+        -------
+        ProbabilityResult
+            The result of all the simulations, profiled if all the results are
+
+        Raises
+        ------
+        ValueError
+            If the settings of the results differ or if they share seeds
+        """
+        results = [self, *others]
+        _check_settings(results)
+        profile = None
+        if all(r.profile is not None for r in results):
+            profile = merge_profile_reports([r.profile for r in results])
+        return ProbabilityResult(
+            sum(r.fragmented for r in results),
+            sum(r.iterations for r in results),
+            _merge_seeds(results),
+            self.settings,
+            sum(r.elapsed for r in results),
+            profile,
+        )
+
+
+class CurveResult(tuple):
+    """
+    Result of `get_fragmentation_probability_curve`, unpacked as `(probabilities, n)` like the tuples returned before.
+
+    Parameters
+    ----------
+    fragmentations : List[float]
+        The values of the `fragmentation` setting
+    counts : List[int]
+        The number of fragmented graphs at every value
+    iterations : int
+        The number of simulations
+    seeds : List[int] | None, optional
+        The seeds of the random streams of the simulations, see `ProbabilityResult`
+    settings : Dict | None, optional
+        The other settings of the fragmentation method
+    elapsed : float, optional
+        The wall time of the estimation, in seconds
+
+    Attributes
+    ----------
+    probabilities : List[float]
+        The estimated fragmentation probability at every value
+    """
+
+    def __new__(
+        cls,
+        fragmentations: List[float],
+        counts: List[int],
+        iterations: int,
+        seeds: List[int] | None = None,
+        settings: Dict | None = None,
+        elapsed: float = 0.0,
+    ):
+        if iterations > 0:
+            probabilities = [c / iterations for c in counts]
+        else:
+            probabilities = [0.0] * len(counts)
+        self = super().__new__(cls, (probabilities, iterations))
+        self.fragmentations = list(fragmentations)
+        self.counts = list(counts)
+        self.iterations = iterations
+        self.probabilities = probabilities
+        self.seeds = list(seeds or [])
+        self.settings = settings
+        self.elapsed = elapsed
+        return self
+
+    def __getnewargs__(self):
+        return (
+            self.fragmentations,
+            self.counts,
+            self.iterations,
+            self.seeds,
+            self.settings,
+            self.elapsed,
+        )
+
+    def get_confidence_intervals(self, z: float = _Z) -> List[Tuple[float, float]]:
+        """
+        Compute the Wilson score interval of the estimated probability at every value, see `get_confidence_interval`.
+        """
+        return [get_confidence_interval(c, self.iterations, z) for c in self.counts]
+
+    def merge(self, *others: "CurveResult") -> "CurveResult":
+        """
+        Combine independent curves with the same values and settings into one.
+
+        Raises
+        ------
+        ValueError
+            If the values or the settings of the results differ or if they share seeds
+        """
+        results = [self, *others]
+        _check_settings(results)
+        for result in others:
+            if result.fragmentations != self.fragmentations:
+                raise ValueError(
+                    "cannot merge curves computed at different fragmentations"
+                )
+        return CurveResult(
+            self.fragmentations,
+            [sum(counts) for counts in zip(*(r.counts for r in results))],
+            sum(r.iterations for r in results),
+            _merge_seeds(results),
+            self.settings,
+            sum(r.elapsed for r in results),
+        )
+
+
+class DistributionResult(list):
+    """
+    Result of `get_fragment_size_distribution` and `get_hole_size_distribution`, a list of the normalized values like the lists returned before.
+
+    Parameters
+    ----------
+    counts : List[int]
+        The number of fragments, or of holes, of every size
+    iterations : int
+        The number of simulations
+    seeds : List[int] | None, optional
+        The seeds of the random streams of the simulations, see `ProbabilityResult`
+    settings : Dict | None, optional
+        The settings of the fragmentation method
+    elapsed : float, optional
+        The wall time of the estimation, in seconds
+    """
+
+    def __init__(
+        self,
+        counts: List[int],
+        iterations: int,
+        seeds: List[int] | None = None,
+        settings: Dict | None = None,
+        elapsed: float = 0.0,
+    ):
+        super().__init__(c / iterations if iterations > 0 else 0 for c in counts)
+        self.counts = list(counts)
+        self.iterations = iterations
+        self.seeds = list(seeds or [])
+        self.settings = settings
+        self.elapsed = elapsed
+
+    def merge(self, *others: "DistributionResult") -> "DistributionResult":
+        """
+        Combine independent distributions with the same settings into one, the counts of the shorter ones being padded with zeros.
+
+        Raises
+        ------
+        ValueError
+            If the settings of the results differ or if they share seeds
+        """
+        results = [self, *others]
+        _check_settings(results)
+        counts = [0] * max(len(r.counts) for r in results)
+        for result in results:
+            for i, c in enumerate(result.counts):
+                counts[i] += c
+        return DistributionResult(
+            counts,
+            sum(r.iterations for r in results),
+            _merge_seeds(results),
+            self.settings,
+            sum(r.elapsed for r in results),
+        )
@@ -0,0 +1,245 @@
+import random
+from math import log, sqrt
+from typing import Callable, Collection, Dict, List, Tuple
+import networkx as nx
+from .compact import (
+    CompactGraph,
+    _ProbabilityProcess,
+    _StrengthEdgesProcess,
+    _StrengthNodesProcess,
+)
+from .fragment import (
+    probability_fragment,
+    strength_edges_fragment,
+    strength_nodes_fragment,
+)
+from .analyse import get_hole_size
+from .importance import _get_mask_cuts, _get_min_node_cuts
+from .view import MaskedGraph
+
+
+def _create_process(cg: CompactGraph, fragment, fragment_settings: Dict):
+    """
+    Create the step by step removal process of a built-in fragmentation method.
+    """
+    if fragment is probability_fragment:
+        return _ProbabilityProcess(
+            cg,
+            fragment_settings["fragmentation"],
+            fragment_settings["fragmentation_type"],
+        )
+    elif fragment is strength_edges_fragment:
+        return _StrengthEdgesProcess(cg, fragment_settings["fragmentation"])
+    elif fragment is strength_nodes_fragment:
+        return _StrengthNodesProcess(cg, fragment_settings["fragmentation"])
+    raise ValueError(
+        "multilevel splitting requires one of the built-in fragmentation methods"
+    )
+
+
+def _get_cluster_cut(
+    cg: CompactGraph, cluster: List[int], fragmentation_type: str
+) -> List[int]:
+    """
+    The mask indices of the elements isolating a set of nodes: the edges leaving it, or its neighbours for node removal.
+    """
+    inside = set(cluster)
+    res = set()
+    for v in cluster:
+        for w, e in cg.adjacency[v]:
+            if w not in inside:
+                res.add(cg.n + e if fragmentation_type == "edges" else w)
+    return sorted(res)
+
+
+def _get_default_cuts(
+    G: nx.Graph, cg: CompactGraph, fragmentation_type: str, isolate_nodes: bool = True
+) -> List[List[int]]:
+    """
+    The sets of elements isolating each node and each pair of adjacent nodes, and the minimum node cuts of the graph when they are smaller than the degrees and the connectivity is known exactly, as mask indices.
+    """
+    cuts = []
+    if isolate_nodes:
+        cuts += [_get_cluster_cut(cg, [v], fragmentation_type) for v in range(cg.n)]
+    cuts += [
+        _get_cluster_cut(cg, [a, b], fragmentation_type) for a, b in cg.edges.tolist()
+    ]
+    cuts += _get_min_node_cuts(G, cg, fragmentation_type)
+    # The same cut may isolate several sets
+    return [list(c) for c in set(tuple(c) for c in cuts if len(c) > 0)]
+
+
+def _get_cuts_level(cuts: List[List[int]], process) -> float:
+    """
+    Progress towards the removal of a whole cut: 1 minus the smallest number of elements of a cut that remain and can still be removed by the process, relative to the size of the largest cut, 0 if no cut can be completed.
+    The mean removed fraction of the cuts is added with a small weight to break the ties between states.
+    """
+    mask = process.mask
+    largest = max(len(cut) for cut in cuts)
+    needed = largest + 1
+    mean = 0.0
+    for cut in cuts:
+        remaining = [i for i in cut if not mask[i]]
+        mean += 1 - len(remaining) / len(cut)
+        if len(remaining) < needed and process.is_feasible(remaining):
+            needed = len(remaining)
+    return 1 - needed / (largest + 1) + 1e-3 * mean / len(cuts)
+
+
+def _get_hole_level(view: MaskedGraph, mask: bytearray, G: nx.Graph) -> float:
+    """
+    Size of the hole of the fragmented graph, see `get_hole_size`, relative to the number of nodes.
+    """
+    return get_hole_size(view(mask), G) / max(len(G.nodes), 1)
+
+
+def _get_level(cg: CompactGraph, process, level: Callable) -> float:
+    """
+    Level of the state of a removal process: at least 1 if the graph is fragmented, in which case the fraction of the remaining nodes outside the largest component is added, otherwise the progress given by `level` capped below 1.
+    """
+    mask = process.mask
+    if cg.is_fragmented(mask):
+        remaining = cg.n - mask.count(1, 0, cg.n)
+        return 1 + (remaining - cg.get_largest_component_size(mask)) / remaining
+    return min(level(process), 1 - 1e-9)
+
+
+def _run_trajectory(process, level, actions: List, levels: List[float]) -> None:
+    """
+    Run a removal process until it is finished, recording its removals and the level after each of them.
+    """
+    while True:
+        action = process.step()
+        if action is None:
+            return
+        actions.append(action)
+        if isinstance(action, tuple) and not action[1]:
+            # Element kept by `probability_fragment`, the state is unchanged
+            levels.append(levels[-1])
+        else:
+            levels.append(level(process))
+
+
+def get_fragmentation_probability_splitting(
+    G: nx.Graph,
+    fragment: Callable[[nx.Graph, Dict], nx.Graph],
+    fragment_settings: Dict,
+    particles: int = 100,
+    killed: int = 10,
+    level: str | Callable[[nx.Graph, nx.Graph], float] = "cuts",
+    cuts: List[Collection] | None = None,
+    max_iterations: int = 100000,
+) -> Tuple[float, float, int]:
+    """
+    Estimate a very small fragmentation probability by adaptive multilevel splitting.
+
+    A set of particles, runs of the removal process of a built-in fragmentation method, is evolved: at every iteration the particles whose highest level is among the `killed` lowest are discarded, and replaced by copies of other particles which are continued with new random removals from the point where they first exceeded that level.
+    The probability is the product of the fractions of particles kept at every iteration times the fraction of final particles that are fragmented.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to fragment
+    fragment : Callable[[nx.Graph, Dict], nx.Graph]
+        The fragmentation method, `probability_fragment`, `strength_edges_fragment` or `strength_nodes_fragment`. The strength methods need the `strength` attributes, see `init_nodes_strength`
+    fragment_settings : Dict
+        The settings of the fragmentation method
+    particles : int, optional
+        The number of particles
+    killed : int, optional
+        The number of particles discarded at each iteration, more when several particles have the same level
+    level : str | Callable[[nx.Graph, nx.Graph], float], optional
+        The function measuring the progress of a non fragmented removal state towards fragmentation, with values in [0,1).\n
+        `"cuts"` is the largest fraction of a cut of the graph that has been removed, among `cuts`.\n
+        `"hole"` is the size of the hole given by `get_hole_size`, relative to the number of nodes.\n
+        A callable takes a read-only view of the fragmented graph and the original graph.\n
+        Fragmented states have a level of 1 plus the fraction of the remaining nodes outside the largest component
+    cuts : List[Collection] | None, optional
+        The cuts of the `"cuts"` level, sets of nodes, or sets of edges for the edge removal methods.
+        By default the sets isolating each node (its edges, or its neighbours for node removal), and the minimum node cuts if they are smaller, see `get_fragmentation_probability_importance_sampling`
+    max_iterations : int, optional
+        The maximum number of iterations, the estimate is 0 if the fragmented states are not reached
+
+    Returns
+    -------
+    Tuple[float, float, int]
+        The estimated fragmentation probability, an approximation of its relative standard error, sqrt(-log(p) * killed / particles), and the number of iterations
+
+    Notes
+    -----
+    The estimate is unbiased for any level function; a level function that increases steadily on the way to fragmentation reduces its variance.
+    """
+    cg = CompactGraph(G)
+    cg.compute_cuts()
+    if level == "cuts":
+        fragmentation_type = (
+            fragment_settings["fragmentation_type"]
+            if fragment is probability_fragment
+            else "edges" if fragment is strength_edges_fragment else "nodes"
+        )
+        if cuts is None:
+            # Nodes cut from the graph by `strength_nodes_fragment` are removed with their last neighbour, which never fragments the graph
+            cuts = _get_default_cuts(
+                G,
+                cg,
+                fragmentation_type,
+                isolate_nodes=fragment is not strength_nodes_fragment,
+            )
+        else:
+            cuts = _get_mask_cuts(G, cg, cuts, fragmentation_type)
+        progress = lambda process: _get_cuts_level(cuts, process)
+    elif level == "hole":
+        view = MaskedGraph(G)
+        progress = lambda process: _get_hole_level(view, process.mask, G)
+    elif callable(level):
+        view = MaskedGraph(G)
+        progress = lambda process: level(view(process.mask), G)
+    else:
+        raise ValueError(
+            "level must be 'cuts', 'hole' or a callable, got %r" % level
+        )
+    get_level = lambda process: _get_level(cg, process, progress)
+
+    trajectories = []
+    for _ in range(particles):
+        actions = []
+        process = _create_process(cg, fragment, fragment_settings)
+        levels = [get_level(process)]
+        _run_trajectory(process, get_level, actions, levels)
+        trajectories.append((actions, levels))
+
+    pfrag = 1.0
+    iterations = 0
+    while iterations < max_iterations:
+        maxima = sorted(max(levels) for _, levels in trajectories)
+        threshold = maxima[min(killed, particles) - 1]
+        if threshold >= 1:
+            # The remaining particles have all been fragmented
+            break
+        survivors = [t for t in trajectories if max(t[1]) > threshold]
+        if len(survivors) == 0:
+            # No particle goes beyond the level
+            return 0.0, float("inf"), iterations
+        iterations += 1
+        pfrag *= len(survivors) / particles
+        new_trajectories = list(survivors)
+        for _ in range(particles - len(survivors)):
+            actions, levels = random.choice(survivors)
+            # Replay the removals up to the first one exceeding the level and continue with new random draws
+            t = next(i for i, l in enumerate(levels) if l > threshold)
+            process = _create_process(cg, fragment, fragment_settings)
+            for action in actions[:t]:
+                process.apply(action)
+            cloned_actions = actions[:t]
+            cloned_levels = levels[: t + 1]
+            _run_trajectory(process, get_level, cloned_actions, cloned_levels)
+            new_trajectories.append((cloned_actions, cloned_levels))
+        trajectories = new_trajectories
+
+    # The last level of a particle is the level of its final state
+    fragmented = sum(1 for _, levels in trajectories if levels[-1] >= 1)
+    pfrag *= fragmented / particles
+    if pfrag == 0:
+        return 0.0, float("inf"), iterations
+    relative_error = sqrt(max(-log(pfrag), 0) * killed / particles)
+    return pfrag, relative_error, iterations
@@ -0,0 +1,82 @@
+from typing import Callable
+import networkx as nx
+
+
+class MaskedGraph:
+    """
+    Read-only view of a graph without the nodes and edges removed by a removal mask, see `capsidgraph.analyser.compact.CompactGraph`.
+
+    The view is created once and reads the current mask, so a new mask only costs an assignment: nothing is copied and no graph is built per simulation.
+    Like `nx.restricted_view`, the view shares the attributes of the original graph and cannot be modified, use `copy` to get a mutable graph.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The original graph
+
+    Attributes
+    ----------
+    view : nx.Graph
+        The frozen subgraph view of the remaining nodes and edges
+    mask : bytearray
+        The current removal mask
+    """
+
+    def __init__(self, G: nx.Graph):
+        self.G = G
+        n = len(G.nodes)
+        self._node_index = {v: i for i, v in enumerate(G.nodes)}
+        self._edge_index = {}
+        for j, (a, b) in enumerate(G.edges):
+            self._edge_index[(a, b)] = n + j
+            self._edge_index[(b, a)] = n + j
+        self.mask = bytearray(n + len(G.edges))
+        self._create_view()
+
+    def _create_view(self):
+        self.view = nx.subgraph_view(
+            self.G, filter_node=self._filter_node, filter_edge=self._filter_edge
+        )
+
+    def _filter_node(self, v) -> bool:
+        return not self.mask[self._node_index[v]]
+
+    def _filter_edge(self, a, b) -> bool:
+        return not self.mask[self._edge_index[(a, b)]]
+
+    def __call__(self, mask: bytearray) -> nx.Graph:
+        """
+        Return the view of the graph once the elements of a removal mask are removed, valid until the next call.
+        """
+        self.mask = mask
+        return self.view
+
+    def __getstate__(self):
+        # The view holds references to the bound filters and is rebuilt after unpickling
+        state = self.__dict__.copy()
+        del state["view"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._create_view()
+
+
+def requires_copy(
+    is_fragmented: Callable[[nx.Graph], bool]
+) -> Callable[[nx.Graph], bool]:
+    """
+    Mark a fragmentation test that modifies the graph it receives, so that it is given a mutable copy of the fragmented graph instead of a read-only view.
+
+    Parameters
+    ----------
+    is_fragmented : Callable[[nx.Graph], bool]
+        The fragmentation test
+
+    Returns
+    -------
+    Callable[[nx.Graph], bool]
+        The same function, with its `requires_copy` attribute set
+    """
+    is_fragmented.requires_copy = True
+    return is_fragmented
@@ -0,0 +1,24 @@
+import argparse
+from .distributed import run_worker
+
+# Command line entry of the workers of a `Coordinator`:
+# python -m capsidgraph.analyser.worker HOST PORT --authkey KEY
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the work units of a capsidgraph coordinator"
+    )
+    parser.add_argument("host", help="Host of the coordinator")
+    parser.add_argument("port", type=int, help="Port of the coordinator")
+    parser.add_argument(
+        "--authkey",
+        required=True,
+        help="Authentication key of the coordinator, as printed by coordinator.authkey.decode()",
+    )
+    args = parser.parse_args()
+    run_worker((args.host, args.port), args.authkey.encode())
+
+
+if __name__ == "__main__":
+    main()
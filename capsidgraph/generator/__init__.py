@@ -15,13 +15,34 @@ from .merger import merge_faces, _create_face_graph
 from .exceptions import GraphCreationException
 
 from .texture.icosahedral import create_texture as create_icosahedral_texture
+from .texture.icosahedral import render_texture as render_icosahedral_texture
+from .texture.icosahedral import create_svg_texture as create_icosahedral_svg_texture
+from .texture.cubic import render_texture as render_cubic_texture
+from .texture.cubic import create_svg_texture as create_cubic_svg_texture
+
+from .cache import (
+    get_icosahedral_capsid,
+    get_cubic_capsid,
+    clear_cache,
+    set_cache_size,
+    get_icosahedral_face,
+)
+
+from .family import (
+    generate_icosahedral_family,
+    get_caspar_klug_numbers,
+    load_capsid,
+)
+
+from .texture.atlas import create_texture_atlas
 
 
 def create_icosahedral_capsid_graph(
     face_edges: List[Edge],
     triangle_vertices: Tuple[Point, Point, Point],
     bond_strength: List[float] | None = None,
-) -> nx.Graph:
+    return_coordinates: bool = False,
+) -> nx.Graph | Tuple[nx.Graph, Dict[int, List[Tuple[int, float, float]]]]:
     if bond_strength != None and 0 in bond_strength:
         raise GraphCreationException("Bond cannot have 0 strength")
     G = nx.Graph()
@@ -85,6 +106,8 @@ def create_icosahedral_capsid_graph(
             2,
             i % 2 == 0,
         )
+    if return_coordinates:
+        return G, coordinates
     return G
 
 
@@ -92,7 +115,8 @@ def create_cubic_capsid_graph(
     face_edges: List[Edge],
     square_vertices: Tuple[Point, Point, Point, Point],
     bond_strength: List[float] | None = None,
-) -> nx.Graph:
+    return_coordinates: bool = False,
+) -> nx.Graph | Tuple[nx.Graph, Dict[int, List[Tuple[int, float, float]]]]:
     if bond_strength != None and 0 in bond_strength:
         raise GraphCreationException("Bond cannot have 0 strength")
     G = nx.Graph()
@@ -127,4 +151,6 @@ def create_cubic_capsid_graph(
         G, coordinates, _rotate_cubic_point, square_vertices, 5, 3, 0, False
     )
 
+    if return_coordinates:
+        return G, coordinates
     return G
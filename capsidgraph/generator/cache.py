@@ -0,0 +1,287 @@
+import os
+import hashlib
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+import networkx as nx
+import numpy as np
+from capsidgraph.util.types import Edge, Point
+from capsidgraph.util.arrays import (
+    edges_to_array,
+    array_to_edges,
+    graph_to_arrays,
+    arrays_to_graph,
+)
+
+# Version of the layout of the cached arrays, change it to invalidate existing on-disk caches
+_CACHE_VERSION = 1
+
+# In memory cache, maps keys to the arrays describing the generated capsid
+_memory_cache: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+_memory_cache_size = 128
+
+
+def set_cache_size(size: int) -> None:
+    """
+    Set the maximum number of generated capsids kept in memory.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of entries of the in-memory cache, 0 disables it.
+    """
+    global _memory_cache_size
+    _memory_cache_size = size
+    while len(_memory_cache) > _memory_cache_size:
+        _memory_cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """
+    Remove all the generated capsids kept in memory. On-disk caches are left untouched.
+    """
+    _memory_cache.clear()
+
+
+def _get_key(*parts) -> str:
+    """
+    Compute the cache key of a capsid from the data used to generate it.
+    """
+    return hashlib.sha256(repr((_CACHE_VERSION,) + parts).encode()).hexdigest()
+
+
+def _get_pattern_content(pattern) -> Tuple:
+    """
+    Return the part of a pattern that determines the tiling, in a hashable form.
+    """
+    edges, Tx, Ty = pattern[:3]
+    return (tuple(edges), tuple(Tx), tuple(Ty))
+
+
+def _find_arrays(key: str, cache_dir: str | None) -> Dict[str, np.ndarray] | None:
+    """
+    Get the arrays of a capsid from the in-memory cache or the on-disk cache, without building them.
+    """
+    if key in _memory_cache:
+        return _memory_cache[key]
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, key + ".npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+    return None
+
+
+def _save_arrays(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Save arrays to a `.npz` file through a temporary file of the same directory, so that concurrent workers never read a partial file. The temporary file is removed if the saving fails.
+    """
+    f = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), suffix=".npz", delete=False
+    )
+    try:
+        with f:
+            np.savez(f, **arrays)
+        os.replace(f.name, path)
+    except BaseException:
+        if os.path.exists(f.name):
+            os.remove(f.name)
+        raise
+
+
+def _get_arrays(
+    key: str,
+    build: Callable[[], Dict[str, np.ndarray]],
+    cache_dir: str | None,
+) -> Dict[str, np.ndarray]:
+    """
+    Get the arrays of a capsid from the in-memory cache, then from the on-disk cache, and build them if they are in neither.
+    """
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+    arrays = _find_arrays(key, cache_dir)
+    if arrays is None:
+        arrays = build()
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, key + ".npz")
+            os.makedirs(cache_dir, exist_ok=True)
+            _save_arrays(path, arrays)
+    if _memory_cache_size > 0:
+        _memory_cache[key] = arrays
+        if len(_memory_cache) > _memory_cache_size:
+            _memory_cache.popitem(last=False)
+    return arrays
+
+
+def _capsid_to_arrays(
+    G: nx.Graph, face_edges: List[Edge], face_vertices: Tuple[Point, ...]
+) -> Dict[str, np.ndarray]:
+    """
+    Convert a generated capsid into the arrays stored in the cache.
+    """
+    arrays = {
+        "graph_" + name: array for name, array in graph_to_arrays(G).items()
+    }
+    arrays["face_edges"] = edges_to_array(face_edges)
+    arrays["face_vertices"] = np.asarray(face_vertices)
+    return arrays
+
+
+def _arrays_to_capsid(
+    arrays: Dict[str, np.ndarray]
+) -> Tuple[nx.Graph, List[Edge], Tuple[Point, ...]]:
+    """
+    Convert the arrays stored in the cache back into a capsid.
+    """
+    G = arrays_to_graph(
+        {
+            name[len("graph_") :]: array
+            for name, array in arrays.items()
+            if name.startswith("graph_")
+        }
+    )
+    face_edges = array_to_edges(arrays["face_edges"])
+    face_vertices = tuple(tuple(P) for P in arrays["face_vertices"].tolist())
+    return G, face_edges, face_vertices
+
+
+def _get_icosahedral_key(
+    pattern: List, h: int, k: int, bond_strength: List[float] | None = None
+) -> str:
+    """
+    Compute the cache key of an icosahedral capsid.
+    """
+    return _get_key(
+        "icosahedral",
+        _get_pattern_content(pattern),
+        h,
+        k,
+        None if bond_strength is None else tuple(bond_strength),
+    )
+
+
+def get_icosahedral_face(
+    pattern: List, h: int, k: int, cache_dir: str | None = None
+) -> Tuple[List[Edge], Tuple[Point, Point, Point]]:
+    """
+    Get the edges of the triangular face of an icosahedral capsid, reusing the capsids generated previously.
+
+    Parameters
+    ----------
+    pattern : List
+        The pattern used to tile the faces, in the format of `icosahedral_patterns`
+    h : int
+        The h Caspar Klug constant
+    k : int
+        The k Caspar Klug constant
+    cache_dir : str | None, optional
+        Directory in which generated capsids are stored, see `get_icosahedral_capsid`
+
+    Returns
+    -------
+    Tuple[List[Edge], Tuple[Point, Point, Point]]
+        The edges of the face and the vertices of the face, as returned by `create_icosahedral_face_edges`
+
+    Notes
+    -----
+    If the capsid is not in the cache, only the face is computed and nothing is added to the cache.
+    """
+    from . import create_icosahedral_face_edges
+
+    arrays = _find_arrays(_get_icosahedral_key(pattern, h, k), cache_dir)
+    if arrays is None:
+        edges, Tx, Ty = pattern[:3]
+        return create_icosahedral_face_edges(edges, Tx, Ty, h, k)
+    face_edges = array_to_edges(arrays["face_edges"])
+    face_vertices = tuple(tuple(P) for P in arrays["face_vertices"].tolist())
+    return face_edges, face_vertices
+
+
+def get_icosahedral_capsid(
+    pattern: List,
+    h: int,
+    k: int,
+    bond_strength: List[float] | None = None,
+    cache_dir: str | None = None,
+) -> Tuple[nx.Graph, List[Edge], Tuple[Point, Point, Point]]:
+    """
+    Generate an icosahedral capsid graph from a pattern, reusing previously generated capsids.
+
+    Parameters
+    ----------
+    pattern : List
+        The pattern used to tile the faces, in the format of `icosahedral_patterns`
+    h : int
+        The h Caspar Klug constant
+    k : int
+        The k Caspar Klug constant
+    bond_strength : List[float] | None, optional
+        The strength of the edges of the face, see `create_icosahedral_capsid_graph`
+    cache_dir : str | None, optional
+        Directory in which generated capsids are stored, to be reused by other processes. By default capsids are only kept in memory.
+
+    Returns
+    -------
+    Tuple[nx.Graph, List[Edge], Tuple[Point, Point, Point]]
+        The capsid graph, the edges of its triangular face and the vertices of the triangular face, as returned by `create_icosahedral_face_edges`
+
+    Notes
+    -----
+    Capsids are identified by the content of the pattern, (h,k) and the bond strength.
+    A new graph is returned on every call so it can safely be modified.
+    """
+    from . import create_icosahedral_face_edges, create_icosahedral_capsid_graph
+
+    def build():
+        edges, Tx, Ty = pattern[:3]
+        face_edges, triangle = create_icosahedral_face_edges(edges, Tx, Ty, h, k)
+        G = create_icosahedral_capsid_graph(face_edges, triangle, bond_strength)
+        return _capsid_to_arrays(G, face_edges, triangle)
+
+    key = _get_icosahedral_key(pattern, h, k, bond_strength)
+    return _arrays_to_capsid(_get_arrays(key, build, cache_dir))
+
+
+def get_cubic_capsid(
+    pattern: List,
+    bond_strength: List[float] | None = None,
+    cache_dir: str | None = None,
+) -> Tuple[nx.Graph, List[Edge], Tuple[Point, Point, Point, Point]]:
+    """
+    Generate a cubic capsid graph from a pattern, reusing previously generated capsids.
+
+    Parameters
+    ----------
+    pattern : List
+        The pattern used to tile the faces, in the format of `cubic_patterns`
+    bond_strength : List[float] | None, optional
+        The strength of the edges of the face, see `create_cubic_capsid_graph`
+    cache_dir : str | None, optional
+        Directory in which generated capsids are stored, to be reused by other processes. By default capsids are only kept in memory.
+
+    Returns
+    -------
+    Tuple[nx.Graph, List[Edge], Tuple[Point, Point, Point, Point]]
+        The capsid graph, the edges of its square face and the vertices of the square face, as returned by `create_cubic_face_edges`
+
+    Notes
+    -----
+    Capsids are identified by the content of the pattern, including the side of the square face, and the bond strength.
+    A new graph is returned on every call so it can safely be modified.
+    """
+    from . import create_cubic_face_edges, create_cubic_capsid_graph
+
+    def build():
+        edges, Tx, Ty, face_edge = pattern[:4]
+        face_edges, square = create_cubic_face_edges(edges, Tx, Ty, face_edge)
+        G = create_cubic_capsid_graph(face_edges, square, bond_strength)
+        return _capsid_to_arrays(G, face_edges, square)
+
+    key = _get_key(
+        "cubic",
+        _get_pattern_content(pattern),
+        tuple(pattern[3]),
+        None if bond_strength is None else tuple(bond_strength),
+    )
+    return _arrays_to_capsid(_get_arrays(key, build, cache_dir))
@@ -1,7 +1,7 @@
 from capsidgraph.util.types import Point, Vector2D, Edge
 from typing import Tuple, List
 from math import sqrt
-from .util import extend, is_under_line
+from .util import extend, clip, is_under_line, tile_polygon, is_exact_tiling
 
 SQ3 = sqrt(3)
 
@@ -110,17 +110,21 @@ def extract_square(edges: List[Point], square_edge: Vector2D):
     -------
     List[Point]
         The list of edges of the square face
+
+    Notes
+    -----
+    All the extremities are located at once with `clip`.
     """
-    res = []
-    A, B, C, D = create_square(square_edge)
-    for P1, P2 in edges:
-        if is_in_square(P1, A, B, C, D) + is_in_square(P2, A, B, C, D) >= 0:
-            res.append((P1, P2))
-    return res
+    return clip(edges, create_square(square_edge))
 
 
 def create_face_edges(
-    edges: List[Point], Tx: Vector2D, Ty: Vector2D, face_edge: Vector2D, repeat: int=1
+    edges: List[Point],
+    Tx: Vector2D,
+    Ty: Vector2D,
+    face_edge: Vector2D,
+    repeat: int = 1,
+    extend_order: bool = True,
 ) -> Tuple[List[Edge], Tuple[Point, Point, Point, Point]]:
     """
     Create the edges of the square face from a tiling pattern and a corner of the square face to use as the face of the cube.
@@ -136,20 +140,33 @@ def create_face_edges(
     face_edge : Vector2D
         The vector representing one of the edges of the square face
     repeat : int, optional
-        The number of times to repeat the pattern, by default 10. Ensure that the pattern is large enough to cover the square face.
+        The number of times to repeat the pattern, by default 1. Ensure that the pattern is large enough to cover the square face.
+    extend_order : bool, optional
+        Whether the edges keep the order and multiplicity of the tiling built with `extend`, on which the indices of the bond strengths rely, True by default
 
     Returns
     -------
     Tuple[List[Edge], Tuple[Point, Point, Point, Point]]
         The list of edges of the square face and the four vertices of the square face
-    """
 
-    for i in range(repeat):
-        edges = extend(edges, Tx)
-        edges = extend(edges, (-Tx[0], -Tx[1]))
-    for i in range(repeat):
-        edges = extend(edges, Ty)
-        edges = extend(edges, (-Ty[0], -Ty[1]))
+    Notes
+    -----
+    As for the icosahedral faces, only the translates of the pattern intersecting the face are enumerated when the pattern has integer coordinates or when `extend_order` is False, see `tile_polygon`.
+    Without `extend_order`, `repeat` is unused and the whole face is covered.
+    """
+    square = create_square(face_edge)
+    if is_exact_tiling(edges, Tx, Ty):
+        # Each repetition extends the tiling twice in each direction
+        edges = tile_polygon(edges, Tx, Ty, square, 2 * repeat)
+    elif extend_order:
+        for i in range(repeat):
+            edges = extend(edges, Tx)
+            edges = extend(edges, (-Tx[0], -Tx[1]))
+        for i in range(repeat):
+            edges = extend(edges, Ty)
+            edges = extend(edges, (-Ty[0], -Ty[1]))
+    else:
+        edges = tile_polygon(edges, Tx, Ty, square)
 
     edges = extract_square(edges, face_edge)
-    return edges, create_square(face_edge)
+    return edges, square
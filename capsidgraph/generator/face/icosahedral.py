@@ -1,7 +1,16 @@
 from typing import Dict, List, Tuple
 import networkx as nx
 from capsidgraph.util.types import Edge, Point, Vector2D
-from capsidgraph.generator.face.util import is_under_line, extend
+from capsidgraph.generator.face.util import (
+    is_under_line,
+    tile,
+    tile_polygon,
+    is_exact_tiling,
+    clip,
+)
+
+# Distance under which a point of the tiling is on a side of the face, to absorb the floating point errors of the translations
+eps = 1e-9
 
 
 def rotate_point(P: Point, A: Point, cockwise: bool) -> Point:
@@ -126,17 +135,18 @@ def extract_triangle(
     Notes
     -----
     This returns all the segments of the tiling that have either : at least one extremity inside of the triangle or both extremities on the edge of the triangle.
+    All the extremities are located at once with `clip`, the points closer than `eps` to a side being on it.
     """
-    res = []
-    A, B, C = create_triangle(h, k, Tx, Ty)
-    for P1, P2 in edges:
-        if is_in_triangle(P1, A, B, C) + is_in_triangle(P2, A, B, C) >= 0:
-            res.append((P1, P2))
-    return res
+    return clip(edges, create_triangle(h, k, Tx, Ty), eps)
 
 
 def create_face_edges(
-    edges: List[Edge], Tx: Vector2D, Ty: Vector2D, h: int, k: int
+    edges: List[Edge],
+    Tx: Vector2D,
+    Ty: Vector2D,
+    h: int,
+    k: int,
+    extend_order: bool = True,
 ) -> Tuple[List[Edge], Tuple[Point, Point, Point]]:
     """
     Create the edges of the triangular face of a capsid, given a tiling pattern and the Caspar Klug constants.
@@ -153,17 +163,28 @@ def create_face_edges(
         The h Caspar Klug constant
     k : int
         The k Caspar Klug constant
+    extend_order : bool, optional
+        Whether the edges keep the order and multiplicity of the tiling built with `extend`, on which the indices of the bond strengths rely, True by default
 
     Returns
     -------
     Tuple[List[Edge], Tuple[Point, Point, Point]]
         The edges of the triangular face of the capsid, in the "hexagonal" basis, and the coordinates of the vertices of the triangular face
+
+    Notes
+    -----
+    Only the translates of the pattern intersecting the face are enumerated (see `tile_polygon`) when the pattern has integer coordinates, the result being the same as with `extend`.
+    For floating point patterns the repeated translations of `extend` create near duplicated edges, so the whole tiling is built unless `extend_order` is False.
+    In that case each translate intersecting the face appears once, and the face is covered whatever h and k.
     """
-    # Create a large enough tiling
-    for i in range(h + k):
-        edges = extend(edges, Tx)
-    for i in range(h + k):
-        edges = extend(edges, Ty)
+    triangle = create_triangle(h, k, Tx, Ty)
+    if is_exact_tiling(edges, Tx, Ty):
+        edges = tile_polygon(edges, Tx, Ty, triangle, h + k, eps)
+    elif extend_order:
+        # Create a large enough tiling
+        edges = tile(edges, Tx, Ty, h + k)
+    else:
+        edges = tile_polygon(edges, Tx, Ty, triangle, eps=eps)
 
     edges = extract_triangle(edges, h, k, Tx, Ty)
-    return edges, create_triangle(h, k, Tx, Ty)
+    return edges, triangle
@@ -1,6 +1,8 @@
 from capsidgraph.util.types import Edge, Point, Vector2D
 from typing import Dict, List, Tuple
+from math import floor, ceil
 import networkx as nx
+import numpy as np
 
 
 def extend(edges: List[Edge], T: Vector2D) -> List[Edge]:
@@ -19,14 +21,16 @@ def extend(edges: List[Edge], T: Vector2D) -> List[Edge]:
     List[Edge]
         The list of translated edges
     """
+    # Set of the edges for constant time lookups, the result is the same as when searching the list
+    existing = set(edges)
     res = []
     for (x1, y1), (x2, y2) in edges:
         V1 = ((x1 + T[0], y1 + T[1]), (x2 + T[0], y2 + T[1]))
         V2 = ((x1 - T[0], y1 - T[1]), (x2 - T[0], y2 - T[1]))
         res.append(((x1, y1), (x2, y2)))
-        if V1 not in edges:
+        if V1 not in existing:
             res.append(V1)
-        if V2 not in edges:
+        if V2 not in existing:
             res.append(V2)
     return res
 
@@ -55,3 +59,321 @@ def is_under_line(P: Point, A: Point, B: Point) -> int:
     if (P[0] - A[0]) * (B[1] - A[1]) == (P[1] - A[1]) * (B[0] - A[0]):
         return 0
     return -1
+
+
+def tile(edges: List[Edge], Tx: Vector2D, Ty: Vector2D, repeat: int) -> List[Edge]:
+    """
+    Tile the plane with a pattern by extending it `repeat` times by Tx, then `repeat` times by Ty.
+
+    Parameters
+    ----------
+    edges : List[Edge]
+        The edges of the pattern to repeat
+    Tx : Vector2D
+        The first translation vector of the tiling
+    Ty : Vector2D
+        The second translation vector of the tiling
+    repeat : int
+        The number of calls to `extend` in each direction
+
+    Returns
+    -------
+    List[Edge]
+        The edges of the tiling, in the order and with the multiplicity given by `extend`
+    """
+    for i in range(repeat):
+        edges = extend(edges, Tx)
+    for i in range(repeat):
+        edges = extend(edges, Ty)
+    return edges
+
+
+def _translation_order(i: int) -> Tuple[bool, int]:
+    """
+    Sort key reproducing the order in which repeated calls to `extend` visit the translations of a pattern: 0, 1, 2, ..., -1, -2, ...
+    """
+    return (i < 0, abs(i))
+
+
+def _cell_intersects_polygon(
+    xmin: float, ymin: float, xmax: float, ymax: float, polygon: Tuple[Point, ...]
+) -> bool:
+    """
+    Determine whether the axis aligned box [xmin,xmax]x[ymin,ymax] intersects the convex polygon.
+    The vertices of the polygon must be ordered such that its inside is "under" each of its sides (see `is_under_line`).
+    """
+    if (
+        xmax < min(P[0] for P in polygon)
+        or xmin > max(P[0] for P in polygon)
+        or ymax < min(P[1] for P in polygon)
+        or ymin > max(P[1] for P in polygon)
+    ):
+        return False
+    corners = [(xmin, ymin), (xmin, ymax), (xmax, ymin), (xmax, ymax)]
+    for s in range(len(polygon)):
+        A = polygon[s]
+        B = polygon[(s + 1) % len(polygon)]
+        # The polygon is convex, if all the corners of the box are above one of its sides, they do not intersect
+        if all(is_under_line(P, A, B) == -1 for P in corners):
+            return False
+    return True
+
+
+def _get_lattice_offset(
+    e: Edge, f: Edge, Tx: Vector2D, Ty: Vector2D
+) -> Tuple[int, int] | None:
+    """
+    Return (u, v) if the edge f is the edge e translated by u*Tx + v*Ty, None otherwise.
+    """
+    ((x1, y1), (x2, y2)), ((x3, y3), _) = e, f
+    det = Tx[0] * Ty[1] - Tx[1] * Ty[0]
+    u = round(((x3 - x1) * Ty[1] - (y3 - y1) * Ty[0]) / det)
+    v = round((Tx[0] * (y3 - y1) - Tx[1] * (x3 - x1)) / det)
+    T = (u * Tx[0] + v * Ty[0], u * Tx[1] + v * Ty[1])
+    if ((x1 + T[0], y1 + T[1]), (x2 + T[0], y2 + T[1])) == f:
+        return u, v
+    return None
+
+
+def _get_extent(offsets: List[int], sign: int, repeat: int) -> int:
+    """
+    Return the number of translations of an edge by `sign` times a translation vector created by `repeat` calls to `extend`.
+    `offsets` are the positions along the vector of the translates of the edge already in the tiling: the translation by j is not created if one of them lies between -j+1 and j-1 translations away, and neither are the next ones.
+    """
+    for j in range(1, repeat + 1):
+        if any(abs(sign * j - w) <= j - 1 for w in offsets):
+            return j - 1
+    return repeat
+
+
+def is_exact_tiling(edges: List[Edge], Tx: Vector2D, Ty: Vector2D) -> bool:
+    """
+    Determine whether the translations of a pattern by `extend` are exact.
+
+    Parameters
+    ----------
+    edges : List[Edge]
+        The edges of the pattern
+    Tx : Vector2D
+        The first translation vector of the tiling
+    Ty : Vector2D
+        The second translation vector of the tiling
+
+    Returns
+    -------
+    bool
+        True if all the coordinates are integers and Tx and Ty are independent
+
+    Notes
+    -----
+    In that case the edges of `tile` are determined by their lattice coordinates, and `tile_polygon` reproduces them.
+    Otherwise the repeated floating point translations create near duplicated edges whose number depends on the rounding errors.
+    """
+    values = [c for edge in edges for P in edge for c in P] + list(Tx) + list(Ty)
+    if not all(float(c).is_integer() for c in values):
+        return False
+    return Tx[0] * Ty[1] - Tx[1] * Ty[0] != 0
+
+
+def tile_polygon(
+    edges: List[Edge],
+    Tx: Vector2D,
+    Ty: Vector2D,
+    polygon: Tuple[Point, ...],
+    repeat: int | None = None,
+    eps: float = 0.0,
+) -> List[Edge]:
+    """
+    Tile the plane with a pattern, keeping only the copies of the pattern that intersect a convex polygon.
+
+    Parameters
+    ----------
+    edges : List[Edge]
+        The edges of the pattern to repeat
+    Tx : Vector2D
+        The first translation vector of the tiling
+    Ty : Vector2D
+        The second translation vector of the tiling
+    polygon : Tuple[Point, ...]
+        The vertices of the convex polygon to cover, ordered such that its inside is "under" each of its sides (see `is_under_line`)
+    repeat : int | None, optional
+        If given, the edges of `tile(edges, Tx, Ty, repeat)` are enumerated, in the same order and with the same multiplicity
+    eps : float, optional
+        The distance under which a point is considered on a side of the polygon, see `clip`, by default 0
+
+    Returns
+    -------
+    List[Edge]
+        The edges of the translated copies of the pattern whose bounding box intersects the polygon, without duplicates if `repeat` is not given
+
+    Notes
+    -----
+    Only the lattice translations i*Tx + j*Ty whose pattern cell can intersect the polygon are enumerated,
+    so the size of the tiling grows with the area of the polygon instead of the square of its perimeter as with `tile`.
+    Edges are grouped by edge of the pattern, then ordered by i then j in the order 0, 1, 2, ..., -1, -2, ... of `extend`.
+    With `repeat`, the translates of `extend` falling on an edge already in the tiling are skipped as well, so that if `is_exact_tiling` holds,
+    `clip(tile_polygon(edges, Tx, Ty, polygon, repeat, eps), polygon, eps)` is equal to `clip(tile(edges, Tx, Ty, repeat), polygon, eps)`.
+    The near duplicated edges of floating point patterns are not reproduced.
+    """
+    points = [P for edge in edges for P in edge]
+    # Enlarge the cell by the points within eps of a side, which `clip` keeps
+    xmin = min(P[0] for P in points) - 2 * eps
+    xmax = max(P[0] for P in points) + 2 * eps
+    ymin = min(P[1] for P in points) - 2 * eps
+    ymax = max(P[1] for P in points) + 2 * eps
+
+    # Express the polygon and the corners of the pattern cell in the basis (Tx, Ty)
+    det = Tx[0] * Ty[1] - Tx[1] * Ty[0]
+
+    def lattice_coordinates(P: Point) -> Tuple[float, float]:
+        return (
+            (P[0] * Ty[1] - P[1] * Ty[0]) / det,
+            (Tx[0] * P[1] - Tx[1] * P[0]) / det,
+        )
+
+    polygon_coordinates = [lattice_coordinates(P) for P in polygon]
+    cell_coordinates = [
+        lattice_coordinates(P)
+        for P in [(xmin, ymin), (xmin, ymax), (xmax, ymin), (xmax, ymax)]
+    ]
+    # Range of translations for which the cell and the polygon can overlap
+    i_min = floor(
+        min(a for a, b in polygon_coordinates) - max(a for a, b in cell_coordinates)
+    )
+    i_max = ceil(
+        max(a for a, b in polygon_coordinates) - min(a for a, b in cell_coordinates)
+    )
+    j_min = floor(
+        min(b for a, b in polygon_coordinates) - max(b for a, b in cell_coordinates)
+    )
+    j_max = ceil(
+        max(b for a, b in polygon_coordinates) - min(b for a, b in cell_coordinates)
+    )
+    if repeat is not None:
+        i_min, j_min = max(i_min, -repeat), max(j_min, -repeat)
+        i_max, j_max = min(i_max, repeat), min(j_max, repeat)
+
+    translations = []
+    for i in sorted(range(i_min, i_max + 1), key=_translation_order):
+        for j in sorted(range(j_min, j_max + 1), key=_translation_order):
+            T = (i * Tx[0] + j * Ty[0], i * Tx[1] + j * Ty[1])
+            if _cell_intersects_polygon(
+                xmin + T[0], ymin + T[1], xmax + T[0], ymax + T[1], polygon
+            ):
+                translations.append((i, j))
+
+    res = []
+    seen = set()
+    for p, edge in enumerate(edges):
+        if repeat is not None:
+            # Translations of the edge onto the other edges of the pattern, `extend` does not create the translates falling on an edge of the tiling
+            offsets = [
+                _get_lattice_offset(edge, f, Tx, Ty)
+                for q, f in enumerate(edges)
+                if q != p
+            ]
+            offsets = [offset for offset in offsets if offset is not None]
+            x_offsets = [u for u, v in offsets if v == 0]
+            i_range = (
+                -_get_extent(x_offsets, -1, repeat),
+                _get_extent(x_offsets, 1, repeat),
+            )
+            j_ranges = {}
+        for i, j in translations:
+            if repeat is not None:
+                if not i_range[0] <= i <= i_range[1]:
+                    continue
+                if i not in j_ranges:
+                    y_offsets = [v for u, v in offsets if abs(i - u) <= repeat]
+                    j_ranges[i] = (
+                        -_get_extent(y_offsets, -1, repeat),
+                        _get_extent(y_offsets, 1, repeat),
+                    )
+                if not j_ranges[i][0] <= j <= j_ranges[i][1]:
+                    continue
+            # Translate like `extend`, so that the untranslated coordinates keep their type
+            ((x1, y1), (x2, y2)) = edge
+            if i != 0:
+                x1, y1 = x1 + i * Tx[0], y1 + i * Tx[1]
+                x2, y2 = x2 + i * Tx[0], y2 + i * Tx[1]
+            if j != 0:
+                x1, y1 = x1 + j * Ty[0], y1 + j * Ty[1]
+                x2, y2 = x2 + j * Ty[0], y2 + j * Ty[1]
+            translate = ((x1, y1), (x2, y2))
+            if repeat is None:
+                if translate in seen:
+                    continue
+                seen.add(translate)
+            res.append(translate)
+    return res
+
+
+def get_points_position(
+    points: np.ndarray, polygon: Tuple[Point, ...], eps: float = 0.0
+) -> np.ndarray:
+    """
+    Return where are the points relative to a convex polygon, all points and sides of the polygon are evaluated at once.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n, 2) containing the points to locate
+    polygon : Tuple[Point, ...]
+        The vertices of the convex polygon, ordered such that its inside is "under" each of its sides (see `is_under_line`)
+    eps : float, optional
+        The distance under which a point is considered on a side, by default 0
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n,) containing for each point -1 if it is outside the polygon, 0 if it is on one of its sides, 1 if it is inside the polygon
+
+    Notes
+    -----
+    If the coordinates of the points and of the polygon are all integers, the computation is done with exact integer arithmetic.
+    Otherwise the same floating point comparisons as `is_under_line` are used, up to `eps`.
+    """
+    A = np.asarray(polygon)
+    B = np.roll(A, -1, axis=0)
+    # Compare (P-A)x(B-A) and (P-A)y(B-A) for every point P (rows) and side AB (columns)
+    left = (points[:, 0, None] - A[None, :, 0]) * (B[None, :, 1] - A[None, :, 1])
+    right = (points[:, 1, None] - A[None, :, 1]) * (B[None, :, 0] - A[None, :, 0])
+    if eps > 0:
+        # The difference is the distance of P to (AB) times the length of AB
+        length = np.hypot(B[:, 0] - A[:, 0], B[:, 1] - A[:, 1])
+        on_side = np.abs(left - right) <= eps * length[None, :]
+    else:
+        on_side = left == right
+    position = np.where(on_side, 0, np.where(left > right, 1, -1))
+    return position.min(axis=1)
+
+
+def clip(
+    edges: List[Edge], polygon: Tuple[Point, ...], eps: float = 0.0
+) -> List[Edge]:
+    """
+    Extract the edges belonging to a convex polygon.
+
+    Parameters
+    ----------
+    edges : List[Edge]
+        The edges to clip
+    polygon : Tuple[Point, ...]
+        The vertices of the convex polygon, ordered such that its inside is "under" each of its sides (see `is_under_line`)
+    eps : float, optional
+        The distance under which an extremity is considered on a side, see `get_points_position`
+
+    Returns
+    -------
+    List[Edge]
+        The edges that have either at least one extremity inside of the polygon, or both extremities on its sides
+
+    Notes
+    -----
+    All the extremities of the edges are located at once with `get_points_position`.
+    """
+    if len(edges) == 0:
+        return []
+    points = np.asarray(edges).reshape(-1, 2)
+    position = get_points_position(points, polygon, eps).reshape(-1, 2)
+    return [edges[i] for i in np.flatnonzero(position.sum(axis=1) >= 0)]
@@ -0,0 +1,183 @@
+import os
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Tuple
+import networkx as nx
+import numpy as np
+from capsidgraph.util.types import Edge, Vector2D
+from .face.icosahedral import create_triangle, eps
+from .face.util import tile, clip
+from .cache import _capsid_to_arrays, _arrays_to_capsid, _save_arrays
+
+
+def get_caspar_klug_numbers(max_T: int) -> List[Tuple[int, int]]:
+    """
+    List the Caspar Klug constants (h,k) with h >= 1, k >= 0 and a triangulation number T = h^2 + hk + k^2 of at most max_T.
+
+    Parameters
+    ----------
+    max_T : int
+        The maximum triangulation number
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The (h,k) pairs sorted by increasing triangulation number. Both chiral forms (h,k) and (k,h) are listed.
+    """
+    res = []
+    h = 1
+    while h * h <= max_T:
+        k = 0
+        while h * h + h * k + k * k <= max_T:
+            res.append((h, k))
+            k += 1
+        h += 1
+    return sorted(res, key=lambda hk: (hk[0] ** 2 + hk[0] * hk[1] + hk[1] ** 2, hk))
+
+
+def _create_family_tiling(
+    edges: List[Edge], Tx: Vector2D, Ty: Vector2D, hk: List[Tuple[int, int]]
+) -> List[Edge]:
+    """
+    Create a single tiling covering the triangular faces of every (h,k) of the family.
+    """
+    # create_icosahedral_face_edges extends the pattern h+k times for each face
+    return tile(edges, Tx, Ty, max(h + k for h, k in hk))
+
+
+def _init_family_worker(tiling: List[Edge], Tx: Vector2D, Ty: Vector2D):
+    """
+    This function is called by a multiprocessing.Pool to share the tiling with every worker
+
+    Parameters
+    ----------
+    tiling : List[Edge]
+        The tiling covering all the faces of the family
+    Tx : Vector2D
+        The first translation vector of the tiling
+    Ty : Vector2D
+        The second translation vector of the tiling
+
+    Returns
+    -------
+    None
+    """
+    global family_tiling, family_Tx, family_Ty
+    family_tiling = tiling
+    family_Tx = Tx
+    family_Ty = Ty
+
+
+def _generate_family_member(
+    hk: Tuple[int, int], output_dir: str | None
+) -> Tuple[Tuple[int, int], Dict[str, np.ndarray] | str]:
+    """
+    Generate the capsid of the family with the given (h,k) from the shared tiling.
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], Dict[str, np.ndarray] | str]
+        (h,k) and either the arrays describing the capsid or the path of the file in which they were saved if `output_dir` is given.
+    """
+    from . import create_icosahedral_capsid_graph
+
+    h, k = hk
+    triangle = create_triangle(h, k, family_Tx, family_Ty)
+    face_edges = clip(family_tiling, triangle, eps)
+    G = create_icosahedral_capsid_graph(face_edges, triangle)
+    arrays = _capsid_to_arrays(G, face_edges, triangle)
+    if output_dir is None:
+        return hk, arrays
+    path = os.path.join(output_dir, "h%d_k%d.npz" % (h, k))
+    _save_arrays(path, arrays)
+    return hk, path
+
+
+def _generate_family_member_star(args):
+    """
+    Unpack the arguments of `_generate_family_member`, for `Pool.imap_unordered`
+    """
+    return _generate_family_member(*args)
+
+
+def generate_icosahedral_family(
+    pattern: List,
+    hk: int | List[Tuple[int, int]],
+    process_number: int = 1,
+    as_arrays: bool = False,
+    output_dir: str | None = None,
+) -> Iterator[Tuple[Tuple[int, int], nx.Graph | Dict[str, np.ndarray] | str]]:
+    """
+    Generate the icosahedral capsids of a pattern for many values of (h,k), using multiple processes.
+
+    Parameters
+    ----------
+    pattern : List
+        The pattern used to tile the faces, in the format of `icosahedral_patterns`
+    hk : int | List[Tuple[int, int]]
+        The list of (h,k) Caspar Klug constants to generate. If an int is given, every (h,k) with a triangulation number up to this value is generated (see `get_caspar_klug_numbers`)
+    process_number : int, optional
+        The number of processes used to generate the capsids
+    as_arrays : bool, optional
+        Whether to yield the arrays describing the capsids (see `capsidgraph.util.arrays.graph_to_arrays`) instead of networkx graphs
+    output_dir : str | None, optional
+        If given, each capsid is saved in this directory as `h{h}_k{k}.npz` as soon as it is generated, and the path of the file is yielded. The files can be read with `load_capsid`.
+
+    Yields
+    ------
+    Tuple[Tuple[int, int], nx.Graph | Dict[str, np.ndarray] | str]
+        (h,k) and the corresponding capsid graph, arrays or file path, in the order in which they are generated
+
+    Notes
+    -----
+    A single tiling covering every face of the family is computed once and shared with all the workers, each of them only clips its face out of it.
+    """
+    if type(hk) == int:
+        hk = get_caspar_klug_numbers(hk)
+    edges, Tx, Ty = pattern[:3]
+    tiling = _create_family_tiling(edges, Tx, Ty, hk)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    if process_number == 1:
+        _init_family_worker(tiling, Tx, Ty)
+        results = (_generate_family_member(x, output_dir) for x in hk)
+        pool = None
+    else:
+        pool = Pool(
+            process_number,
+            initializer=_init_family_worker,
+            initargs=(tiling, Tx, Ty),
+        )
+        # Largest capsids first so that they do not end up running alone at the end
+        ordered = sorted(hk, key=lambda x: -(x[0] ** 2 + x[0] * x[1] + x[1] ** 2))
+        results = pool.imap_unordered(
+            _generate_family_member_star, [(x, output_dir) for x in ordered]
+        )
+    try:
+        for x, res in results:
+            if output_dir is not None or as_arrays:
+                yield x, res
+            else:
+                yield x, _arrays_to_capsid(res)[0]
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def load_capsid(path: str) -> Tuple[nx.Graph, List[Edge], Tuple]:
+    """
+    Load a capsid saved by `generate_icosahedral_family`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file
+
+    Returns
+    -------
+    Tuple[nx.Graph, List[Edge], Tuple]
+        The capsid graph, the edges of its face and the vertices of its face
+    """
+    with np.load(path) as data:
+        return _arrays_to_capsid({name: data[name] for name in data.files})
@@ -140,7 +140,9 @@ def merge_faces(
                 rid = _get_point_id(
                     coordinates, rx, ry, face_id=id2
                 )  # Search for points in "id2" that would have the coordinate of this rotated point
-                if rid != -1 and rid not in nodes_to_remove:  # We found a point
+                # We found a point, that is not the point itself: the center of the rotation is its own image,
+                # merging it with itself would remove it from the coordinate dict
+                if rid != -1 and rid != id and rid not in nodes_to_remove:
                     # Merge the points in the networkx graph as well as in the coordinate dict
                     coordinates[id] += coordinates[rid]
                     G_ = nx.contracted_nodes(G_, id, rid)
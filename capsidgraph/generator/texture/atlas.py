@@ -0,0 +1,210 @@
+import os
+import json
+from math import ceil, sqrt
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+import numpy as np
+from PIL import Image
+from ..face.patterns import icosahedral_patterns
+from ..cache import get_icosahedral_face
+from .icosahedral import render_face
+
+# Name of the index file written in the output directory
+ATLAS_INDEX = "index.json"
+# Name of the packed image written in the output directory
+ATLAS_IMAGE = "atlas.png"
+
+
+def get_icosahedral_patterns() -> Dict[str, List]:
+    """
+    List all the patterns defined in `icosahedral_patterns`.
+
+    Returns
+    -------
+    Dict[str, List]
+        The patterns indexed by their name, e.g. `PATTERN_6434`
+    """
+    return {
+        name: getattr(icosahedral_patterns, name)
+        for name in dir(icosahedral_patterns)
+        if name.startswith("PATTERN_")
+    }
+
+
+def _pack_tiles(
+    sizes: List[Tuple[int, int]]
+) -> Tuple[List[Tuple[int, int]], int, int]:
+    """
+    Place rectangles of the given sizes on shelves of a roughly square image.
+
+    Returns
+    -------
+    Tuple[List[Tuple[int, int]], int, int]
+        The position of the top left corner of every rectangle, the width and the height of the image
+    """
+    if len(sizes) == 0:
+        return [], 0, 0
+    area = sum(w * h for w, h in sizes)
+    width = max(max(w for w, _ in sizes), int(ceil(sqrt(area))))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    # Tallest rectangles first so that each shelf wastes little space
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if x + w > width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, width, y + shelf_height
+
+
+def _init_atlas_worker(
+    patterns: Dict[str, List],
+    lineWidth: float,
+    lineColor: Tuple[int, int, int],
+    scale: float,
+    cache_dir: str | None,
+):
+    """
+    This function is called by a multiprocessing.Pool to share the rendering settings with every worker
+
+    Returns
+    -------
+    None
+    """
+    global atlas_patterns, atlas_lineWidth, atlas_lineColor, atlas_scale, atlas_cache_dir
+    atlas_patterns = patterns
+    atlas_lineWidth = lineWidth
+    atlas_lineColor = lineColor
+    atlas_scale = scale
+    atlas_cache_dir = cache_dir
+
+
+def _render_atlas_texture(
+    args: Tuple[str, int, int, str | None]
+) -> Tuple[str, int, int, np.ndarray | str, Tuple[int, int]]:
+    """
+    Render the texture of a pattern for a given (h,k).
+
+    Returns
+    -------
+    Tuple[str, int, int, np.ndarray | str, Tuple[int, int]]
+        The name of the pattern, h, k, either the pixels of the image or the name of the file it was saved in if a directory is given, and the size of the image
+    """
+    name, h, k, output_dir = args
+    face_edges, triangle = get_icosahedral_face(
+        atlas_patterns[name], h, k, atlas_cache_dir
+    )
+    im = render_face(
+        face_edges, triangle, atlas_lineWidth, atlas_lineColor, atlas_scale
+    )
+    if output_dir is None:
+        return name, h, k, np.asarray(im), im.size
+    filename = "%s_h%d_k%d.png" % (name, h, k)
+    im.save(os.path.join(output_dir, filename))
+    return name, h, k, filename, im.size
+
+
+def create_texture_atlas(
+    output_dir: str,
+    hk: List[Tuple[int, int]],
+    patterns: Dict[str, List] | None = None,
+    packed: bool = True,
+    process_number: int = 1,
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 100,
+    cache_dir: str | None = None,
+) -> Dict:
+    """
+    Render the textures of many patterns and (h,k) in parallel, into a single packed image or a directory of images.
+
+    Parameters
+    ----------
+    output_dir : str
+        The directory in which the images and the index file `index.json` are written
+    hk : List[Tuple[int, int]]
+        The (h,k) Caspar Klug constants to render for every pattern
+    patterns : Dict[str, List] | None, optional
+        The patterns to render indexed by their name, by default every pattern of `icosahedral_patterns`
+    packed : bool, optional
+        If True all the textures are packed into the single image `atlas.png`, otherwise each texture is saved in its own file `{pattern}_h{h}_k{k}.png`
+    process_number : int, optional
+        The number of processes used to render the textures
+    lineWidth : float, optional
+        The width of the lines in pixels
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+    cache_dir : str | None, optional
+        Directory of the capsid cache, see `get_icosahedral_capsid`. The face edges of the capsids already generated are read from it instead of being computed again.
+
+    Returns
+    -------
+    Dict
+        The content of the index file. Its `textures` entry lists, for every texture, the name of the pattern, h, k, its width and height, and either its position `x`, `y` in the packed image or the name of its `file`.
+    """
+    if patterns is None:
+        patterns = get_icosahedral_patterns()
+    os.makedirs(output_dir, exist_ok=True)
+    tile_dir = None if packed else output_dir
+    textures = [(name, h, k) for name in patterns for h, k in hk]
+    # Largest textures first so that they do not end up running alone at the end
+    tasks = sorted(
+        (t + (tile_dir,) for t in textures),
+        key=lambda t: -(t[1] ** 2 + t[1] * t[2] + t[2] ** 2),
+    )
+
+    if process_number == 1:
+        _init_atlas_worker(patterns, lineWidth, lineColor, scale, cache_dir)
+        results = [_render_atlas_texture(t) for t in tasks]
+    else:
+        with Pool(
+            process_number,
+            initializer=_init_atlas_worker,
+            initargs=(patterns, lineWidth, lineColor, scale, cache_dir),
+        ) as p:
+            results = p.map(_render_atlas_texture, tasks, chunksize=1)
+    # Same order as the arguments, whatever the order of rendering
+    order = {t: i for i, t in enumerate(textures)}
+    results.sort(key=lambda r: order[r[:3]])
+
+    index = {"scale": scale, "line_width": lineWidth, "textures": []}
+    if packed:
+        positions, width, height = _pack_tiles([r[4] for r in results])
+        atlas = np.full((height, width, 4), 255, dtype=np.uint8)
+        for (name, h, k, pixels, (w, hh)), (x, y) in zip(results, positions):
+            atlas[y : y + hh, x : x + w] = pixels
+            index["textures"].append(
+                {
+                    "pattern": name,
+                    "h": h,
+                    "k": k,
+                    "x": x,
+                    "y": y,
+                    "width": w,
+                    "height": hh,
+                }
+            )
+        Image.fromarray(atlas, "RGBA").save(os.path.join(output_dir, ATLAS_IMAGE))
+        index["image"] = ATLAS_IMAGE
+        index["width"] = width
+        index["height"] = height
+    else:
+        for name, h, k, filename, (w, hh) in results:
+            index["textures"].append(
+                {
+                    "pattern": name,
+                    "h": h,
+                    "k": k,
+                    "file": filename,
+                    "width": w,
+                    "height": hh,
+                }
+            )
+    with open(os.path.join(output_dir, ATLAS_INDEX), "w") as f:
+        json.dump(index, f, indent=2)
+    return index
@@ -0,0 +1,150 @@
+from ..face.cubic import create_face_edges
+from .render import (
+    transform_segments,
+    rasterize_segments,
+    coverage_to_image,
+    segments_to_svg,
+    get_image_size,
+)
+from capsidgraph.util.arrays import edges_to_array
+from capsidgraph.util.types import Point, Vector2D, Edge
+from PIL import Image
+from typing import List, Tuple
+import numpy as np
+
+
+def get_texture_geometry(
+    face_edges: List[Edge],
+    square: Tuple[Point, Point, Point, Point],
+    scale: float = 500,
+) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+    """
+    Convert the edges of a square face into segments in the pixel coordinates of its texture.
+
+    Parameters
+    ----------
+    face_edges : List[Edge]
+        The edges of the face in carthesian coordinates, as returned by `create_face_edges`
+    square : Tuple[Point, Point, Point, Point]
+        The vertices A, B, C, D of the face, as returned by `create_square`
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, Tuple[int, int]]
+        The segments as an array of shape (n, 2, 2), the vertices of the face as an array of shape (4, 2) and the size of the texture.
+        The vertex A of the face is at the origin, the vertex B right below it and the vertex D on its right.
+
+    Notes
+    -----
+    The rotation and the scaling are done with a single matrix product.
+    """
+    A, B, C, D = square
+    (x, y) = np.asarray(B, dtype=float) - np.asarray(A, dtype=float)
+    # Rotation sending AB onto the vertical axis and AD onto the horizontal axis
+    matrix = scale * np.array([[y, -x], [x, y]]) / np.hypot(x, y)
+    offset = -(matrix @ np.asarray(A, dtype=float))
+    segments = transform_segments(edges_to_array(face_edges), matrix, offset)
+    vertices = transform_segments(np.asarray(square, dtype=float), matrix, offset)
+    return segments, vertices, get_image_size(vertices)
+
+
+def render_face(
+    face_edges: List[Edge],
+    square: Tuple[Point, Point, Point, Point],
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> Image:
+    """
+    Create the antialiased image of a square face from its edges.
+
+    Parameters
+    ----------
+    face_edges : List[Edge]
+        The edges of the face in carthesian coordinates, as returned by `create_face_edges`
+    square : Tuple[Point, Point, Point, Point]
+        The vertices of the face
+    lineWidth : float, optional
+        The width of the lines in pixels
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Image
+        The RGBA image of the face, see `render_texture`
+    """
+    segments, vertices, (width, height) = get_texture_geometry(
+        face_edges, square, scale
+    )
+    coverage = rasterize_segments(segments, width, height, lineWidth, vertices)
+    return coverage_to_image(coverage, lineColor)
+
+
+def render_texture(
+    pattern: Tuple[List[Edge], Vector2D, Vector2D, Vector2D],
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> Image:
+    """
+    Create the antialiased image of a square face of a cubic capsid.
+
+    Parameters
+    ----------
+    pattern : Tuple[List[Edge], Vector2D, Vector2D, Vector2D]
+        The pattern used to tile the face, in the format of `cubic_patterns`
+    lineWidth : float, optional
+        The width of the lines in pixels
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Image
+        The RGBA image of the face, lines are clipped to the face
+    """
+    [edges, Tx, Ty, face_edge] = pattern[:4]
+    face_edges, square = create_face_edges(edges, Tx, Ty, face_edge)
+    return render_face(face_edges, square, lineWidth, lineColor, scale)
+
+
+def create_svg_texture(
+    pattern: Tuple[List[Edge], Vector2D, Vector2D, Vector2D],
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> str:
+    """
+    Create the vector image of a square face of a cubic capsid.
+
+    Parameters
+    ----------
+    pattern : Tuple[List[Edge], Vector2D, Vector2D, Vector2D]
+        The pattern used to tile the face, in the format of `cubic_patterns`
+    lineWidth : float, optional
+        The width of the lines
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    str
+        The content of the SVG file, the lines are clipped to the face
+    """
+    [edges, Tx, Ty, face_edge] = pattern[:4]
+    face_edges, square = create_face_edges(edges, Tx, Ty, face_edge)
+    segments, vertices, (width, height) = get_texture_geometry(
+        face_edges, square, scale
+    )
+    return segments_to_svg(
+        segments, width, height, lineWidth, lineColor, polygon=vertices
+    )
@@ -1,8 +1,18 @@
 from ..face.icosahedral import create_triangle, extract_triangle
+from ..face.icosahedral import create_face_edges
 from ..face.util import extend
+from .render import (
+    transform_segments,
+    rasterize_segments,
+    coverage_to_image,
+    segments_to_svg,
+    get_image_size,
+)
+from capsidgraph.util.arrays import edges_to_array
 from math import sqrt, cos, sin, atan2
 from PIL import Image, ImageDraw
 from typing import List, Tuple
+import numpy as np
 
 Point = Tuple[float, float]
 Edge = Tuple[Point, Point]
@@ -66,3 +76,155 @@ def create_texture(
     draw.polygon([(0, 0), (width, height / 2), (width, 0)], (255, 255, 255))
     draw.polygon([(0, height), (width, height / 2), (width, height)], (255, 255, 255))
     return im
+
+
+def get_texture_geometry(
+    face_edges: List[Edge], triangle: Tuple[Point, Point, Point], scale: float = 500
+) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+    """
+    Convert the edges of a triangular face into segments in the pixel coordinates of its texture.
+
+    Parameters
+    ----------
+    face_edges : List[Edge]
+        The edges of the face in the "hexagonal" basis, as returned by `create_face_edges`
+    triangle : Tuple[Point, Point, Point]
+        The vertices of the face in the "hexagonal" basis
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, Tuple[int, int]]
+        The segments as an array of shape (n, 2, 2), the vertices of the face as an array of shape (3, 2) and the size of the texture.
+        The vertex A of the face is at the origin and the vertex B right below it.
+
+    Notes
+    -----
+    The conversion into carthesian coordinates, the rotation and the scaling are done with a single matrix product.
+    """
+    A, B, C = triangle
+    carthesian = np.array([[1, 1 / 2], [0, sqrt(3) / 2]])
+    # Angle by which we need to rotate the image to get the right orientation
+    theta = atan2(*(carthesian @ np.asarray(B, dtype=float)))
+    rotation = np.array([[cos(theta), -sin(theta)], [sin(theta), cos(theta)]])
+    matrix = scale * rotation @ carthesian
+    segments = transform_segments(edges_to_array(face_edges), matrix)
+    vertices = transform_segments(np.asarray(triangle, dtype=float), matrix)
+    return segments, vertices, get_image_size(vertices)
+
+
+def render_texture(
+    pattern: Tuple[List[Edge], Point, Point, int],
+    h: int,
+    k: int,
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> Image:
+    """
+    Create the antialiased image of an icosahedral face of the capsid.
+
+    Parameters
+    ----------
+    pattern : Tuple[List[Edge], Point, Point, int]
+        The pattern used to tile the face, in the format of `icosahedral_patterns`
+    h : int
+        The h Caspar Klug constant
+    k : int
+        The k Caspar Klug constant
+    lineWidth : float, optional
+        The width of the lines in pixels
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Image
+        The RGBA image of the face, the pixels outside of the face are white
+
+    Notes
+    -----
+    Unlike `create_texture`, all the segments are transformed with a single matrix product and rasterized together with numpy.
+    """
+    [edges, Tx, Ty] = pattern[:3]
+    face_edges, triangle = create_face_edges(edges, Tx, Ty, h, k)
+    return render_face(face_edges, triangle, lineWidth, lineColor, scale)
+
+
+def render_face(
+    face_edges: List[Edge],
+    triangle: Tuple[Point, Point, Point],
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> Image:
+    """
+    Create the antialiased image of a triangular face from its edges.
+
+    Parameters
+    ----------
+    face_edges : List[Edge]
+        The edges of the face in the "hexagonal" basis, as returned by `create_face_edges`
+    triangle : Tuple[Point, Point, Point]
+        The vertices of the face in the "hexagonal" basis
+    lineWidth : float, optional
+        The width of the lines in pixels
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length in pixels of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    Image
+        The RGBA image of the face, see `render_texture`
+    """
+    segments, vertices, (width, height) = get_texture_geometry(
+        face_edges, triangle, scale
+    )
+    coverage = rasterize_segments(segments, width, height, lineWidth, vertices)
+    return coverage_to_image(coverage, lineColor)
+
+
+def create_svg_texture(
+    pattern: Tuple[List[Edge], Point, Point, int],
+    h: int,
+    k: int,
+    lineWidth: float = 10,
+    lineColor: Tuple[int, int, int] = (0, 0, 0),
+    scale: float = 500,
+) -> str:
+    """
+    Create the vector image of an icosahedral face of the capsid.
+
+    Parameters
+    ----------
+    pattern : Tuple[List[Edge], Point, Point, int]
+        The pattern used to tile the face, in the format of `icosahedral_patterns`
+    h : int
+        The h Caspar Klug constant
+    k : int
+        The k Caspar Klug constant
+    lineWidth : float, optional
+        The width of the lines
+    lineColor : Tuple[int, int, int], optional
+        The color of the lines
+    scale : float, optional
+        The length of a unit vector of the carthesian basis
+
+    Returns
+    -------
+    str
+        The content of the SVG file, the lines are clipped to the face
+    """
+    [edges, Tx, Ty] = pattern[:3]
+    face_edges, triangle = create_face_edges(edges, Tx, Ty, h, k)
+    segments, vertices, (width, height) = get_texture_geometry(
+        face_edges, triangle, scale
+    )
+    return segments_to_svg(
+        segments, width, height, lineWidth, lineColor, polygon=vertices
+    )
@@ -0,0 +1,295 @@
+from math import ceil
+from typing import Tuple
+import numpy as np
+from PIL import Image
+
+# Maximum number of candidate pixels evaluated at once when rasterizing segments
+_CHUNK_SIZE = 1 << 22
+
+
+def transform_segments(
+    segments: np.ndarray, matrix: np.ndarray, offset: Tuple[float, float] = (0, 0)
+) -> np.ndarray:
+    """
+    Apply the same linear transformation and translation to every extremity of a set of segments.
+
+    Parameters
+    ----------
+    segments : np.ndarray
+        Array of shape (n, 2, 2) containing the coordinates of the extremities of the segments
+    matrix : np.ndarray
+        The 2x2 matrix of the linear transformation
+    offset : Tuple[float, float], optional
+        The translation applied after the linear transformation
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n, 2, 2) containing the transformed segments
+    """
+    return np.asarray(segments, dtype=float) @ np.asarray(matrix).T + np.asarray(
+        offset, dtype=float
+    )
+
+
+def get_polygon_coverage(
+    polygon: np.ndarray, px: np.ndarray, py: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the fraction of some pixels covered by a convex polygon, with antialiased sides.
+
+    Parameters
+    ----------
+    polygon : np.ndarray
+        Array of shape (p, 2) containing the vertices of the convex polygon in pixel coordinates, in any orientation
+    px : np.ndarray
+        The x indices of the pixels
+    py : np.ndarray
+        The y indices of the pixels
+
+    Returns
+    -------
+    np.ndarray
+        The coverage of each pixel, between 0 and 1
+    """
+    polygon = np.asarray(polygon, dtype=float)
+    A = polygon
+    B = np.roll(polygon, -1, axis=0)
+    d = B - A
+    # Orientation of the polygon, so that the signed distances are positive inside
+    area = np.sum(A[:, 0] * B[:, 1] - A[:, 1] * B[:, 0])
+    sign = 1 if area > 0 else -1
+    x = px + 0.5
+    y = py + 0.5
+    coverage = np.ones(np.shape(px))
+    for (ax, ay), (dx, dy) in zip(A, d):
+        length = np.hypot(dx, dy)
+        if length == 0:
+            continue
+        distance = sign * (dx * (y - ay) - dy * (x - ax)) / length
+        np.minimum(coverage, np.clip(distance + 0.5, 0, 1), out=coverage)
+    return coverage
+
+
+def rasterize_segments(
+    segments: np.ndarray,
+    width: int,
+    height: int,
+    line_width: float,
+    polygon: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Compute the fraction of each pixel of an image covered by thick, antialiased segments with round caps.
+
+    Parameters
+    ----------
+    segments : np.ndarray
+        Array of shape (n, 2, 2) containing the extremities of the segments in pixel coordinates
+    width : int
+        The width of the image
+    height : int
+        The height of the image
+    line_width : float
+        The width of the segments in pixels
+    polygon : np.ndarray | None, optional
+        If given, the vertices of a convex polygon the segments are clipped to
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (height, width) with values between 0 and 1
+
+    Notes
+    -----
+    Every segment is walked along its major axis, one pixel at a time, and only a narrow window of pixels across the segment is evaluated.
+    The candidate pixels of all the segments are generated and evaluated together with array operations, and the coverage of overlapping segments is combined with a maximum.
+    """
+    coverage = np.zeros(width * height, dtype=np.float32)
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    if len(segments) == 0:
+        return coverage.reshape(height, width)
+    P = segments[:, 0]
+    Q = segments[:, 1]
+    d = Q - P
+    length = np.hypot(d[:, 0], d[:, 1])
+    # Axis along which the segment is walked
+    major = (np.abs(d[:, 1]) > np.abs(d[:, 0])).astype(int)
+    minor = 1 - major
+    rows = np.arange(len(segments))
+    d_major = d[rows, major]
+    d_minor = d[rows, minor]
+    slope = np.divide(d_minor, d_major, out=np.zeros_like(d_minor), where=d_major != 0)
+    cos = np.divide(
+        np.abs(d_major), length, out=np.ones_like(length), where=length != 0
+    )
+    radius = line_width / 2 + 1
+    size = np.where(major == 0, width, height)
+    lower = np.maximum(np.floor(np.minimum(P[rows, major], Q[rows, major]) - radius), 0)
+    upper = np.minimum(
+        np.ceil(np.maximum(P[rows, major], Q[rows, major]) + radius), size - 1
+    )
+    steps = np.maximum(upper - lower + 1, 0).astype(np.int64)
+    half_window = np.ceil(radius / cos).astype(np.int64) + 1
+    window = 2 * half_window + 1
+    counts = steps * window
+
+    # Split the segments into chunks of bounded number of candidate pixels
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(segments):
+        stop = int(np.searchsorted(ends, ends[start] - counts[start] + _CHUNK_SIZE, side="right"))
+        stop = max(stop, start + 1)
+        chunk = np.arange(start, stop)
+        start = stop
+        chunk_counts = counts[chunk]
+        total = int(chunk_counts.sum())
+        if total == 0:
+            continue
+        # Ragged enumeration of (segment, step, offset) triples
+        s = np.repeat(chunk, chunk_counts)
+        local = np.arange(total) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        t = lower[s] + local // window[s]
+        offset = local % window[s] - half_window[s]
+        center_major = t + 0.5
+        center_minor = P[s, minor[s]] + (center_major - P[s, major[s]]) * slope[s]
+        u = np.floor(center_minor) + offset
+        # Back to x, y pixel indices
+        px = np.where(major[s] == 0, t, u)
+        py = np.where(major[s] == 0, u, t)
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        s, px, py = s[inside], px[inside], py[inside]
+        # Distance from the center of the pixel to the segment
+        wx = px + 0.5 - P[s, 0]
+        wy = py + 0.5 - P[s, 1]
+        l2 = length[s] ** 2
+        projection = np.clip(
+            np.divide(
+                wx * d[s, 0] + wy * d[s, 1], l2, out=np.zeros_like(l2), where=l2 != 0
+            ),
+            0,
+            1,
+        )
+        distance = np.hypot(wx - projection * d[s, 0], wy - projection * d[s, 1])
+        pixel_coverage = np.clip(line_width / 2 + 0.5 - distance, 0, 1)
+        if polygon is not None:
+            pixel_coverage *= get_polygon_coverage(polygon, px, py)
+        covered = pixel_coverage > 0
+        index = (py[covered] * width + px[covered]).astype(np.int64)
+        np.maximum.at(coverage, index, pixel_coverage[covered].astype(np.float32))
+    return coverage.reshape(height, width)
+
+
+def coverage_to_image(
+    coverage: np.ndarray,
+    line_color: Tuple[int, int, int] = (0, 0, 0),
+    background_color: Tuple[int, int, int] = (255, 255, 255),
+) -> Image:
+    """
+    Convert a coverage array into an RGBA image by blending the line color over the background color.
+
+    Parameters
+    ----------
+    coverage : np.ndarray
+        Array of shape (height, width) with values between 0 and 1
+    line_color : Tuple[int, int, int], optional
+        The color of the fully covered pixels
+    background_color : Tuple[int, int, int], optional
+        The color of the pixels that are not covered
+
+    Returns
+    -------
+    Image
+        The RGBA image
+    """
+    # Color of each of the 256 coverage levels
+    level = np.linspace(0, 1, 256)[:, None]
+    palette = np.empty((256, 4), dtype=np.uint8)
+    palette[:, :3] = np.round(
+        (1 - level) * np.asarray(background_color) + level * np.asarray(line_color)
+    )
+    palette[:, 3] = 255
+    mask = (coverage * 255 + 0.5).astype(np.uint8)
+    # Gather whole pixels at once by viewing each RGBA color as a single 32 bits integer
+    pixels = palette.view(np.uint32)[:, 0][mask]
+    return Image.fromarray(pixels.view(np.uint8).reshape(mask.shape + (4,)), "RGBA")
+
+
+def segments_to_svg(
+    segments: np.ndarray,
+    width: int,
+    height: int,
+    line_width: float,
+    line_color: Tuple[int, int, int] = (0, 0, 0),
+    background_color: Tuple[int, int, int] = (255, 255, 255),
+    polygon: np.ndarray | None = None,
+) -> str:
+    """
+    Create an SVG image of a set of segments.
+
+    Parameters
+    ----------
+    segments : np.ndarray
+        Array of shape (n, 2, 2) containing the extremities of the segments in pixel coordinates
+    width : int
+        The width of the image
+    height : int
+        The height of the image
+    line_width : float
+        The width of the segments
+    line_color : Tuple[int, int, int], optional
+        The color of the segments
+    background_color : Tuple[int, int, int], optional
+        The color of the background
+    polygon : np.ndarray | None, optional
+        If given, the vertices of a polygon the segments are clipped to
+
+    Returns
+    -------
+    str
+        The content of the SVG file
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    path = " ".join(
+        "M%.3f %.3fL%.3f %.3f" % (x1, y1, x2, y2)
+        for (x1, y1), (x2, y2) in segments.tolist()
+    )
+    res = [
+        '<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d">'
+        % (width, height, width, height),
+        '<rect width="%d" height="%d" fill="rgb(%d,%d,%d)"/>'
+        % ((width, height) + tuple(background_color)),
+    ]
+    clip = ""
+    if polygon is not None:
+        points = " ".join("%.3f,%.3f" % (x, y) for x, y in np.asarray(polygon).tolist())
+        res.append(
+            '<defs><clipPath id="face"><polygon points="%s"/></clipPath></defs>' % points
+        )
+        clip = ' clip-path="url(#face)"'
+    res.append(
+        '<path%s d="%s" fill="none" stroke="rgb(%d,%d,%d)" stroke-width="%g" stroke-linecap="round"/>'
+        % ((clip, path) + tuple(line_color) + (line_width,))
+    )
+    res.append("</svg>")
+    return "\n".join(res)
+
+
+def get_image_size(vertices: np.ndarray) -> Tuple[int, int]:
+    """
+    Return the size of the smallest image containing a polygon whose vertices have positive coordinates.
+
+    Parameters
+    ----------
+    vertices : np.ndarray
+        Array of shape (p, 2) containing the vertices in pixel coordinates
+
+    Returns
+    -------
+    Tuple[int, int]
+        The width and height of the image
+    """
+    vertices = np.asarray(vertices)
+    return (
+        max(int(ceil(vertices[:, 0].max() - 1e-9)), 1),
+        max(int(ceil(vertices[:, 1].max() - 1e-9)), 1),
+    )
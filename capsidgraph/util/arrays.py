@@ -0,0 +1,193 @@
+import networkx as nx
+import numpy as np
+from typing import Dict, Hashable, List, Tuple
+from capsidgraph.util.types import Edge
+
+
+def edges_to_array(edges: List[Edge]) -> np.ndarray:
+    """
+    Convert a list of edges into an array.
+
+    Parameters
+    ----------
+    edges : List[Edge]
+        The edges to convert
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n, 2, 2), the entry [i, j] contains the coordinates of the j-th extremity of the i-th edge
+    """
+    if len(edges) == 0:
+        return np.zeros((0, 2, 2))
+    return np.asarray(edges)
+
+
+def array_to_edges(array: np.ndarray) -> List[Edge]:
+    """
+    Convert an array created by `edges_to_array` back into a list of edges.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array of shape (n, 2, 2) containing the coordinates of the extremities of the edges
+
+    Returns
+    -------
+    List[Edge]
+        The list of edges, integer coordinates are converted back into python integers
+    """
+    return [(tuple(P1), tuple(P2)) for P1, P2 in np.asarray(array).tolist()]
+
+
+def graph_to_arrays(G: nx.Graph) -> Dict[str, np.ndarray]:
+    """
+    Convert a graph into a compact set of arrays.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to convert
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The arrays describing the graph.
+
+        The `nodes` entry contains the label of each node, labels must all be integers or all be strings.
+
+        The `edges` entry is an array of shape (m, 2) containing the indices in `nodes` of the extremities of each edge.
+
+        The `strength` entry contains the `strength` attribute of each edge, it is only present if the edges have one.
+
+        The `node_strength` entry contains the `strength` attribute of each node, it is only present if the nodes have one.
+
+    Raises
+    ------
+    TypeError
+        If the labels of the nodes are neither all integers nor all strings
+    ValueError
+        If only some of the edges, or some of the nodes, have a `strength` attribute, which could not be restored
+    """
+    nodes = list(G.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    if len(nodes) > 0 and not (
+        all(isinstance(node, (int, np.integer)) for node in nodes)
+        or all(isinstance(node, str) for node in nodes)
+    ):
+        raise TypeError("The labels of the nodes must all be integers or all be strings")
+    arrays = {
+        "nodes": np.asarray(nodes),
+        "edges": np.array(
+            [(index[a], index[b]) for a, b in G.edges], dtype=np.int32
+        ).reshape(-1, 2),
+    }
+    strength = nx.get_edge_attributes(G, "strength")
+    if 0 < len(strength) < len(G.edges):
+        raise ValueError(
+            "%d of the %d edges have no strength"
+            % (len(G.edges) - len(strength), len(G.edges))
+        )
+    if len(strength) > 0:
+        arrays["strength"] = np.array([strength[e] for e in G.edges], dtype=float)
+    node_strength = nx.get_node_attributes(G, "strength")
+    if 0 < len(node_strength) < len(G.nodes):
+        raise ValueError(
+            "%d of the %d nodes have no strength"
+            % (len(G.nodes) - len(node_strength), len(G.nodes))
+        )
+    if len(node_strength) > 0:
+        arrays["node_strength"] = np.array(
+            [node_strength[n] for n in nodes], dtype=float
+        )
+    return arrays
+
+
+def arrays_to_graph(arrays: Dict[str, np.ndarray]) -> nx.Graph:
+    """
+    Convert arrays created by `graph_to_arrays` back into a graph.
+
+    Parameters
+    ----------
+    arrays : Dict[str, np.ndarray]
+        The arrays describing the graph
+
+    Returns
+    -------
+    nx.Graph
+        The graph, with the `strength` attributes of its nodes and edges if they were stored
+    """
+    nodes = np.asarray(arrays["nodes"]).tolist()
+    edges = np.asarray(arrays["edges"])
+    G = nx.Graph()
+    if "node_strength" in arrays:
+        G.add_nodes_from(
+            (node, {"strength": s})
+            for node, s in zip(nodes, np.asarray(arrays["node_strength"]).tolist())
+        )
+    else:
+        G.add_nodes_from(nodes)
+    if "strength" in arrays:
+        G.add_edges_from(
+            (nodes[a], nodes[b], {"strength": s})
+            for (a, b), s in zip(
+                edges.tolist(), np.asarray(arrays["strength"]).tolist()
+            )
+        )
+    else:
+        G.add_edges_from((nodes[a], nodes[b]) for a, b in edges.tolist())
+    return G
+
+
+def coordinates_to_arrays(
+    coordinates: Dict[Hashable, List[Tuple[int, float, float]]], nodes: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Convert the face coordinates of the nodes of a capsid into arrays.
+
+    Parameters
+    ----------
+    coordinates : Dict[Hashable, List[Tuple[int, float, float]]]
+        The coordinates of the nodes in the format `{id1:[(face1,x1,y1), (face2,x2,y2), ...], id2:...}`, as returned by `create_icosahedral_capsid_graph`
+    nodes : np.ndarray
+        The labels of the nodes, as stored in the `nodes` entry of `graph_to_arrays`
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The `coordinates` entry is an array of shape (p, 3) containing all the (face, x, y) tuples, grouped by node.
+        The coordinates of the i-th node are the rows `coordinates_offsets[i]` to `coordinates_offsets[i+1]`.
+    """
+    rows = []
+    offsets = [0]
+    for node in nodes.tolist():
+        rows += coordinates.get(node, [])
+        offsets.append(len(rows))
+    return {
+        "coordinates": np.array(rows, dtype=float).reshape(-1, 3),
+        "coordinates_offsets": np.array(offsets, dtype=np.int64),
+    }
+
+
+def arrays_to_coordinates(
+    arrays: Dict[str, np.ndarray]
+) -> Dict[Hashable, List[Tuple[int, float, float]]]:
+    """
+    Convert arrays created by `coordinates_to_arrays` back into a coordinate dictionary.
+
+    Parameters
+    ----------
+    arrays : Dict[str, np.ndarray]
+        The arrays containing the `nodes`, `coordinates` and `coordinates_offsets` entries
+
+    Returns
+    -------
+    Dict[Hashable, List[Tuple[int, float, float]]]
+        The coordinates of the nodes in the format `{id1:[(face1,x1,y1), (face2,x2,y2), ...], id2:...}`
+    """
+    rows = np.asarray(arrays["coordinates"]).tolist()
+    offsets = np.asarray(arrays["coordinates_offsets"]).tolist()
+    return {
+        node: [(int(f), x, y) for f, x, y in rows[offsets[i] : offsets[i + 1]]]
+        for i, node in enumerate(np.asarray(arrays["nodes"]).tolist())
+    }
@@ -0,0 +1,140 @@
+import json
+import os
+from typing import Dict, Hashable, List, Tuple
+import networkx as nx
+import numpy as np
+from capsidgraph.util.arrays import (
+    graph_to_arrays,
+    arrays_to_graph,
+    coordinates_to_arrays,
+    arrays_to_coordinates,
+)
+
+# File listing the arrays of a graph saved in a directory
+_MANIFEST = "manifest.json"
+
+
+def _read_manifest(path: str) -> List[str] | None:
+    """
+    Return the names of the arrays of a graph saved in a directory, None if the directory has no manifest.
+    """
+    manifest = os.path.join(path, _MANIFEST)
+    if not os.path.exists(manifest):
+        return None
+    with open(manifest) as f:
+        return json.load(f)["arrays"]
+
+
+def save_graph(
+    G: nx.Graph,
+    path: str,
+    coordinates: Dict[Hashable, List[Tuple[int, float, float]]] | None = None,
+    compressed: bool = False,
+) -> None:
+    """
+    Save a graph in a compact binary format.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        The graph to save. Node labels must all be integers or all be strings.
+    path : str
+        Where to save the graph. If it ends with `.npz` the graph is saved as a single numpy archive, otherwise `path` is a directory in which every array is saved as a `.npy` file that can be memory mapped, with a `manifest.json` file listing them.
+        The directory must be new, empty, or contain a graph saved by `save_graph`, whose arrays are replaced.
+    coordinates : Dict[Hashable, List[Tuple[int, float, float]]] | None, optional
+        The face coordinates of the nodes, as returned by `create_icosahedral_capsid_graph` with `return_coordinates=True`
+    compressed : bool, optional
+        Whether to compress the `.npz` archive, ignored when saving to a directory
+
+    Notes
+    -----
+    The edges, the `strength` attributes of the edges and of the nodes and the face coordinates are saved, other attributes are discarded.
+    See `capsidgraph.util.arrays.graph_to_arrays` for the description of the saved arrays.
+
+    Raises
+    ------
+    ValueError
+        If `path` is a non-empty directory which does not contain a saved graph
+    """
+    arrays = graph_to_arrays(G)
+    if coordinates is not None:
+        arrays.update(coordinates_to_arrays(coordinates, arrays["nodes"]))
+    if path.endswith(".npz"):
+        if compressed:
+            np.savez_compressed(path, **arrays)
+        else:
+            np.savez(path, **arrays)
+    else:
+        os.makedirs(path, exist_ok=True)
+        previous = _read_manifest(path)
+        if previous is None and len(os.listdir(path)) > 0:
+            raise ValueError(
+                "%s is not empty and does not contain a saved graph" % path
+            )
+        # Remove the arrays of the previously saved graph that are not replaced
+        for name in previous or []:
+            filename = os.path.join(path, name + ".npy")
+            if name not in arrays and os.path.exists(filename):
+                os.remove(filename)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), array)
+        with open(os.path.join(path, _MANIFEST), "w") as f:
+            json.dump({"arrays": list(arrays)}, f)
+
+
+def load_graph_arrays(path: str, mmap_mode: str | None = "r") -> Dict[str, np.ndarray]:
+    """
+    Load the arrays describing a graph saved with `save_graph`, without building the networkx graph.
+
+    Parameters
+    ----------
+    path : str
+        The path given to `save_graph`
+    mmap_mode : str | None, optional
+        The memory mapping mode passed to `np.load`. By default arrays saved in a directory are memory mapped read-only, so loading is zero-copy and the pages are shared by every process opening the same graph.
+        Arrays saved in a `.npz` archive are always read into memory.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The arrays describing the graph, see `capsidgraph.util.arrays.graph_to_arrays`
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    names = _read_manifest(path)
+    if names is None:
+        # Directories saved without a manifest only contain the arrays
+        names = [f[: -len(".npy")] for f in os.listdir(path) if f.endswith(".npy")]
+    return {
+        name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+        for name in names
+    }
+
+
+def load_graph(
+    path: str, return_coordinates: bool = False
+) -> nx.Graph | Tuple[nx.Graph, Dict[Hashable, List[Tuple[int, float, float]]] | None]:
+    """
+    Load a graph saved with `save_graph`.
+
+    Parameters
+    ----------
+    path : str
+        The path given to `save_graph`
+    return_coordinates : bool, optional
+        Whether to also return the face coordinates of the nodes
+
+    Returns
+    -------
+    nx.Graph | Tuple[nx.Graph, Dict[Hashable, List[Tuple[int, float, float]]] | None]
+        The graph, with the `strength` attributes of its edges and nodes if they were saved.
+        If `return_coordinates` is True, the graph and the face coordinates of its nodes, or None if they were not saved.
+    """
+    arrays = load_graph_arrays(path)
+    G = arrays_to_graph(arrays)
+    if not return_coordinates:
+        return G
+    if "coordinates" not in arrays:
+        return G, None
+    return G, arrays_to_coordinates(arrays)
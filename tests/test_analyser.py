@@ -1,11 +1,20 @@
 import unittest
+import asyncio
+import multiprocessing
+import threading
+import pickle
+import random
+import subprocess
+import sys
 import networkx as nx
 from capsidgraph.analyser.analyse import (
     get_hole_size,
     _bisection_stop_condition,
     get_fragmentation_probability,
     bisection,
+    _is_fragmented,
 )
+from capsidgraph.analyser.compact import CompactGraph, _get_compact_methods
 from capsidgraph.analyser.fragment import (
     probability_fragment,
     strength_edges_fragment,
@@ -21,9 +30,39 @@ from capsidgraph.analyser import (
     get_fragmentation_probability_random_node_removal,
     get_fragment_size_distribution,
     get_hole_size_distribution,
+    create_jsonl_sink,
+    create_log_sink,
+    get_confidence_interval,
+    get_fragmentation_polynomial,
+    get_fragmentation_probability_importance_sampling,
+    get_fragmentation_probability_splitting,
+    get_fragmentation_probability_curve,
+    ProbabilityFragmenter,
+    StrengthEdgesFragmenter,
+    StrengthNodesFragmenter,
+    LegacyFragmenter,
+    get_fragmenter,
+    MaskedGraph,
+    requires_copy,
+    HoleCriterion,
+    get_hole_fragmentation_threshold,
+    get_hole_fragmentation_curve,
+    get_backend,
+    set_backend,
+    is_numba_available,
+    get_fragmentation_probability_async,
+    iter_fragmentation_probability,
+    bisection_async,
+    Coordinator,
+    run_worker,
+    ProbabilityResult,
 )
 
 
+def _failing_fragment(G):
+    raise ZeroDivisionError("failing fragment")
+
+
 class TestAnalyser(unittest.TestCase):
     def test_fragment_probability(self):
         G = nx.read_adjlist("tests/testcase1.adjlist")
@@ -217,5 +256,857 @@ class TestAnalyser(unittest.TestCase):
             self.assertGreaterEqual(i, 0)
 
 
+    def test_progress(self):
+        import json
+        import tempfile
+
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        settings = {"fragmentation": 0.3, "fragmentation_type": "edges"}
+        for process_number in [1, 2]:
+            events = []
+            pfrag, n = get_fragmentation_probability(
+                G,
+                4000,
+                probability_fragment,
+                fragment_settings=settings,
+                process_number=process_number,
+                progress=events.append,
+                progress_interval=0,
+            )
+            self.assertGreater(len(events), 1)
+            self.assertEqual(events[-1]["event"], "end")
+            self.assertEqual(events[-1]["iterations"], n)
+            self.assertAlmostEqual(events[-1]["estimate"], pfrag, places=5)
+            self.assertEqual(events[-1]["target_iterations"], 4000)
+            self.assertEqual(events[-1]["fragmentation"], 0.3)
+            for e in events:
+                self.assertLessEqual(e["ci_low"], e["ci_high"])
+                self.assertIn("sims_per_second", e)
+                self.assertIn("eta", e)
+
+        low, high = get_confidence_interval(50, 100)
+        self.assertLess(low, 0.5)
+        self.assertGreater(high, 0.5)
+
+        with tempfile.TemporaryDirectory() as d:
+            path = d + "/progress.jsonl"
+            with self.assertLogs("capsidgraph.analyser", level="INFO") as logs:
+                bisection(
+                    G,
+                    2,
+                    0.1,
+                    probability_fragment,
+                    fragment_settings={"fragmentation_type": "edges"},
+                    progress=[create_jsonl_sink(path), create_log_sink()],
+                )
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+            self.assertEqual(len(events), len(logs.output))
+            steps = [e for e in events if e["event"] == "step"]
+            self.assertEqual([e["step"] for e in steps], [1, 2])
+            self.assertEqual(steps[0]["upper_bound"] - steps[0]["lower_bound"], 0.5)
+            self.assertEqual(steps[1]["upper_bound"] - steps[1]["lower_bound"], 0.25)
+            for e in events:
+                self.assertIn("lower_bound", e)
+
+
+    def test_profile(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+        for process_number in [1, 2]:
+            pfrag, n, report = get_fragmentation_probability(
+                G,
+                2000,
+                strength_edges_fragment,
+                fragment_settings={"fragmentation": 0.3},
+                process_number=process_number,
+                profile=True,
+            )
+            self.assertEqual(len(report["workers"]), process_number)
+            self.assertEqual(report["iterations"], n)
+            phases = report["phases"]
+            # The default test samples removal masks, the graph is not copied
+            for phase in ["fragment", "sample", "is_fragmented"]:
+                self.assertEqual(phases[phase]["calls"], n)
+                self.assertGreater(phases[phase]["time"], 0)
+            self.assertIn("reduce", phases)
+            self.assertNotIn("copy", phases)
+        # A custom test receives views of the fragmented graphs
+        pfrag, n, report = get_fragmentation_probability(
+            G,
+            2000,
+            strength_edges_fragment,
+            fragment_settings={"fragmentation": 0.3},
+            is_fragmented=lambda G_: _is_fragmented(G_),
+            profile=True,
+        )
+        self.assertNotIn("copy", report["phases"])
+        # Wrapped methods build the fragmented graphs
+        pfrag, n, report = get_fragmentation_probability(
+            G,
+            2000,
+            lambda G_, settings: strength_edges_fragment(G_, settings),
+            fragment_settings={"fragmentation": 0.3},
+            profile=True,
+        )
+        phases = report["phases"]
+        for phase in ["fragment", "copy", "sample", "remove", "is_fragmented"]:
+            self.assertEqual(phases[phase]["calls"], n)
+            self.assertGreater(phases[phase]["time"], 0)
+        self.assertLessEqual(
+            phases["copy"]["time"] + phases["sample"]["time"] + phases["remove"]["time"],
+            phases["fragment"]["time"],
+        )
+        # Profiling is disabled again afterwards
+        res = get_fragmentation_probability(
+            G, 10, strength_edges_fragment, fragment_settings={"fragmentation": 0.3}
+        )
+        self.assertEqual(len(res), 2)
+        threshold, steps, report = bisection(
+            G,
+            2,
+            0.1,
+            probability_fragment,
+            fragment_settings={"fragmentation_type": "edges"},
+            profile=True,
+        )
+        self.assertEqual(len(report["workers"]), steps)
+
+    def test_compact_graph(self):
+        G = nx.read_adjlist("tests/AaLS_48.adjlist")
+        nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+        _init_nodes_strength(G)
+        for fragment, settings in [
+            (probability_fragment, {"fragmentation": 0.3, "fragmentation_type": "nodes"}),
+            (probability_fragment, {"fragmentation": 0.3, "fragmentation_type": "edges"}),
+            (strength_edges_fragment, {"fragmentation": 0.3}),
+            (strength_nodes_fragment, {"fragmentation": 0.2}),
+        ]:
+            compact_fragment, compact_is_fragmented = _get_compact_methods(G, fragment)
+            # The masks are drawn with the same random numbers as the fragmented graphs
+            for seed in range(50):
+                random.seed(seed)
+                G_ = fragment(G, settings)
+                random.seed(seed)
+                mask = compact_fragment(G, settings)
+                H = compact_fragment.cg.to_graph(mask)
+                self.assertEqual(set(H.nodes), set(G_.nodes))
+                self.assertEqual(
+                    set(map(frozenset, H.edges)), set(map(frozenset, G_.edges))
+                )
+                self.assertEqual(compact_is_fragmented(mask), _is_fragmented(G_))
+            random.seed(0)
+            res = get_fragmentation_probability(
+                G, 500, fragment, fragment_settings=settings
+            )
+            random.seed(0)
+            self.assertEqual(
+                get_fragmentation_probability(
+                    G,
+                    500,
+                    fragment,
+                    fragment_settings=settings,
+                    is_fragmented=lambda G_: _is_fragmented(G_),
+                ),
+                res,
+            )
+        self.assertIsNone(_get_compact_methods(G, lambda G_: G_))
+        # Every node or every edge removed
+        cg = compact_fragment.cg
+        self.assertFalse(cg.is_fragmented(bytearray([1] * cg.n + [0] * cg.m)))
+        self.assertTrue(cg.is_fragmented(bytearray([0] * cg.n + [1] * cg.m)))
+        self.assertFalse(cg.is_fragmented(cg.create_mask()))
+
+    def test_compact_graph_cuts(self):
+        cg = CompactGraph(nx.read_adjlist("tests/AaLS_48.adjlist"))
+        cg.compute_cuts()
+        self.assertEqual((cg.edge_connectivity, cg.node_connectivity), (3, 3))
+        self.assertEqual(len(cg.bridges), 0)
+        cg.compute_cuts(exact=False)
+        self.assertEqual((cg.edge_connectivity, cg.node_connectivity), (2, 2))
+        # Two triangles joined by the bridge 2-3
+        G = nx.Graph([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 3)])
+        cg = CompactGraph(G)
+        cg.compute_cuts()
+        self.assertEqual((cg.edge_connectivity, cg.node_connectivity), (1, 1))
+        self.assertEqual(cg.bridges, {list(G.edges).index((2, 3))})
+        self.assertEqual(cg.articulation_points, {2, 3})
+        for i in range(cg.n + cg.m):
+            mask = cg.create_mask()
+            mask[i] = 1
+            G_ = cg.to_graph(mask)
+            self.assertEqual(
+                cg.is_fragmented(mask), len(G_.nodes) > 0 and not nx.is_connected(G_)
+            )
+        # Two disjoint triangles stay fragmented after any single removal
+        G = nx.Graph([(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)])
+        cg = CompactGraph(G)
+        cg.compute_cuts()
+        for i in range(cg.n + cg.m):
+            mask = cg.create_mask()
+            mask[i] = 1
+            self.assertTrue(cg.is_fragmented(mask))
+        settings = {"fragmentation": 0.05, "fragmentation_type": "edges"}
+        pfrag, n = get_fragmentation_probability(
+            G, 1000, probability_fragment, fragment_settings=settings
+        )
+        self.assertEqual(pfrag, 1)
+
+    def test_fragmentation_polynomial(self):
+        # Cube graph, counted by hand from the removed sets
+        G = nx.cubical_graph()
+        P = get_fragmentation_polynomial(G, "edges")
+        # No single edge disconnects the cube, the 8 sets of 3 edges around a node do
+        self.assertEqual(P.counts[:4], [0, 0, 0, 8])
+        self.assertEqual(P.counts[12], 1)
+        self.assertEqual(P(0), 0)
+        self.assertEqual(P(1), 1)
+        P = get_fragmentation_polynomial(G, "nodes")
+        self.assertEqual(P.counts[:3], [0, 0, 0])
+        self.assertEqual(P.counts[-2:], [0, 0])
+        self.assertEqual(P(1), 0)
+        self.assertAlmostEqual(
+            sum(c * 0.3**k for k, c in enumerate(P.coefficients)), P(0.3)
+        )
+        # Agreement with the simulations
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        for fragmentation_type in ["edges", "nodes"]:
+            P = get_fragmentation_polynomial(G, fragmentation_type)
+            pfrag, n = get_fragmentation_probability(
+                G,
+                4000,
+                probability_fragment,
+                fragment_settings={
+                    "fragmentation": 0.3,
+                    "fragmentation_type": fragmentation_type,
+                },
+            )
+            self.assertAlmostEqual(pfrag, P(0.3), delta=0.04)
+            threshold = P.threshold()
+            self.assertAlmostEqual(P(threshold), 0.5)
+
+    def test_importance_sampling(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        random.seed(0)
+        for fragmentation_type, proposal, cuts in [
+            ("edges", "cuts", None),
+            ("nodes", "cuts", [G.adj[v] for v in G] + list(nx.all_node_cuts(G))),
+            ("nodes", "tilted", None),
+        ]:
+            exact = get_fragmentation_polynomial(G, fragmentation_type)(0.01)
+            pfrag, relative_error, n = get_fragmentation_probability_importance_sampling(
+                G,
+                2000,
+                {"fragmentation": 0.01, "fragmentation_type": fragmentation_type},
+                proposal=proposal,
+                cuts=cuts,
+            )
+            self.assertEqual(n, 2000)
+            self.assertLess(relative_error, 1)
+            self.assertLess(abs(pfrag - exact), 5 * relative_error * pfrag)
+        # The default cuts for node removal include the minimum node cuts, which dominate at small probabilities
+        exact = get_fragmentation_polynomial(G, "nodes")(1e-3)
+        pfrag, relative_error, n = get_fragmentation_probability_importance_sampling(
+            G, 2000, {"fragmentation": 1e-3, "fragmentation_type": "nodes"}
+        )
+        self.assertLess(relative_error, 1)
+        self.assertLess(abs(pfrag - exact), 5 * relative_error * pfrag)
+        pfrag, relative_error, n = get_fragmentation_probability_importance_sampling(
+            G, 100, {"fragmentation": 0, "fragmentation_type": "edges"}
+        )
+        self.assertEqual(pfrag, 0)
+
+    def test_splitting(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+        _init_nodes_strength(G)
+        random.seed(0)
+        exact = get_fragmentation_polynomial(G, "edges")(0.05)
+        estimates = [
+            get_fragmentation_probability_splitting(
+                G,
+                probability_fragment,
+                {"fragmentation": 0.05, "fragmentation_type": "edges"},
+            )[0]
+            for _ in range(10)
+        ]
+        mean = sum(estimates) / len(estimates)
+        self.assertLess(exact / 3, mean)
+        self.assertLess(mean, 3 * exact)
+        pfrag, relative_error, iterations = get_fragmentation_probability_splitting(
+            G, strength_nodes_fragment, {"fragmentation": 0.3}
+        )
+        self.assertGreater(pfrag, 0)
+        self.assertLess(pfrag, 0.05)
+        self.assertGreater(iterations, 0)
+        # Two nodes can not disconnect the graph
+        pfrag, relative_error, iterations = get_fragmentation_probability_splitting(
+            G, strength_nodes_fragment, {"fragmentation": 0.15}
+        )
+        self.assertEqual(pfrag, 0)
+        with self.assertRaises(ValueError):
+            get_fragmentation_probability_splitting(G, lambda G_: G_, {})
+
+
+    def test_fragmentation_probability_curve(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+        _init_nodes_strength(G)
+        random.seed(0)
+        fragmentations = [i / 10 for i in range(11)]
+        curve, n = get_fragmentation_probability_curve(
+            G,
+            fragmentations,
+            500,
+            probability_fragment,
+            {"fragmentation_type": "edges"},
+            process_number=2,
+        )
+        self.assertEqual(n, 500)
+        # The removed edges grow with the probability, so the curve increases
+        self.assertEqual(curve, sorted(curve))
+        self.assertEqual(curve[0], 0)
+        self.assertEqual(curve[-1], 1)
+        P = get_fragmentation_polynomial(G, "edges")
+        for p, pfrag in zip(fragmentations, curve):
+            self.assertAlmostEqual(pfrag, P(p), delta=0.08)
+        # Custom criterion
+        is_fragmented = lambda G_: get_hole_size(G_, G) >= len(G.nodes) // 2
+        curve, n = get_fragmentation_probability_curve(
+            G,
+            fragmentations,
+            200,
+            probability_fragment,
+            {"fragmentation_type": "nodes"},
+            is_fragmented=is_fragmented,
+        )
+        self.assertEqual(n, 200)
+        self.assertEqual(curve, sorted(curve))
+        # Other fragmentation methods replay the same random numbers for every value
+        random.seed(1)
+        curve, n = get_fragmentation_probability_curve(
+            G, [0.2, 0.2, 0.5], 200, strength_nodes_fragment
+        )
+        self.assertEqual(curve[0], curve[1])
+        random.seed(1)
+        pfrag, n = get_fragmentation_probability(
+            G, 200, strength_nodes_fragment, fragment_settings={"fragmentation": 0.5}
+        )
+        self.assertAlmostEqual(curve[2], pfrag, delta=0.15)
+        with self.assertRaises(ValueError):
+            get_fragmentation_probability_curve(G, [0.5], 10, lambda G_: G_)
+
+    def test_fragmenter(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        nx.set_edge_attributes(G, 1 / len(G.edges), "strength")
+        _init_nodes_strength(G)
+        for fragment, fragmenter_class, settings in [
+            (
+                probability_fragment,
+                ProbabilityFragmenter,
+                {"fragmentation": 0.3, "fragmentation_type": "nodes"},
+            ),
+            (
+                probability_fragment,
+                ProbabilityFragmenter,
+                {"fragmentation": 0.3, "fragmentation_type": "edges"},
+            ),
+            (strength_edges_fragment, StrengthEdgesFragmenter, {"fragmentation": 0.3}),
+            (strength_nodes_fragment, StrengthNodesFragmenter, {"fragmentation": 0.2}),
+        ]:
+            fragmenter = get_fragmenter(fragment, settings)
+            self.assertIsInstance(fragmenter, fragmenter_class)
+            fragmenter.prepare(G)
+            legacy = LegacyFragmenter(fragment, settings)
+            legacy.prepare(G)
+            mask = fragmenter.graph.create_mask()
+            legacy_mask = fragmenter.graph.create_mask()
+            for seed in range(20):
+                # The legacy methods draw from the `random` module
+                random.seed(seed)
+                fragmenter.sample(random, mask)
+                random.seed(seed)
+                legacy.sample(None, legacy_mask)
+                self.assertEqual(mask, legacy_mask)
+                fragmenter.sample(random.Random(seed), legacy_mask)
+                self.assertEqual(mask, legacy_mask)
+            random.seed(0)
+            res = get_fragmentation_probability(
+                G, 300, fragment, fragment_settings=settings
+            )
+            random.seed(0)
+            self.assertEqual(
+                get_fragmentation_probability(G, 300, fragmenter_class(settings)),
+                res,
+            )
+        # Custom test on the graphs built from the masks
+        is_fragmented = lambda G_: get_hole_size(G_, G) >= len(G.nodes) // 2
+        random.seed(0)
+        res = get_fragmentation_probability(
+            G,
+            300,
+            probability_fragment,
+            fragment_settings={"fragmentation": 0.5, "fragmentation_type": "nodes"},
+            is_fragmented=is_fragmented,
+        )
+        random.seed(0)
+        self.assertEqual(
+            get_fragmentation_probability(
+                G,
+                300,
+                ProbabilityFragmenter({"fragmentation_type": "nodes"}),
+                fragment_settings={"fragmentation": 0.5},
+                is_fragmented=is_fragmented,
+            ),
+            res,
+        )
+        threshold, steps = bisection(
+            G,
+            5,
+            0.1,
+            ProbabilityFragmenter({"fragmentation_type": "edges"}),
+            max_iterations=2000,
+        )
+        self.assertAlmostEqual(
+            threshold, get_fragmentation_polynomial(G, "edges").threshold(), delta=0.1
+        )
+        with self.assertRaises(ValueError):
+            StrengthNodesFragmenter({"fragmentation": 0.2}).prepare(nx.cycle_graph(4))
+
+    def test_masked_graph(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        nx.set_edge_attributes(G, 1, "strength")
+        cg = CompactGraph(G)
+        view = MaskedGraph(G)
+        random.seed(0)
+        for _ in range(20):
+            mask = bytearray(random.random() < 0.3 for _ in range(cg.n + cg.m))
+            H = cg.to_graph(mask)
+            G_ = view(mask)
+            self.assertEqual(set(G_.nodes), set(H.nodes))
+            self.assertEqual(
+                set(map(frozenset, G_.edges)), set(map(frozenset, H.edges))
+            )
+            self.assertEqual(_is_fragmented(G_), cg.is_fragmented(mask))
+        # The attributes are shared and the view is read-only
+        self.assertTrue(all(d["strength"] == 1 for _, _, d in G_.edges(data=True)))
+        with self.assertRaises(nx.NetworkXError):
+            G_.remove_node(next(iter(G_.nodes)))
+        view = pickle.loads(pickle.dumps(view))
+        self.assertEqual(set(view(mask).nodes), set(H.nodes))
+
+        @requires_copy
+        def is_fragmented(G_):
+            G_.remove_nodes_from([v for v in list(G_.nodes) if G_.degree(v) == 0])
+            return _is_fragmented(G_)
+
+        pfrag, n = get_fragmentation_probability(
+            G,
+            200,
+            probability_fragment,
+            fragment_settings={"fragmentation": 0.3, "fragmentation_type": "edges"},
+            is_fragmented=is_fragmented,
+        )
+        self.assertEqual(n, 200)
+
+    def test_hole_criterion(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        cg = CompactGraph(G)
+        random.seed(0)
+        for _ in range(300):
+            p = random.random()
+            mask = bytearray(random.random() < p for _ in range(cg.n + cg.m))
+            hole_size = get_hole_size(cg.to_graph(mask), G)
+            self.assertEqual(cg.get_hole_size(mask), hole_size)
+            for size in [1, cg.n // 3, cg.n // 2, cg.n]:
+                self.assertEqual(cg.has_hole(mask, size), hole_size >= size)
+        is_fragmented = HoleCriterion(G)
+        self.assertEqual(is_fragmented.size, 12)
+        settings = {"fragmentation": 0.4, "fragmentation_type": "nodes"}
+        random.seed(0)
+        res = get_fragmentation_probability(
+            G,
+            500,
+            probability_fragment,
+            fragment_settings=settings,
+            is_fragmented=lambda G_: get_hole_size(G_, G) >= 12,
+        )
+        random.seed(0)
+        self.assertEqual(
+            get_fragmentation_probability(
+                G,
+                500,
+                probability_fragment,
+                fragment_settings=settings,
+                is_fragmented=is_fragmented,
+            ),
+            res,
+        )
+        random.seed(0)
+        distribution = get_hole_size_distribution(
+            G, 200, probability_fragment, settings
+        )
+        random.seed(0)
+        self.assertEqual(
+            get_hole_size_distribution(
+                G, 200, lambda G_, s: probability_fragment(G_, s), settings
+            ),
+            distribution,
+        )
+        curve, n = get_hole_fragmentation_curve(
+            G,
+            [0.2, 0.4, 0.6],
+            300,
+            probability_fragment,
+            {"fragmentation_type": "edges"},
+        )
+        self.assertEqual(curve, sorted(curve))
+        threshold, steps = get_hole_fragmentation_threshold(
+            G,
+            4,
+            0.1,
+            probability_fragment,
+            {"fragmentation_type": "nodes"},
+            hole_size=6,
+            max_iterations=100000,
+            process_number=2,
+        )
+        self.assertEqual(steps, 4)
+        self.assertAlmostEqual(threshold, 0.33, delta=0.07)
+
+    @unittest.skipUnless(is_numba_available(), "numba is not installed")
+    def test_backend(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        for j, (u, v) in enumerate(G.edges):
+            G[u][v]["strength"] = (1 + j % 3) / (2 * len(G.edges))
+        _init_nodes_strength(G)
+        cg = CompactGraph(G)
+        random.seed(0)
+        masks = []
+        for _ in range(200):
+            p = random.random()
+            masks.append(bytearray(random.random() < p for _ in range(cg.n + cg.m)))
+        results = {}
+        try:
+            for backend in ["python", "numba"]:
+                set_backend(backend)
+                self.assertEqual(get_backend(), backend)
+                res = []
+                for mask in masks:
+                    res.append(cg.is_fragmented(mask))
+                    res.append(cg.get_hole_size(mask))
+                    res.extend(cg.has_hole(mask, size) for size in [1, 8, 12])
+                for fragmenter, strength in [
+                    (StrengthEdgesFragmenter(), 0.3),
+                    (StrengthNodesFragmenter(), 0.2),
+                ]:
+                    fragmenter.settings["fragmentation"] = strength
+                    fragmenter.prepare(G)
+                    rng = random.Random(1)
+                    for _ in range(50):
+                        mask = bytearray(cg.n + cg.m)
+                        fragmenter.sample(rng, mask)
+                        res.append(bytes(mask))
+                    res.append(rng.random())
+                results[backend] = res
+        finally:
+            set_backend()
+        self.assertEqual(results["numba"], results["python"])
+        # Without the exact stream, the samples are reproducible and each of them draws a single seed
+        samples = {}
+        try:
+            set_backend("numba", exact_stream=False)
+            for fragmenter, strength in [
+                (StrengthEdgesFragmenter(), 0.3),
+                (StrengthNodesFragmenter(), 0.2),
+            ]:
+                fragmenter.settings["fragmentation"] = strength
+                fragmenter.prepare(G)
+                runs = []
+                for _ in range(2):
+                    rng = random.Random(1)
+                    masks = []
+                    for _ in range(500):
+                        mask = bytearray(cg.n + cg.m)
+                        fragmenter.sample(rng, mask)
+                        masks.append(bytes(mask))
+                    runs.append(masks)
+                    reference = random.Random(1)
+                    for _ in range(500):
+                        reference.getrandbits(64)
+                    self.assertEqual(rng.random(), reference.random())
+                self.assertEqual(runs[0], runs[1])
+                samples[type(fragmenter)] = runs[0]
+        finally:
+            set_backend()
+        strength = [G.edges[e]["strength"] for e in G.edges]
+        masks = samples[StrengthEdgesFragmenter]
+        removed = [
+            sum(strength[j] for j in range(cg.m) if mask[cg.n + j]) for mask in masks
+        ]
+        self.assertTrue(all(0 < r <= 0.3 for r in removed))
+        self.assertEqual(len(set(masks)), len(masks))
+        with self.assertRaises(ValueError):
+            set_backend("cython")
+
+    def test_async(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        settings = {"fragmentation": 0.3, "fragmentation_type": "edges"}
+
+        async def estimate():
+            random.seed(0)
+            return await get_fragmentation_probability_async(
+                G,
+                4000,
+                probability_fragment,
+                fragment_settings=settings,
+                process_number=2,
+            )
+
+        pfrag, n = asyncio.run(estimate())
+        self.assertEqual(n, 4000)
+        self.assertEqual(asyncio.run(estimate()), (pfrag, n))
+        random.seed(0)
+        self.assertAlmostEqual(
+            get_fragmentation_probability(
+                G, 4000, probability_fragment, fragment_settings=settings
+            )[0],
+            pfrag,
+            delta=0.05,
+        )
+
+        async def collect():
+            events = []
+            async for event in iter_fragmentation_probability(
+                G,
+                3000,
+                probability_fragment,
+                fragment_settings=settings,
+                batch_size=500,
+                progress_interval=0,
+            ):
+                events.append(event)
+            return events
+
+        events = asyncio.run(collect())
+        self.assertEqual([e["event"] for e in events], ["progress"] * 5 + ["end"])
+        self.assertEqual(
+            [e["iterations"] for e in events], list(range(500, 3500, 500))
+        )
+        self.assertEqual(events[-1]["fragmentation"], 0.3)
+
+        async def cancel():
+            task = asyncio.create_task(
+                get_fragmentation_probability_async(
+                    G, 10**9, probability_fragment, fragment_settings=settings
+                )
+            )
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel())
+
+        G = nx.read_edgelist("tests/testcase2.edgelist")
+        for e in G.edges:
+            G.edges[e]["strength"] = 1 / len(G.edges)
+        events = []
+        threshold, steps = asyncio.run(
+            bisection_async(
+                G,
+                3,
+                0.05,
+                strength_edges_fragment,
+                process_number=2,
+                progress=events.append,
+            )
+        )
+        self.assertAlmostEqual(threshold, 0.375)
+        self.assertEqual(steps, 3)
+        steps = [e["step"] for e in events if e["event"] == "step"]
+        self.assertEqual(steps, [1, 2, 3])
+
+    def test_distributed(self):
+        from multiprocessing.connection import Client
+
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        settings = [
+            {"fragmentation": p, "fragmentation_type": "edges"} for p in [0.2, 0.4]
+        ]
+        results = []
+        for worker_number in [1, 3]:
+            with Coordinator(unit_size=500, unit_timeout=1) as coordinator:
+                random.seed(0)
+                thread = threading.Thread(
+                    target=lambda: results.append(
+                        coordinator.get_fragmentation_probabilities(
+                            G, 3000, probability_fragment, settings
+                        )
+                    )
+                )
+                thread.start()
+                # A stopped node, taking a unit without sending its result
+                with Client(coordinator.address, authkey=coordinator.authkey) as conn:
+                    conn.send(("unit",))
+                    self.assertIsNotNone(conn.recv())
+                workers = [
+                    multiprocessing.Process(
+                        target=run_worker,
+                        args=(coordinator.address, coordinator.authkey),
+                    )
+                    for _ in range(worker_number)
+                ]
+                for worker in workers:
+                    worker.start()
+                thread.join()
+                random.seed(0)
+                self.assertEqual(
+                    coordinator.get_fragmentation_probability(
+                        G, 3000, probability_fragment, settings[0]
+                    ),
+                    results[-1][0],
+                )
+            for worker in workers:
+                worker.join()
+                self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual([n for _, n in results[0]], [3000, 3000])
+        # The wall time of the estimation, not shifted by the ranges of the units
+        for result in results[0] + results[1]:
+            self.assertGreaterEqual(result.elapsed, 0)
+            self.assertLess(result.elapsed, 120)
+        random.seed(0)
+        pfrag, n = get_fragmentation_probability(
+            G, 3000, probability_fragment, fragment_settings=settings[1]
+        )
+        self.assertAlmostEqual(results[0][1][0], pfrag, delta=0.05)
+        # The errors of the workers are raised by the coordinator, the workers keep running
+        with Coordinator(unit_size=500) as coordinator:
+            worker = multiprocessing.Process(
+                target=run_worker, args=(coordinator.address, coordinator.authkey)
+            )
+            worker.start()
+            with self.assertRaisesRegex(RuntimeError, "failing fragment"):
+                coordinator.get_fragmentation_probability(G, 3000, _failing_fragment)
+            with self.assertRaises(ValueError):
+                coordinator.get_fragmentation_probability(
+                    G, 3000, probability_fragment, settings[0], lambda G: True
+                )
+            self.assertEqual(
+                coordinator.get_fragmentation_probability(
+                    G, 1000, probability_fragment, settings[0]
+                )[1],
+                1000,
+            )
+        worker.join()
+        self.assertEqual(worker.exitcode, 0)
+        # The command line workers join with the default key
+        with Coordinator(unit_size=500) as coordinator:
+            host, port = coordinator.address
+            worker = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "capsidgraph.analyser.worker",
+                    host,
+                    str(port),
+                    "--authkey",
+                    coordinator.authkey.decode(),
+                ]
+            )
+            self.assertEqual(
+                coordinator.get_fragmentation_probability(
+                    G, 1000, probability_fragment, settings[0]
+                )[1],
+                1000,
+            )
+        self.assertEqual(worker.wait(60), 0)
+
+    def test_results(self):
+        G = nx.read_adjlist("tests/AaLS_24.adjlist")
+        settings = {"fragmentation": 0.3, "fragmentation_type": "edges"}
+        random.seed(0)
+        results = [
+            get_fragmentation_probability(
+                G,
+                2000,
+                probability_fragment,
+                fragment_settings=settings,
+                process_number=2,
+            )
+            for _ in range(2)
+        ]
+        pfrag, n = results[0]
+        self.assertEqual(pfrag, results[0].fragmented / n)
+        self.assertEqual(len(results[0].seeds), 2)
+        self.assertEqual(results[0].settings, settings)
+        # The runs in the calling process are seeded too, so a shard counted twice is detected
+        single = get_fragmentation_probability(
+            G, 1000, probability_fragment, fragment_settings=settings
+        )
+        self.assertEqual(len(single.seeds), 1)
+        self.assertEqual(single.merge(results[0]).iterations, 1000 + results[0][1])
+        with self.assertRaises(ValueError):
+            single.merge(single)
+        merged = results[0].merge(results[1])
+        self.assertEqual(merged.iterations, results[0][1] + results[1][1])
+        self.assertEqual(
+            merged.fragmented, results[0].fragmented + results[1].fragmented
+        )
+        self.assertEqual(merged[0], merged.fragmented / merged.iterations)
+        low, high = merged.get_confidence_interval()
+        self.assertLess(high - low, results[0].get_confidence_interval()[1])
+        self.assertEqual(pickle.loads(pickle.dumps(merged)), merged)
+        self.assertEqual(pickle.loads(pickle.dumps(merged)).seeds, merged.seeds)
+        with self.assertRaises(ValueError):
+            merged.merge(results[0])
+        other = get_fragmentation_probability(
+            G,
+            100,
+            probability_fragment,
+            fragment_settings=dict(settings, fragmentation=0.4),
+        )
+        with self.assertRaises(ValueError):
+            results[0].merge(other)
+        pfrag, n, report = get_fragmentation_probability(
+            G, 100, probability_fragment, fragment_settings=settings, profile=True
+        )
+        self.assertEqual(report["iterations"], 100)
+        self.assertEqual(
+            ProbabilityResult(3, 10).merge(ProbabilityResult(4, 20)), (7 / 30, 30)
+        )
+
+        curves = [
+            get_fragmentation_probability_curve(
+                G, [0.2, 0.4], 500, probability_fragment, settings, process_number=2
+            )
+            for _ in range(2)
+        ]
+        curve = curves[0].merge(curves[1])
+        self.assertEqual(curve.iterations, 1000)
+        self.assertEqual(
+            curve.counts, [a + b for a, b in zip(curves[0].counts, curves[1].counts)]
+        )
+        self.assertEqual(curve[0], [c / 1000 for c in curve.counts])
+
+        distributions = [
+            get_hole_size_distribution(G, 200, probability_fragment, settings)
+            for _ in range(2)
+        ]
+        self.assertEqual(sum(distributions[0].counts), 200)
+        distribution = distributions[0].merge(distributions[1])
+        self.assertEqual(distribution.iterations, 400)
+        self.assertAlmostEqual(sum(distribution), 1)
+        distributions = [
+            get_fragment_size_distribution(G, 100, probability_fragment, settings)
+            for _ in range(2)
+        ]
+        distribution = distributions[0].merge(distributions[1])
+        self.assertEqual(len(distribution), max(len(d) for d in distributions))
+        self.assertAlmostEqual(
+            distribution[1], (distributions[0][1] + distributions[1][1]) / 2
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,14 +6,38 @@ from capsidgraph.generator import create_icosahedral_face_edges
 from capsidgraph.generator import create_icosahedral_capsid_graph
 from capsidgraph.generator import create_cubic_capsid_graph
 from capsidgraph.generator import create_icosahedral_texture
+from capsidgraph.generator import render_icosahedral_texture
+from capsidgraph.generator import create_icosahedral_svg_texture
 from capsidgraph.generator.face.patterns import icosahedral_patterns
+from capsidgraph.generator.face.icosahedral import create_triangle, is_in_triangle
+from capsidgraph.generator.face.util import (
+    extend,
+    tile,
+    tile_polygon,
+    is_exact_tiling,
+    clip,
+    get_points_position,
+)
 
 from capsidgraph.generator import (
     create_cubic_face_edges,
     cubic_patterns,
     create_cubic_capsid_graph,
+    get_icosahedral_capsid,
+    get_cubic_capsid,
+    clear_cache,
+    generate_icosahedral_family,
+    get_caspar_klug_numbers,
+    load_capsid,
+    get_icosahedral_face,
+    create_texture_atlas,
+    render_cubic_texture,
+    create_cubic_svg_texture,
 )
 
+from capsidgraph.util.storage import save_graph, load_graph, load_graph_arrays
+from capsidgraph.util.arrays import graph_to_arrays
+
 from math import sqrt
 
 
@@ -162,6 +186,254 @@ class TestGeneration(unittest.TestCase):
         G2 = nx.read_edgelist("tests/testcase4.edgelist")
         nx.is_isomorphic(G1, G2, edge_match=strength_edge_match)
 
+    def test_merge_faces(self):
+        # The fivefold vertices are the rotation centres of the merges, they keep their coordinates in their 5 faces
+        [edges, Tx, Ty, Tscale] = icosahedral_patterns.PATTERN_333333
+        for h, k in [(1, 0), (2, 1)]:
+            face_edges, axis = create_icosahedral_face_edges(edges, Tx, Ty, h, k)
+            G, coordinates = create_icosahedral_capsid_graph(
+                face_edges, axis, return_coordinates=True
+            )
+            self.assertEqual(len(G.nodes), 10 * (h * h + h * k + k * k) + 2)
+            self.assertEqual(set(coordinates.keys()), set(G.nodes))
+            fivefold = [n for n, d in G.degree if d == 5]
+            self.assertEqual(len(fivefold), 12)
+            for n in fivefold:
+                self.assertEqual(len({face for face, x, y in coordinates[n]}), 5)
+
+    def test_tile(self):
+        # The order and the multiplicity of the edges index the bond strengths of the faces
+        self.assertEqual(
+            extend([((0, 0), (1, 0)), ((2, 0), (3, 0))], (1, 0)),
+            [
+                ((0, 0), (1, 0)),
+                ((1, 0), (2, 0)),
+                ((-1, 0), (0, 0)),
+                ((2, 0), (3, 0)),
+                ((3, 0), (4, 0)),
+                ((1, 0), (2, 0)),
+            ],
+        )
+        self.assertEqual(
+            tile([((0, 0), (1, 0)), ((0, 0), (0, 1))], (1, 0), (0, 1), 1),
+            [
+                ((0, 0), (1, 0)),
+                ((0, 1), (1, 1)),
+                ((0, -1), (1, -1)),
+                ((1, 0), (2, 0)),
+                ((1, 1), (2, 1)),
+                ((1, -1), (2, -1)),
+                ((-1, 0), (0, 0)),
+                ((-1, 1), (0, 1)),
+                ((-1, -1), (0, -1)),
+                ((0, 0), (0, 1)),
+                ((0, 1), (0, 2)),
+                ((0, -1), (0, 0)),
+                ((1, 0), (1, 1)),
+                ((1, 1), (1, 2)),
+                ((1, -1), (1, 0)),
+                ((-1, 0), (-1, 1)),
+                ((-1, 1), (-1, 2)),
+                ((-1, -1), (-1, 0)),
+            ],
+        )
+        # The edges on the sides of the face are kept despite floating point errors, every node of this lattice has 4 neighbours
+        [edges, Tx, Ty, Tscale] = icosahedral_patterns.PATTERN_6434
+        face_edges, axis = create_icosahedral_face_edges(edges, Tx, Ty, 1, 1)
+        G = create_icosahedral_capsid_graph(face_edges, axis)
+        self.assertEqual(len(G.nodes), 20 * Tscale * 3)
+        self.assertTrue(all(d == 4 for n, d in G.degree))
+
+    def test_tile_polygon(self):
+        # Integer patterns are enumerated like extend, including the edges of PATTERN_3336 that are translates of each other
+        for P in [
+            icosahedral_patterns.PATTERN_666,
+            icosahedral_patterns.PATTERN_3336,
+            [[((0, 0), (1, 0)), ((2, 0), (3, 0)), ((0, 0), (1, 0))], (1, 0), (1, 2), 1],
+        ]:
+            [edges, Tx, Ty, Tscale] = P
+            self.assertTrue(is_exact_tiling(edges, Tx, Ty))
+            for h, k in [(1, 0), (2, 1), (1, 3)]:
+                triangle = create_triangle(h, k, Tx, Ty)
+                self.assertEqual(
+                    clip(tile_polygon(edges, Tx, Ty, triangle, h + k), triangle),
+                    clip(tile(edges, Tx, Ty, h + k), triangle),
+                )
+        # Without the order of extend, floating point patterns give the same capsid without duplicated edges
+        [edges, Tx, Ty, Tscale] = icosahedral_patterns.PATTERN_6434
+        self.assertFalse(is_exact_tiling(edges, Tx, Ty))
+        for h, k in [(1, 1), (2, 1)]:
+            G1 = create_icosahedral_capsid_graph(
+                *create_icosahedral_face_edges(edges, Tx, Ty, h, k)
+            )
+            face_edges, axis = create_icosahedral_face_edges(
+                edges, Tx, Ty, h, k, extend_order=False
+            )
+            self.assertEqual(len(set(face_edges)), len(face_edges))
+            G2 = create_icosahedral_capsid_graph(face_edges, axis)
+            self.assertEqual(len(G2.nodes), 20 * Tscale * (h * h + h * k + k * k))
+            self.assertTrue(nx.is_isomorphic(G1, G2))
+        [edges, Tx, Ty, face_edge] = cubic_patterns.AALS_24_PATTERN
+        G1 = create_cubic_capsid_graph(
+            *create_cubic_face_edges(edges, Tx, Ty, face_edge)
+        )
+        G2 = create_cubic_capsid_graph(
+            *create_cubic_face_edges(edges, Tx, Ty, face_edge, extend_order=False)
+        )
+        self.assertEqual(len(G2.nodes), 24)
+        self.assertTrue(nx.is_isomorphic(G1, G2))
+
+    def test_clip(self):
+        A, B, C = create_triangle(2, 1, (1, 0), (0, 1))
+        points = np.array([(1, 0), (0, 0), (-1, 0), (2, 1), (5, 5)])
+        self.assertEqual(
+            list(get_points_position(points, (A, B, C))),
+            [is_in_triangle(P, A, B, C) for P in points.tolist()],
+        )
+        for P in [icosahedral_patterns.PATTERN_333333, icosahedral_patterns.PATTERN_6434]:
+            [edges, Tx, Ty, Tscale] = P
+            A, B, C = create_triangle(3, 2, Tx, Ty)
+            tiling = tile(edges, Tx, Ty, 5)
+            self.assertEqual(
+                clip(tiling, (A, B, C)),
+                [
+                    (P1, P2)
+                    for P1, P2 in tiling
+                    if is_in_triangle(P1, A, B, C) + is_in_triangle(P2, A, B, C) >= 0
+                ],
+            )
+
+    def test_capsid_cache(self):
+        import os
+        import tempfile
+        from unittest import mock
+
+        clear_cache()
+        P = icosahedral_patterns.PATTERN_6434
+        [edges, Tx, Ty, Tscale] = P
+        face_edges, axis = create_icosahedral_face_edges(edges, Tx, Ty, 2, 1)
+        G = create_icosahedral_capsid_graph(face_edges, axis)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            G1, face_edges1, axis1 = get_icosahedral_capsid(P, 2, 1, cache_dir=cache_dir)
+            self.assertEqual(face_edges1, face_edges)
+            self.assertEqual(axis1, axis)
+            self.assertTrue(nx.is_isomorphic(G, G1))
+            # Read back from the disk
+            clear_cache()
+            G2, face_edges2, axis2 = get_icosahedral_capsid(P, 2, 1, cache_dir=cache_dir)
+            self.assertEqual(face_edges2, face_edges)
+            self.assertEqual(set(G1.edges), set(G2.edges))
+            # A failed write leaves no temporary file behind
+            files = sorted(os.listdir(cache_dir))
+            clear_cache()
+            with mock.patch.object(np, "savez", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    get_icosahedral_capsid(P, 1, 1, cache_dir=cache_dir)
+            self.assertEqual(sorted(os.listdir(cache_dir)), files)
+        # Partial strengths can not be stored
+        G.edges[next(iter(G.edges))]["strength"] = 1
+        with self.assertRaises(ValueError):
+            graph_to_arrays(G)
+
+        G1, face_edges1, square1 = get_cubic_capsid(cubic_patterns.AALS_24_PATTERN)
+        self.assertTrue(nx.is_isomorphic(G1, nx.read_adjlist("tests/AaLS_24.adjlist")))
+        # The bond strength is part of the key
+        face_edges, square = create_cubic_face_edges(*cubic_patterns.AALS_24_PATTERN)
+        w = list(range(1, len(face_edges) + 1))
+        G2, _, _ = get_cubic_capsid(cubic_patterns.AALS_24_PATTERN, bond_strength=w)
+        G3 = create_cubic_capsid_graph(face_edges, square, w)
+        self.assertEqual(nx.get_edge_attributes(G2, "strength"), nx.get_edge_attributes(G3, "strength"))
+
+    def test_icosahedral_family(self):
+        import tempfile
+
+        self.assertEqual(get_caspar_klug_numbers(4), [(1, 0), (1, 1), (2, 0)])
+        P = icosahedral_patterns.PATTERN_333333
+        [edges, Tx, Ty, Tscale] = P
+        with tempfile.TemporaryDirectory() as output_dir:
+            for process_number, kwargs in [
+                (1, {}),
+                (2, {"as_arrays": True}),
+                (2, {"output_dir": output_dir}),
+            ]:
+                family = dict(
+                    generate_icosahedral_family(P, [(1, 1), (2, 1), (1, 2)], process_number, **kwargs)
+                )
+                self.assertEqual(set(family.keys()), {(1, 1), (2, 1), (1, 2)})
+                for (h, k), res in family.items():
+                    if "output_dir" in kwargs:
+                        G, face_edges, axis = load_capsid(res)
+                        self.assertEqual(set(face_edges), set(create_icosahedral_face_edges(edges, Tx, Ty, h, k)[0]))
+                    elif "as_arrays" in kwargs:
+                        self.assertEqual(len(res["graph_nodes"]), 10 * (h * h + h * k + k * k) + 2)
+                    else:
+                        G = res
+                        G2 = create_icosahedral_capsid_graph(*create_icosahedral_face_edges(edges, Tx, Ty, h, k))
+                        self.assertTrue(nx.is_isomorphic(G, G2))
+
+    def test_graph_storage(self):
+        import os
+        import tempfile
+
+        faceEdges = [
+            ((1, 0), (1, 1)),
+            ((1, 0), (1, -1)),
+            ((1, 0), (0, 1)),
+            ((1, 0), (2, -1)),
+            ((1, 0), (0, 0)),
+            ((1, 0), (2, 0)),
+            ((1, 1), (2, 0)),
+            ((1, -1), (2, -1)),
+            ((2, 0), (2, 1)),
+            ((2, 0), (2, -1)),
+            ((2, 0), (3, -1)),
+            ((2, 0), (3, 0)),
+            ((2, -1), (2, -2)),
+            ((2, -1), (3, -2)),
+            ((2, -1), (3, -1)),
+        ]
+        axis = ((0, 0), (2, 1), (3, -2))
+        strength = [3, 2, 2, 3, 1, 3, 2, 3, 1, 3, 3, 2, 2, 1, 2]
+        G, coordinates = create_icosahedral_capsid_graph(
+            faceEdges, axis, bond_strength=strength, return_coordinates=True
+        )
+        self.assertEqual(set(coordinates.keys()), set(G.nodes))
+        for n in G.nodes:
+            G.nodes[n]["strength"] = G.degree(n, weight="strength")
+        with tempfile.TemporaryDirectory() as directory:
+            for path in [os.path.join(directory, "capsid"), os.path.join(directory, "capsid.npz")]:
+                save_graph(G, path, coordinates=coordinates)
+                G2, coordinates2 = load_graph(path, return_coordinates=True)
+                self.assertEqual(list(G2.nodes), list(G.nodes))
+                self.assertEqual(coordinates2, coordinates)
+                self.assertEqual(
+                    {frozenset(e): w for e, w in nx.get_edge_attributes(G, "strength").items()},
+                    {frozenset(e): w for e, w in nx.get_edge_attributes(G2, "strength").items()},
+                )
+                self.assertEqual(
+                    nx.get_node_attributes(G, "strength"),
+                    nx.get_node_attributes(G2, "strength"),
+                )
+            arrays = load_graph_arrays(os.path.join(directory, "capsid"))
+            self.assertIsInstance(arrays["edges"], np.memmap)
+            self.assertEqual(arrays["edges"].shape, (len(G.edges), 2))
+            # Saving another graph in the same directory does not leave stale arrays
+            save_graph(nx.read_adjlist("tests/AaLS_24.adjlist"), os.path.join(directory, "capsid"))
+            G3, coordinates3 = load_graph(os.path.join(directory, "capsid"), return_coordinates=True)
+            self.assertIsNone(coordinates3)
+            self.assertTrue(nx.is_isomorphic(G3, nx.read_adjlist("tests/AaLS_24.adjlist")))
+            # Files that do not belong to a saved graph are never removed
+            other = os.path.join(directory, "data")
+            os.makedirs(other)
+            np.save(os.path.join(other, "results.npy"), np.zeros(3))
+            with self.assertRaises(ValueError):
+                save_graph(G, other)
+            self.assertEqual(os.listdir(other), ["results.npy"])
+            np.save(os.path.join(directory, "capsid", "results.npy"), np.zeros(3))
+            save_graph(G, os.path.join(directory, "capsid"))
+            self.assertTrue(os.path.exists(os.path.join(directory, "capsid", "results.npy")))
+            self.assertNotIn("results", load_graph_arrays(os.path.join(directory, "capsid")))
+
     def test_texture_generator(self):
         from PIL import Image
 
@@ -175,6 +447,92 @@ class TestGeneration(unittest.TestCase):
         img2_matrix = np.asarray(img2)
         self.assertTrue(np.all(img_matrix == img2_matrix))
 
+    def test_render_texture(self):
+        P = icosahedral_patterns.PATTERN_6434
+        img = render_icosahedral_texture(P, 2, 1, scale=100, lineWidth=3)
+        legacy = create_icosahedral_texture(P, 2, 1, scale=100, lineWidth=3)
+        self.assertEqual(img.mode, "RGBA")
+        # The legacy renderer truncates the size of the face before scaling it
+        self.assertGreaterEqual(img.size[0], legacy.size[0])
+        self.assertGreaterEqual(img.size[1], legacy.size[1])
+        self.assertLess(img.size[0], legacy.size[0] + 100)
+        self.assertLess(img.size[1], legacy.size[1] + 100)
+        # Lines are drawn inside the face, and nothing is drawn outside of it
+        img_matrix = np.asarray(img)
+        self.assertTrue(np.all(img_matrix[:, :, 3] == 255))
+        self.assertTrue(np.any(img_matrix[:, :, 0] == 0))
+        width, height = img.size
+        self.assertTrue(np.all(img_matrix[0, width // 2 :] == 255))
+        self.assertTrue(np.all(img_matrix[height - 1, width // 2 :] == 255))
+        svg = create_icosahedral_svg_texture(P, 2, 1, scale=100, lineWidth=3)
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn("clipPath", svg)
+        self.assertIn('stroke-width="3"', svg)
+
+    def test_texture_atlas(self):
+        import json
+        import tempfile
+        from PIL import Image
+
+        patterns = {
+            "PATTERN_666": icosahedral_patterns.PATTERN_666,
+            "PATTERN_6434": icosahedral_patterns.PATTERN_6434,
+        }
+        hk = [(1, 0), (2, 1)]
+        with tempfile.TemporaryDirectory() as d:
+            # Face edges of a generated capsid are read from the cache
+            G, face_edges, triangle = get_icosahedral_capsid(
+                patterns["PATTERN_666"], 2, 1, cache_dir=d
+            )
+            self.assertEqual(
+                get_icosahedral_face(patterns["PATTERN_666"], 2, 1, cache_dir=d),
+                (face_edges, triangle),
+            )
+            index = create_texture_atlas(
+                d + "/atlas", hk, patterns, process_number=2, scale=40, cache_dir=d
+            )
+            with open(d + "/atlas/index.json") as f:
+                self.assertEqual(json.load(f), index)
+            self.assertEqual(
+                [(t["pattern"], t["h"], t["k"]) for t in index["textures"]],
+                [(name, h, k) for name in patterns for h, k in hk],
+            )
+            atlas = np.asarray(Image.open(d + "/atlas/atlas.png"))
+            self.assertEqual(atlas.shape[:2], (index["height"], index["width"]))
+            # Each texture of the atlas is the texture rendered on its own
+            t = index["textures"][-1]
+            img = render_icosahedral_texture(
+                patterns[t["pattern"]], t["h"], t["k"], scale=40
+            )
+            self.assertEqual(img.size, (t["width"], t["height"]))
+            self.assertTrue(
+                np.all(
+                    atlas[
+                        t["y"] : t["y"] + t["height"], t["x"] : t["x"] + t["width"]
+                    ]
+                    == np.asarray(img)
+                )
+            )
+            index = create_texture_atlas(
+                d + "/tiles", hk, patterns, packed=False, scale=40
+            )
+            for t in index["textures"]:
+                with Image.open(d + "/tiles/" + t["file"]) as img:
+                    self.assertEqual(img.size, (t["width"], t["height"]))
+
+    def test_cubic_texture(self):
+        P = cubic_patterns.AALS_48_PATTERN
+        img = render_cubic_texture(P, scale=100, lineWidth=3)
+        # The side of the square face is 1 + sqrt(3) units long
+        side = int(np.ceil(100 * (1 + sqrt(3))))
+        self.assertEqual(img.size, (side, side))
+        self.assertEqual(img.mode, "RGBA")
+        img_matrix = np.asarray(img)
+        self.assertTrue(np.any(img_matrix[:, :, 0] == 0))
+        svg = create_cubic_svg_texture(P, scale=100, lineWidth=3)
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn('width="%d" height="%d"' % (side, side), svg)
+
     def test_cubic_generator(self):
         for P, testfile in [
             (cubic_patterns.AALS_24_PATTERN, "tests/AaLS_24.adjlist"),